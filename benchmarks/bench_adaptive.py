@@ -0,0 +1,58 @@
+"""
+Compare fixed concurrency limits with the adaptive limiter against a stand-in
+that answers 429 above a fixed capacity.
+
+    python -m benchmarks.bench_adaptive [--calls 2000] [--workers 32] [--capacity 8]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from jira_util.jira import JiraAPI
+from jira_util.limiter import AdaptiveLimiter
+from jira_util.retry import RetryPolicy
+from tests.stand_in import StandInJira
+
+
+def measure(
+    limiter: AdaptiveLimiter, options: argparse.Namespace
+) -> tuple[float, int, int]:
+    with StandInJira(latency=options.latency, capacity=options.capacity) as stand_in:
+        with JiraAPI(stand_in.config(), pool_size=options.workers) as jira_api:
+            jira_api.limiter = limiter
+            jira_api.retry_policy = RetryPolicy(max_retries=100, backoff=0.01)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options.workers) as pool:
+                keys = [f"JIRA-{i}" for i in range(options.calls)]
+                list(pool.map(jira_api.get_ticket, keys))
+            elapsed = time.perf_counter() - start
+    return elapsed, stand_in.rejected, limiter.limit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005)
+    options = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    cases = [
+        (f"fixed {n}", AdaptiveLimiter(initial=n, min_limit=n, max_limit=n))
+        for n in (2, options.capacity, options.workers)
+    ]
+    cases.append(("adaptive", AdaptiveLimiter(max_limit=options.workers)))
+    for name, limiter in cases:
+        elapsed, rejected, limit = measure(limiter, options)
+        print(
+            f"{name:>9}: {options.calls / elapsed:6.0f} calls/s, "
+            f"{rejected:5} rejected, final limit {limit}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare the size and decode time of a full issue with projected ones.
+
+    python -m benchmarks.bench_fields [--calls 200] [--custom-fields 150]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any
+
+from jira_util.jira import FIELD_PRESETS, JiraAPI
+from tests.stand_in import StandInJira
+
+
+def large_issue(key: str, custom_fields: int) -> dict:
+    description = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 200
+    fields: dict[str, Any] = {
+        "summary": f"Summary of {key}",
+        "status": {"name": "In Progress", "id": "3"},
+        "issuetype": {"name": "Story", "id": "10001"},
+        "description": description,
+    }
+    for i in range(custom_fields):
+        fields[f"customfield_{10000 + i}"] = {"value": f"Option {i}", "id": str(i)}
+    return {
+        "key": key,
+        "fields": fields,
+        "renderedFields": {"description": f"<p>{description}</p>"},
+    }
+
+
+def add_issue_route(stand_in: StandInJira, custom_fields: int) -> None:
+    def get_issue(key: str, query: dict, **_: Any) -> tuple[int, Any]:
+        issue = large_issue(key, custom_fields)
+        if "renderedFields" not in query.get("expand", ""):
+            del issue["renderedFields"]
+        requested = query.get("fields", "*all").split(",")
+        if "*all" not in requested and "*navigable" not in requested:
+            issue["fields"] = {
+                k: v for k, v in issue["fields"].items() if k in requested
+            }
+        return 200, issue
+
+    stand_in.add_route("GET", r"/rest/api/2/issue/([A-Z]+-\d+)", get_issue)
+
+
+def measure(
+    jira_api: JiraAPI, fields: str | None, expand: str | None, calls: int
+) -> tuple[int, float, float]:
+    params = jira_api._field_params(fields, expand)
+    raw = jira_api.session.get(jira_api._url("/rest/api/2/issue/JIRA-1"), params=params)
+    start = time.perf_counter()
+    for _ in range(calls):
+        json.loads(raw.content)
+    decode = (time.perf_counter() - start) / calls
+
+    start = time.perf_counter()
+    for i in range(calls):
+        jira_api.get_ticket(f"JIRA-{i}", fields, expand)
+    elapsed = time.perf_counter() - start
+    return len(raw.content), decode, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--custom-fields", type=int, default=150)
+    options = parser.parse_args()
+
+    cases = [("full", None, "renderedFields"), ("all", "all", None)]
+    cases += [(name, name, None) for name in FIELD_PRESETS if name != "all"]
+    with StandInJira() as stand_in:
+        add_issue_route(stand_in, options.custom_fields)
+        with JiraAPI(stand_in.config()) as jira_api:
+            for name, fields, expand in cases:
+                size, decode, elapsed = measure(jira_api, fields, expand, options.calls)
+                print(
+                    f"{name:>9}: {size / 1024:7.1f} KiB, decode {decode * 1e6:7.1f}us, "
+                    f"{options.calls} calls in {elapsed:.3f}s"
+                )
+
+
+if __name__ == "__main__":
+    main()
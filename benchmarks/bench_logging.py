@@ -0,0 +1,81 @@
+"""
+Measure what tracing a large search response costs per request, with the
+eager f-strings the client used to build and with the lazy log records.
+
+    python -m benchmarks.bench_logging [--calls 200] [--issues 100]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import time
+from typing import Callable
+
+from benchmarks.bench_fields import large_issue
+from jira_util.jira import JiraAPI
+from tests.stand_in import StandInJira
+
+URL = "https://jira.example.com/rest/api/2/search"
+PARAMS = {"jql": "project = TEST", "startAt": 0, "maxResults": 100}
+HEADERS = {"Authorization": "Bearer token"}
+
+
+def eager(jira_api: JiraAPI, body: dict) -> None:
+    logging.debug(
+        f"\nGET {URL}{jira_api._parse_params(PARAMS)}\n{json.dumps(None, sort_keys=True, indent=4)}"
+    )
+    logging.debug(
+        f"\n{json.dumps(body, sort_keys=True, indent=4)}\nGET {URL}\n{json.dumps(None, sort_keys=True, indent=4)}"
+    )
+
+
+def lazy(jira_api: JiraAPI, body: dict) -> None:
+    jira_api._log_request("GET", URL, PARAMS, HEADERS, None)
+    jira_api._log_response("GET", URL, 200, body, 0.1)
+
+
+def measure(
+    trace: Callable[[JiraAPI, dict], None], jira_api: JiraAPI, body: dict, calls: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        trace(jira_api, body)
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--issues", type=int, default=100)
+    options = parser.parse_args()
+
+    body = {
+        "total": options.issues,
+        "issues": [large_issue(f"JIRA-{i}", 20) for i in range(options.issues)],
+    }
+    root = logging.getLogger()
+    # Records are formatted as usual and then thrown away
+    root.addHandler(logging.StreamHandler(open(os.devnull, "w")))
+
+    with StandInJira() as stand_in:
+        config = stand_in.config()
+        with JiraAPI(config) as jira_api:
+            config.set("JIRA", "LOG_BODY_LIMIT", "2000")
+            with JiraAPI(config) as capped_api:
+                cases = [
+                    ("eager, debug off", logging.INFO, eager, jira_api),
+                    ("lazy, debug off", logging.INFO, lazy, jira_api),
+                    ("eager, debug on", logging.DEBUG, eager, jira_api),
+                    ("lazy, debug on", logging.DEBUG, lazy, jira_api),
+                    ("lazy, debug on, capped", logging.DEBUG, lazy, capped_api),
+                ]
+                for name, level, trace, api in cases:
+                    root.setLevel(level)
+                    elapsed = measure(trace, api, body, options.calls)
+                    print(f"{name:>22}: {elapsed * 1e6:10.1f}us per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Show that iter_search keeps memory flat however many issues a query matches.
+
+    python -m benchmarks.bench_search [--totals 5000 20000 50000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from jira_util.jira import JiraAPI
+from tests.stand_in import StandInJira
+
+
+def measure(total: int, materialize: bool) -> tuple[int, float, int]:
+    with StandInJira() as stand_in:
+        stand_in.add_search(total)
+        with JiraAPI(stand_in.config()) as jira_api:
+            tracemalloc.start()
+            start = time.perf_counter()
+            issues = jira_api.iter_search("project = SYN", "key,summary")
+            if materialize:
+                count = len(list(issues))
+            else:
+                count = sum(1 for _ in issues)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    assert count == total
+    return peak, elapsed, len(stand_in.requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--totals", type=int, nargs="+", default=[5000, 20000, 50000])
+    options = parser.parse_args()
+
+    for total in options.totals:
+        for name, materialize in (("streamed", False), ("list", True)):
+            peak, elapsed, requests = measure(total, materialize)
+            print(
+                f"{total:>6} issues {name:>8}: peak {peak / 1024:8.0f} KiB, "
+                f"{requests} requests in {elapsed:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
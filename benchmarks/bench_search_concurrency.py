@@ -0,0 +1,47 @@
+"""
+Compare sequential paging with concurrent page fetching in iter_search.
+
+    python -m benchmarks.bench_search_concurrency [--total 20000] [--latency 0.02]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from jira_util.jira import JiraAPI
+from tests.stand_in import StandInJira
+
+
+def measure(total: int, latency: float, concurrency: int) -> tuple[float, int]:
+    with StandInJira(latency=latency) as stand_in:
+        stand_in.add_search(total)
+        with JiraAPI(stand_in.config(), pool_size=concurrency) as jira_api:
+            start = time.perf_counter()
+            count = sum(
+                1
+                for _ in jira_api.iter_search(
+                    "project = SYN", "key", concurrency=concurrency
+                )
+            )
+            elapsed = time.perf_counter() - start
+    assert count == total
+    return elapsed, stand_in.peak_in_flight
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    options = parser.parse_args()
+
+    for concurrency in options.concurrency:
+        elapsed, peak = measure(options.total, options.latency, concurrency)
+        print(
+            f"concurrency {concurrency:>2}: {options.total} issues in {elapsed:.2f}s "
+            f"({options.total / elapsed:.0f} issues/s, {peak} request(s) in flight)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare a fresh connection per call with the pooled JiraAPI session.
+
+    python -m benchmarks.bench_session [--calls 200] [--latency 0.002]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import requests
+
+from jira_util.jira import JiraAPI
+from tests.stand_in import StandInJira
+
+
+def per_call_requests(stand_in: StandInJira, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        requests.request(
+            "GET", f"http://{stand_in.address}/rest/api/2/issue/JIRA-{i}"
+        ).raise_for_status()
+    return time.perf_counter() - start
+
+
+def pooled_session(stand_in: StandInJira, calls: int) -> float:
+    start = time.perf_counter()
+    with JiraAPI(stand_in.config()) as jira_api:
+        for i in range(calls):
+            jira_api.get_ticket(f"JIRA-{i}")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    options = parser.parse_args()
+
+    for name, run in (("per-call", per_call_requests), ("pooled", pooled_session)):
+        with StandInJira(latency=options.latency) as stand_in:
+            elapsed = run(stand_in, options.calls)
+        print(
+            f"{name:>8}: {options.calls} calls in {elapsed:.3f}s "
+            f"({options.calls / elapsed:.0f}/s), "
+            f"{stand_in.connections} connection(s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Run the client against the local stand-in Jira at scale and write the
+throughput and request latency of each scenario to a JSON results file, to
+compare between commits.
+
+    python -m benchmarks.harness [--scale 1] [--latency 0.005] [--error-rate 0]
+        [--jobs 8] [--output bench-results.json] [--compare OLD.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from jira_util.importer import create_tickets_from_file
+from jira_util.jira import DEFAULT_POOL_SIZE, JiraAPI
+from jira_util.metrics import percentile
+from tests.stand_in import StandInJira
+
+STORIES_PER_EPIC = 60
+
+Scenario = Callable[[JiraAPI, StandInJira, argparse.Namespace], int]
+
+
+def get_ticket(jira_api: JiraAPI, _: StandInJira, options: argparse.Namespace) -> int:
+    calls = int(500 * options.scale)
+    with ThreadPoolExecutor(max_workers=options.jobs) as pool:
+        # Distinct keys, so that no request is coalesced with another
+        list(pool.map(jira_api.get_ticket, (f"JIRA-{i}" for i in range(calls))))
+    return calls
+
+
+def get_active_epics(
+    jira_api: JiraAPI, stand_in: StandInJira, options: argparse.Namespace
+) -> int:
+    stand_in.add_search(int(5000 * options.scale))
+    return len(jira_api.get_active_epics())
+
+
+def create_from_file(
+    jira_api: JiraAPI, _: StandInJira, options: argparse.Namespace
+) -> int:
+    lines = []
+    for epic in range(max(1, int(20 * options.scale))):
+        lines.append(f"Epic: Epic {epic}")
+        lines.extend(f"Story: Story {epic}.{i}" for i in range(STORIES_PER_EPIC))
+    create_tickets_from_file(jira_api, lines, jobs=options.jobs)
+    return len(lines)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "get_ticket": get_ticket,
+    "get_active_epics": get_active_epics,
+    "create_tickets_from_file": create_from_file,
+}
+
+
+def run_scenario(scenario: Scenario, options: argparse.Namespace) -> dict:
+    with StandInJira(
+        latency=options.latency, error_rate=options.error_rate
+    ) as stand_in:
+        stand_in.add_jira_routes()
+        config = stand_in.config()
+        # Injected errors come with Retry-After: 0, don't add a real backoff
+        config.set("JIRA", "RETRY_BACKOFF", "0.01")
+        pool_size = max(options.jobs, DEFAULT_POOL_SIZE)
+        with JiraAPI(config, pool_size=pool_size) as jira_api:
+            start = time.perf_counter()
+            tickets = scenario(jira_api, stand_in, options)
+            elapsed = time.perf_counter() - start
+            latencies = jira_api.metrics.latencies()
+    return {
+        "tickets": tickets,
+        "seconds": round(elapsed, 4),
+        "tickets_per_second": round(tickets / elapsed, 1),
+        "requests": len(latencies),
+        "rejected": stand_in.rejected,
+        "latency_ms": {
+            name: round(percentile(latencies, fraction) * 1000, 2)
+            for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        },
+    }
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    print(f"\nCompared with {baseline.get('commit')}:")
+    for name, current in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            continue
+        throughput = current["tickets_per_second"] / before["tickets_per_second"] - 1
+        p95 = current["latency_ms"]["p95"] - before["latency_ms"]["p95"]
+        print(f"{name:>25}: {throughput:+7.1%} tickets/s, p95 {p95:+.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--scenario", choices=SCENARIOS, nargs="+")
+    parser.add_argument("--output", type=Path, default=Path("bench-results.json"))
+    parser.add_argument("--compare", type=Path)
+    options = parser.parse_args()
+    # Retrying the injected errors is expected, don't log every one
+    logging.basicConfig(level=logging.ERROR)
+
+    results: dict = {
+        "commit": current_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "options": {
+            name: getattr(options, name)
+            for name in ("scale", "latency", "error_rate", "jobs")
+        },
+        "scenarios": {},
+    }
+    for name in options.scenario or SCENARIOS:
+        result = run_scenario(SCENARIOS[name], options)
+        results["scenarios"][name] = result
+        print(
+            f"{name:>25}: {result['tickets']} tickets in {result['seconds']:.2f}s "
+            f"({result['tickets_per_second']:.0f}/s), {result['requests']} requests, "
+            f"p50 {result['latency_ms']['p50']:.1f}ms "
+            f"p95 {result['latency_ms']['p95']:.1f}ms "
+            f"p99 {result['latency_ms']['p99']:.1f}ms"
+        )
+
+    options.output.write_text(json.dumps(results, indent=4) + "\n")
+    print(f"Results written to {options.output}")
+    if options.compare:
+        compare(results, json.loads(options.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import configparser
+import json
+import logging
+from types import TracebackType
+from typing import Any, AsyncIterator, Iterable
+
+import aiohttp
+
+from jira_util.fields import CreateMeta, FieldCatalog
+from jira_util.jira import DEFAULT_SEARCH_PAGE_SIZE, JiraAPIBase, SprintPosition
+
+DEFAULT_MAX_IN_FLIGHT = 50
+
+
+class AsyncJiraAPI(JiraAPIBase):
+    """
+    asyncio counterpart of JiraAPI. All requests share one aiohttp connection
+    pool and at most `max_in_flight` of them are sent at the same time.
+    """
+
+    def __init__(
+        self,
+        config: configparser.ConfigParser,
+        config_section: str = "JIRA",
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> None:
+        super().__init__(config, config_section)
+        self.logger = logging.getLogger(__name__)
+        self.max_in_flight = max_in_flight
+        self._session: aiohttp.ClientSession | None = None
+        self._in_flight: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> AsyncJiraAPI:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Release the pooled connections held by the session
+        """
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions belong to the running event loop, so create it lazily
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight),
+                headers={"Accept": "application/json"},
+            )
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        return self._session
+
+    async def _api_request(
+        self, method: str, query: str, *args: str, **kwargs: Any
+    ) -> dict:
+        url = self._url(query, *args)
+        session = self._get_session()
+
+        headers = {
+            "Authorization": self._authorization(self.auth, self.user, self.api_token)
+        }
+        self._log_request(
+            method, url, kwargs.get("params"), headers, kwargs.get("json")
+        )
+
+        assert self._in_flight is not None
+        async with self._in_flight:
+            try:
+                async with session.request(
+                    method, url, headers=headers, **kwargs
+                ) as response:
+                    text = await response.text()
+            except aiohttp.ClientError as ex:
+                self.logger.error(f"Request error: {ex}")
+                raise
+
+        if response.status >= 400:
+            self.logger.error(f"HTTP error {response.status}: {text}")
+            response.raise_for_status()
+
+        try:
+            response_json = json.loads(text) if text else {}
+        except ValueError:
+            response_json = {}
+        self._log_response(method, url, response.status, response_json)
+        return response_json
+
+    async def get_fields(self) -> FieldCatalog:
+        if self._field_catalog is None:
+            fields = await self._get_metadata("fields", "/rest/api/2/field")
+            self._field_catalog = FieldCatalog(fields)
+        return self._field_catalog
+
+    async def get_create_meta(self, project: str | None = None) -> CreateMeta:
+        project = project or self.project
+        if project not in self._create_meta:
+            response = await self._get_metadata(
+                f"createmeta/{project}",
+                "/rest/api/2/issue/createmeta",
+                params=self._createmeta_params(project),
+            )
+            self._create_meta[project] = CreateMeta(project, response)
+        return self._create_meta[project]
+
+    async def _get_metadata(self, name: str, query: str, **kwargs: Any) -> Any:
+        metadata = self._cached_metadata(name)
+        if metadata is None:
+            metadata = self._cache_metadata(
+                name, await self._api_request("GET", query, **kwargs)
+            )
+        return metadata
+
+    async def _resolve_field_names(self) -> None:
+        """
+        Look up the ids of the fields configured by name, once
+        @raise FieldError: if a name doesn't match exactly one field
+        """
+        if self._field_ids_resolved:
+            return
+        if self._named_fields():
+            self._use_field_ids(await self.get_fields())
+        self._field_ids_resolved = True
+
+    async def _check_fields(self, fields: dict) -> None:
+        if self.validate_fields:
+            create_meta = await self.get_create_meta(fields["project"]["key"])
+            self._validate_payload(create_meta, fields)
+
+    async def get_comment(self, ticket: str) -> dict:
+        return await self._api_request("GET", "/rest/api/2/issue/{}/comment", ticket)
+
+    async def add_comment(self, ticket: str, comment: str) -> dict:
+        return await self._api_request(
+            "POST", "/rest/api/2/issue/{}/comment", ticket, json={"body": comment}
+        )
+
+    async def get_ticket(
+        self,
+        ticket: str,
+        fields: str | Iterable[str] | None = None,
+        expand: str | Iterable[str] | None = None,
+    ) -> dict:
+        return await self._api_request(
+            "GET",
+            "/rest/api/2/issue/{}",
+            ticket,
+            params=self._field_params(fields, expand),
+        )
+
+    async def _get_next_sprint(self, board_id: str) -> str:
+        cache_key = self._sprint_cache_key(board_id)
+        next_sprint = self.sprint_cache.get(cache_key)
+        if next_sprint is None:
+            sprints = await self._api_request(
+                "GET", "rest/agile/1.0/board/{}/sprint?state=future", board_id
+            )
+            next_sprint = next(iter(sprints.get("values", [])), {})
+            self.sprint_cache.put(cache_key, next_sprint)
+        return next_sprint.get("id", "")
+
+    async def iter_search(
+        self,
+        jql: str,
+        fields: str | Iterable[str] | None = None,
+        page_size: int = DEFAULT_SEARCH_PAGE_SIZE,
+        expand: str | Iterable[str] | None = None,
+    ) -> AsyncIterator[dict]:
+        params = self._search_params(jql, fields, expand)
+        start_at: int | None = 0
+        while start_at is not None:
+            response = await self._api_request(
+                "GET",
+                "/rest/api/2/search",
+                params={**params, "startAt": start_at, "maxResults": page_size},
+            )
+            for issue in response.get("issues", []):
+                yield issue
+            start_at = self._next_start_at(response, start_at)
+
+    async def get_active_epics(self) -> list[dict]:
+        await self._resolve_field_names()
+        jql = self._active_epics_jql()
+        return [epic async for epic in self.iter_search(jql, fields="key,summary")]
+
+    async def set_epic(self, ticket: str, parent_epic: str) -> dict:
+        await self._resolve_field_names()
+        return await self._api_request(
+            "PUT",
+            "/rest/api/2/issue/{}",
+            ticket,
+            json={"fields": {self.epic_field: parent_epic}},
+        )
+
+    async def create_ticket(
+        self,
+        title: str,
+        description: str | None,
+        issue_type: str | None,
+        epic: str | None,
+        project: str | None,
+        sprint_position: SprintPosition,
+    ) -> dict:
+        """
+        @raise PayloadError: if VALIDATE_FIELDS is set and the fields don't fit
+        the create screen, before anything is sent
+        """
+        await self._resolve_field_names()
+        sprint = None
+        if issue_type != "Epic" and sprint_position == SprintPosition.NEXT_SPRINT:
+            sprint = await self._get_next_sprint(self.board_id)
+        fields = self._ticket_fields(
+            title, description, issue_type, epic, project, sprint
+        )
+        await self._check_fields(fields)
+        body = {"fields": fields}
+
+        created_issue = await self._api_request("POST", "/rest/api/2/issue", json=body)
+
+        if created_issue and sprint_position in (
+            SprintPosition.TOP_OF_BACKLOG,
+            SprintPosition.BOTTOM_OF_BACKLOG,
+        ):
+            await self._api_request(
+                "POST",
+                "/rest/agile/1.0/backlog/issue",
+                json={"issues": [created_issue["key"]]},
+                params=self._backlog_rank_params(sprint_position),
+            )
+
+        return created_issue
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import configparser
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_SPRINT_CACHE_TTL = 300.0
+DEFAULT_RESPONSE_CACHE_DIR = Path.home() / ".cache" / "jira-util" / "responses"
+DEFAULT_RESPONSE_CACHE_MAX_MB = 50.0
+DEFAULT_METADATA_CACHE_TTL = 86400.0
+DEFAULT_METADATA_CACHE_FILE = Path.home() / ".cache" / "jira-util" / "metadata.json"
+
+
+def parse_jira_datetime(value: str | None) -> float | None:
+    """
+    Parse a Jira timestamp such as 2024-05-01T09:00:00.000Z or
+    2024-05-01T09:00:00.000+0000
+    @return: the POSIX timestamp, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.replace("Z", "+00:00")
+    if len(value) > 5 and value[-5] in "+-" and value[-3] != ":":
+        value = f"{value[:-2]}:{value[-2:]}"
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+class FileCache:
+    """
+    Values kept for `ttl` seconds, optionally persisted to a JSON file between
+    invocations
+    """
+
+    # Key of the values in the file
+    value_key = "value"
+
+    def __init__(
+        self,
+        ttl: float,
+        path: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.path = path
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # Read on first use, so clients that never look anything up don't parse
+        # the file
+        self._entries: dict[str, dict] | None = None
+
+    def get(self, key: str) -> Any:
+        """
+        @return: the cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._loaded_entries().get(key)
+            if entry is None or self.clock() >= entry["expires"]:
+                return None
+            return entry[self.value_key]
+
+    def put(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        expires = self._expires(value)
+        with self._lock:
+            self._loaded_entries()[key] = {self.value_key: value, "expires": expires}
+            self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+    def _expires(self, value: Any) -> float:
+        return self.clock() + self.ttl
+
+    def _loaded_entries(self) -> dict[str, dict]:
+        """
+        Call with the lock held
+        """
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> dict[str, dict]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError) as ex:
+            self.logger.warning(f"Ignoring unreadable cache {self.path}: {ex}")
+            return {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        now = self.clock()
+        entries = {
+            k: v for k, v in self._loaded_entries().items() if v["expires"] > now
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entries))
+        os.replace(tmp_path, self.path)
+
+
+class SprintCache(FileCache):
+    """
+    The next sprint of each board, kept for `ttl` seconds and optionally
+    persisted to a JSON file between invocations. An entry also expires when
+    the start date of the cached sprint passes, because the sprint is then
+    active and the next one has rolled over.
+    """
+
+    value_key = "sprint"
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_SPRINT_CACHE_TTL,
+        path: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(ttl, path, clock)
+
+    @classmethod
+    def from_config(
+        cls, config: configparser.ConfigParser, config_section: str
+    ) -> SprintCache:
+        path = config.get(config_section, "SPRINT_CACHE_FILE", fallback=None)
+        return cls(
+            ttl=config.getfloat(
+                config_section, "SPRINT_CACHE_TTL", fallback=DEFAULT_SPRINT_CACHE_TTL
+            ),
+            path=Path(path).expanduser() if path else None,
+        )
+
+    def get(self, key: str) -> dict | None:
+        """
+        @param key: identifies the board, e.g. "<base url>/<board id>"
+        @return: the cached sprint ({} if the board had none), or None on a miss
+        """
+        return super().get(key)
+
+    def _expires(self, value: Any) -> float:
+        expires = super()._expires(value)
+        starts = parse_jira_datetime(value.get("startDate"))
+        return expires if starts is None else min(expires, starts)
+
+
+class MetadataCache(FileCache):
+    """
+    Field and create screen metadata, which rarely changes, kept on disk for
+    `ttl` seconds
+    """
+
+    @classmethod
+    def from_config(
+        cls, config: configparser.ConfigParser, config_section: str
+    ) -> MetadataCache:
+        path = config.get(config_section, "METADATA_CACHE_FILE", fallback=None)
+        return cls(
+            ttl=config.getfloat(
+                config_section,
+                "METADATA_CACHE_TTL",
+                fallback=DEFAULT_METADATA_CACHE_TTL,
+            ),
+            path=Path(path).expanduser() if path else DEFAULT_METADATA_CACHE_FILE,
+        )
+
+
+class CachedResponse:
+    """
+    A response body read from the ResponseCache, with the validators needed to
+    revalidate it
+    """
+
+    def __init__(self, entry: dict, fresh: bool) -> None:
+        self.body: dict = entry["body"]
+        self.etag: str | None = entry.get("etag")
+        self.last_modified: str | None = entry.get("last_modified")
+        self.fresh = fresh
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """
+        @return: the headers making a GET conditional on the cached version
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    GET responses kept on disk, one file per request, for `ttl` seconds. Stale
+    responses that came with an ETag or Last-Modified header are revalidated
+    with a conditional request instead of being fetched again. Once the files
+    add up to more than `max_size` bytes, the least recently used are removed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float,
+        max_size: int = int(DEFAULT_RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    @classmethod
+    def from_config(
+        cls,
+        config: configparser.ConfigParser,
+        config_section: str,
+        ttl: float | None = None,
+    ) -> ResponseCache | None:
+        """
+        @param ttl: overrides RESPONSE_CACHE_TTL from the config
+        @return: the cache, or None if it isn't enabled
+        """
+        if ttl is None:
+            ttl = config.getfloat(config_section, "RESPONSE_CACHE_TTL", fallback=0.0)
+        if ttl <= 0:
+            return None
+        path = config.get(config_section, "RESPONSE_CACHE_DIR", fallback=None)
+        max_mb = config.getfloat(
+            config_section,
+            "RESPONSE_CACHE_MAX_MB",
+            fallback=DEFAULT_RESPONSE_CACHE_MAX_MB,
+        )
+        return cls(
+            path=Path(path).expanduser() if path else DEFAULT_RESPONSE_CACHE_DIR,
+            ttl=ttl,
+            max_size=int(max_mb * 1024 * 1024),
+        )
+
+    @staticmethod
+    def key(url: str, params: dict | None, authorization: str) -> str:
+        """
+        @param authorization: the Authorization header, so that users with
+        different permissions never share entries. Only its hash is stored.
+        @return: the cache key of a GET request
+        """
+        material = json.dumps([url, params or {}, authorization], sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry_path = self.path / f"{key}.json"
+        try:
+            entry = json.loads(entry_path.read_text())
+            # The modification time orders entries for eviction
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(entry, self.clock() < entry["stored"] + self.ttl)
+
+    def put(
+        self,
+        key: str,
+        body: dict,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        entry = {
+            "stored": self.clock(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+        }
+        data = json.dumps(entry)
+        entry_path = self.path / f"{key}.json"
+        with self._lock:
+            size = self._current_size()
+            try:
+                size -= entry_path.stat().st_size
+            except OSError:
+                pass
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(data)
+            os.replace(tmp_path, entry_path)
+            self._size = size + len(data)
+            if self._size > self.max_size:
+                self._evict()
+
+    def revalidated(self, key: str, cached: CachedResponse) -> None:
+        """
+        Restart the TTL of an entry after the server confirmed it is unchanged
+        """
+        self.put(key, cached.body, cached.etag, cached.last_modified)
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry_path in self.path.glob("*.json"):
+                entry_path.unlink(missing_ok=True)
+            self._size = 0
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self.path.glob("*.json"))
+        return self._size
+
+    def _evict(self) -> None:
+        entries = []
+        for entry_path in self.path.glob("*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+        # Evict down to 90% so that every put doesn't scan the directory again
+        for _, entry_size, entry_path in entries:
+            if size <= self.max_size * 0.9:
+                break
+            entry_path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
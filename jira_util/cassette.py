@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, TextIO, cast
+
+import requests
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from jira_util.tracing import redact_headers
+
+# Connection errors that can be recorded and raised again, by name
+ERRORS = {
+    error.__name__: error
+    for error in (
+        requests.ConnectionError,
+        requests.Timeout,
+        requests.ConnectTimeout,
+        requests.ReadTimeout,
+    )
+}
+
+
+class CassetteMiss(requests.RequestException):
+    """
+    Raised when replaying a request that isn't in the cassette
+    """
+
+
+def open_cassette(path: Path, mode: str) -> TextIO:
+    """
+    @param mode: "r" or "w". Cassettes whose name ends in .gz are compressed.
+    """
+    if path.suffix == ".gz":
+        return cast(TextIO, gzip.open(path, f"{mode}t", encoding="utf-8"))
+    return cast(TextIO, open(path, mode, encoding="utf-8"))
+
+
+def _body_text(body: str | bytes | None) -> str | None:
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return body
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Sends requests like HTTPAdapter and writes every exchange to a cassette,
+    one JSON object per line: the request, the response or the connection
+    error, and how long it took. Credentials in headers are redacted.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs: Any,
+    ) -> None:
+        """
+        @param kwargs: passed to HTTPAdapter, e.g. pool_maxsize
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._file = open_cassette(path, "w")
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> Response:
+        started = self.clock()
+        entry = {
+            "at": round(started - self._started, 6),
+            "method": request.method,
+            "url": request.path_url,
+            "request_headers": redact_headers(request.headers),
+            "request_body": _body_text(request.body),
+        }
+        try:
+            response = super().send(request, stream, timeout, verify, cert, proxies)
+            if not stream:
+                # Read the body now, so that the time includes downloading it
+                entry["body"] = _body_text(response.content)
+        except requests.RequestException as ex:
+            entry.update(
+                error=str(ex),
+                error_type=type(ex).__name__,
+                elapsed=round(self.clock() - started, 6),
+            )
+            self._write(entry)
+            raise
+        entry.update(
+            status=response.status_code,
+            headers=redact_headers(response.headers),
+            elapsed=round(self.clock() - started, 6),
+        )
+        self._write(entry)
+        return response
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            self._file.write(f"{line}\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        super().close()
+        with self._lock:
+            self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Serves the responses of a cassette instead of sending requests. A request
+    is answered by the first unused exchange recorded with the same method,
+    path and body, or failing that the same method and path, after waiting for
+    the recorded time multiplied by `latency_scale`. Once the recorded responses
+    to a request run out, the last one is served again.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        latency_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        super().__init__()
+        self.latency_scale = latency_scale
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        # Exchanges by method and path in recorded order, and those not served
+        self._recorded: dict[tuple, list[dict]] = defaultdict(list)
+        self._unused: dict[tuple, list[dict]] = defaultdict(list)
+        with open_cassette(path, "r") as f:
+            for line in f:
+                entry = json.loads(line)
+                key = (entry["method"], entry["url"])
+                self._recorded[key].append(entry)
+                self._unused[key].append(entry)
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> Response:
+        entry = self._next_entry(request)
+        if entry is None:
+            raise CassetteMiss(
+                f"No recorded response for {request.method} {request.path_url}",
+                request=request,
+            )
+        self.sleep(entry["elapsed"] * self.latency_scale)
+        if "error" in entry:
+            error = ERRORS.get(entry.get("error_type", ""), requests.ConnectionError)
+            raise error(entry["error"], request=request)
+
+        response = Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = (entry.get("body") or "").encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url or ""
+        response.request = request
+        response.elapsed = timedelta(seconds=entry["elapsed"])
+        return response
+
+    def _next_entry(self, request: PreparedRequest) -> dict | None:
+        key = (request.method, request.path_url)
+        body = _body_text(request.body)
+        with self._lock:
+            unused = self._unused.get(key, [])
+            if unused:
+                matches = [
+                    i for i, entry in enumerate(unused) if entry["request_body"] == body
+                ]
+                return unused.pop(matches[0] if matches else 0)
+            recorded = self._recorded.get(key, [])
+            served = [e for e in recorded if e["request_body"] == body] or recorded
+            return served[-1] if served else None
+
+    def close(self) -> None:
+        pass
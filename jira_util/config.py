@@ -0,0 +1,3 @@
+from pathlib import Path
+
+CONFIG_FILE_HOME = Path.home() / ".jira-util.config"
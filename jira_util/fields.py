@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Any
+
+# Field ids as opposed to field names: custom fields and system fields such as
+# "priority" or "fixVersions"
+FIELD_ID_PATTERN = re.compile(r"^(customfield_[0-9]+|[a-z][A-Za-z]*)$")
+# Keys identifying an option in a value such as {"name": "Medium"}
+OPTION_KEYS = ("id", "key", "name", "value")
+
+
+def is_field_id(field: str) -> bool:
+    return bool(FIELD_ID_PATTERN.match(field))
+
+
+class FieldError(ValueError):
+    """
+    Raised when a field name doesn't match exactly one field
+    """
+
+
+class PayloadError(ValueError):
+    """
+    Raised when the fields of an issue don't fit the create screen of its
+    project and issue type, before they are sent
+    """
+
+    def __init__(self, errors: dict[str, str]) -> None:
+        self.errors = errors
+        details = "; ".join(f"{field}: {error}" for field, error in errors.items())
+        super().__init__(f"Invalid issue fields: {details}")
+
+
+class FieldCatalog:
+    """
+    The fields of a Jira instance, as returned by /rest/api/2/field, looked up
+    by id or by name
+    """
+
+    def __init__(self, fields: list[dict]) -> None:
+        self.names = {field["id"]: field.get("name", field["id"]) for field in fields}
+        self._ids_by_name: dict[str, list[str]] = defaultdict(list)
+        for field in fields:
+            self._ids_by_name[field.get("name", "").casefold()].append(field["id"])
+
+    def resolve(self, field: str) -> str:
+        """
+        @param field: a field id, or a field name in any case, e.g. "Epic Link"
+        @return: the id of the field
+        @raise FieldError: if no field, or more than one, has that name
+        """
+        if field in self.names:
+            return field
+        ids = self._ids_by_name.get(field.casefold(), [])
+        if len(ids) == 1:
+            return ids[0]
+        if ids:
+            raise FieldError(
+                f"Several fields are named {field!r} ({', '.join(ids)}), "
+                "use the id of the right one"
+            )
+        raise FieldError(f"No field is named {field!r}")
+
+
+class CreateMeta:
+    """
+    The issue types of a project and the fields of their create screens, as
+    returned by /rest/api/2/issue/createmeta with projects.issuetypes.fields
+    """
+
+    def __init__(self, project: str, response: dict) -> None:
+        self.project = project
+        projects = response.get("projects", [])
+        self.exists = bool(projects)
+        self.screens: dict[str, dict[str, dict]] = {
+            issue_type["name"]: issue_type.get("fields", {})
+            for project_meta in projects
+            for issue_type in project_meta.get("issuetypes", [])
+        }
+
+    def errors(self, fields: dict) -> dict[str, str]:
+        """
+        Check the fields of a new issue the way Jira would
+        @return: an error message by field id, like the "errors" of Jira's 400
+        responses. Empty if the fields are valid.
+        """
+        if not self.exists:
+            return {
+                "project": f"Project {self.project} doesn't exist or you can't "
+                "create issues in it"
+            }
+        issue_type = fields.get("issuetype", {}).get("name")
+        screen = self.screens.get(issue_type)
+        if screen is None:
+            return {
+                "issuetype": f"{issue_type} isn't an issue type of {self.project} "
+                f"({', '.join(sorted(self.screens))})"
+            }
+        return screen_errors(screen, fields, f"{issue_type} in {self.project}")
+
+
+def screen_errors(screen: dict[str, dict], fields: dict, name: str) -> dict[str, str]:
+    """
+    @param screen: the createmeta fields of the issue type, by id
+    @param name: what the screen belongs to, for the messages
+    """
+    errors = {}
+    for field, value in fields.items():
+        meta = screen.get(field)
+        if meta is None:
+            if field not in ("project", "issuetype"):
+                errors[field] = f"Not on the create screen of {name}, or unknown"
+            continue
+        option = invalid_option(value, meta.get("allowedValues"))
+        if option:
+            allowed = ", ".join(option_label(a) for a in meta["allowedValues"])
+            errors[field] = f"{option} isn't allowed for {meta.get('name')} ({allowed})"
+    for field, meta in screen.items():
+        if meta.get("required") and not meta.get("hasDefaultValue"):
+            if field not in fields:
+                errors[field] = f"{meta.get('name', field)} is required"
+    return errors
+
+
+def option_label(option: dict) -> str:
+    return str(next((option[key] for key in OPTION_KEYS[::-1] if key in option), ""))
+
+
+def invalid_option(value: Any, allowed: list[dict] | None) -> str | None:
+    """
+    @param value: a field value, e.g. {"name": "Medium"} or a list of them
+    @param allowed: the allowedValues of the field, if it has a fixed set
+    @return: the label of the first option of the value that isn't allowed
+    """
+    if not allowed:
+        return None
+    for option in value if isinstance(value, list) else [value]:
+        keys = [
+            key for key in OPTION_KEYS if isinstance(option, dict) and key in option
+        ]
+        if keys and not any(
+            all(str(a.get(key)) == str(option[key]) for key in keys) for a in allowed
+        ):
+            return option_label(option)
+    return None
@@ -8,7 +8,7 @@ from urllib.parse import urlparse
 
 import questionary
 
-CONFIG_FILE_HOME = Path.home() / ".jira-util.config"
+from jira_util.config import CONFIG_FILE_HOME
 
 
 def read_config(config_file: Path) -> configparser.ConfigParser:
@@ -57,7 +57,7 @@ def get_custom_fields() -> dict:
     custom_fields = {}
     while True:
         field_name = questionary.text(
-            "Custom Field Name (e.g., customfield_12345):"
+            "Custom Field (e.g., customfield_12345, or a name such as Team):"
         ).ask()
         field_value = questionary.text(
             "Custom Field Value or JSON (press Enter if not applicable):"
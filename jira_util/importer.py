@@ -0,0 +1,726 @@
+from __future__ import annotations
+
+import functools
+import logging
+import re
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from jira_util.jira import (
+    BACKLOG_RANK_LIMIT,
+    BULK_CREATE_LIMIT,
+    SUMMARY_SEARCH_LIMIT,
+    IssueType,
+    JiraAPI,
+    SprintPosition,
+)
+from jira_util.journal import FileHash, ImportJournal
+
+logger = logging.getLogger(__name__)
+
+# Issue types created one at a time, which the stories below them belong to
+PARENT_TYPES = ("Deliverable", "Epic")
+# Jira rejects longer summaries
+SUMMARY_MAX_LENGTH = 255
+
+
+class TicketImportError(Exception):
+    """
+    Raised when tickets for some lines of an input file could not be created
+    """
+
+    def __init__(self, errors: dict[int, dict]) -> None:
+        self.errors = errors
+        details = "; ".join(
+            f"line {line_number}: {error}" for line_number, error in errors.items()
+        )
+        super().__init__(f"Failed to create tickets: {details}")
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """
+    A problem with a line of an input file
+    """
+
+    line_number: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line_number}: {self.message}"
+
+
+class TicketFileError(Exception):
+    """
+    Raised when an input file has invalid lines, before any ticket is created
+    """
+
+    def __init__(self, diagnostics: list[Diagnostic]) -> None:
+        self.diagnostics = diagnostics
+        details = "\n".join(str(diagnostic) for diagnostic in diagnostics)
+        super().__init__(f"Invalid input file:\n{details}")
+
+
+@dataclass(frozen=True)
+class PlannedCall:
+    """
+    An API call that importing a file will make
+    """
+
+    operation: str
+    line_numbers: tuple[int, ...]
+    description: str
+
+    def __str__(self) -> str:
+        first, last = self.line_numbers[0], self.line_numbers[-1]
+        lines = f"line {first}" if first == last else f"lines {first}-{last}"
+        return f"{self.operation:<13} {lines:<13} {self.description}"
+
+
+@dataclass(eq=False)
+class TicketNode:
+    """
+    A single line of an input file. Stories depend on the epic above them.
+    """
+
+    line_number: int
+    issue_type: str
+    summary: str
+    epic: TicketNode | None = None
+    key: str | None = None
+    # Whether the key was created by this import, now or in an earlier run
+    created: bool = False
+    resumed: bool = False
+    # Whether the key is that of an existing issue found with --dedupe
+    found: bool = False
+
+    @property
+    def is_story(self) -> bool:
+        return IssueType.is_valid(self.issue_type)
+
+
+@dataclass(eq=False)
+class TicketBatch:
+    """
+    Lines created together: a single Deliverable/Epic, or up to
+    BULK_CREATE_LIMIT sibling stories under the same epic
+    """
+
+    nodes: list[TicketNode]
+    done: bool = False
+
+    @property
+    def depends_on(self) -> TicketNode | None:
+        return self.nodes[0].epic
+
+    @property
+    def ready(self) -> bool:
+        return self.depends_on is None or self.depends_on.key is not None
+
+
+def existing_ticket(summary: str) -> str | None:
+    match = re.match("^[A-Z]+-[0-9]+", summary)
+    return match.group() if match else None
+
+
+def create_ticket(
+    jira_api: JiraAPI,
+    summary: str,
+    issue_type: str,
+    epic: str | None,
+    project: str | None,
+) -> str:
+    return jira_api.create_ticket(
+        summary,
+        summary,
+        issue_type=issue_type,
+        epic=epic if IssueType.is_valid(issue_type) else None,
+        project=project,
+        sprint_position=SprintPosition.NEXT_SPRINT,
+    )["key"]
+
+
+def verbose_output(
+    jira_api: JiraAPI,
+    summary: str,
+    ticket_id: str,
+    issue_type: str,
+    epic: str | None,
+    found: bool | None = None,
+) -> str:
+    """
+    @param found: whether the ticket already existed, by default whether the
+    summary is a ticket id
+    """
+    url = f"https://{jira_api.base}/browse/{ticket_id}"
+    if found is None:
+        found = existing_ticket(summary) is not None
+    created_or_found = "Found" if found else "Created"
+    # Indented like the lines of the input file
+    if issue_type == "Deliverable":
+        return f"{created_or_found} {issue_type} {url}"
+    elif issue_type == "Epic":
+        return f"\t{created_or_found} {issue_type} {url}"
+    elif IssueType.is_valid(issue_type):
+        return f"\t\t{created_or_found} {issue_type} {url}, epic is {epic}"
+    else:
+        raise ValueError(f"Unknown issue type {issue_type}")
+
+
+def parse_ticket_line(line_number: int, line: str) -> TicketNode | Diagnostic:
+    issue_type, separator, summary = line.partition(": ")
+    summary = summary.strip()
+    if not separator:
+        return Diagnostic(line_number, f'expected "Issue type: summary", got "{line}"')
+    if issue_type not in PARENT_TYPES and not IssueType.is_valid(issue_type):
+        types = ", ".join([*PARENT_TYPES, *(member.value for member in IssueType)])
+        return Diagnostic(
+            line_number, f'unknown issue type "{issue_type}", expected one of {types}'
+        )
+    if len(summary) > SUMMARY_MAX_LENGTH:
+        return Diagnostic(
+            line_number,
+            f"the summary is longer than {SUMMARY_MAX_LENGTH} characters",
+        )
+    return TicketNode(line_number, issue_type, summary, key=existing_ticket(summary))
+
+
+def tokenize_ticket_file(
+    input_file: Iterable[str],
+) -> Iterator[TicketNode | Diagnostic]:
+    """
+    Read an input file one line at a time
+    @param input_file: lines in the "Issue type: summary" format
+    @return: a node, or what is wrong with the line, for every line that isn't
+    blank or a comment
+    """
+    for line_number, line in enumerate(input_file, start=1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield parse_ticket_line(line_number, line)
+
+
+def parse_ticket_file(input_file: Iterable[str]) -> list[TicketBatch]:
+    """
+    Build the dependency graph of an input file. The whole file is checked
+    before anything is created.
+    @param input_file: lines in the "Issue type: summary" format
+    @return: batches in file order, each depending on at most one epic
+    @raise TicketFileError: listing every invalid line
+    """
+    batches: list[TicketBatch] = []
+    stories: list[TicketNode] = []
+    diagnostics: list[Diagnostic] = []
+    epic = None
+    for node in tokenize_ticket_file(input_file):
+        if isinstance(node, Diagnostic):
+            diagnostics.append(node)
+            continue
+
+        if node.is_story:
+            node.epic = epic
+            stories.append(node)
+            if len(stories) == BULK_CREATE_LIMIT:
+                batches.append(TicketBatch(stories))
+                stories = []
+            continue
+
+        if stories:
+            batches.append(TicketBatch(stories))
+            stories = []
+        batches.append(TicketBatch([node]))
+
+        if node.issue_type == "Epic":
+            epic = node
+
+    if diagnostics:
+        raise TicketFileError(diagnostics)
+    if stories:
+        batches.append(TicketBatch(stories))
+    return batches
+
+
+def create_stories(
+    jira_api: JiraAPI, stories: list[TicketNode], project: str | None
+) -> None:
+    """
+    Create sibling stories under the same epic with one bulk request, and move
+    the existing ones under it with another
+    """
+    epic = stories[0].epic.key if stories[0].epic else None
+    new_stories = [story for story in stories if not story.key]
+    results = jira_api.create_tickets_bulk(
+        [
+            {
+                "title": story.summary,
+                "description": story.summary,
+                "issue_type": story.issue_type,
+                "epic": epic,
+                "project": project,
+            }
+            for story in new_stories
+        ],
+        sprint_position=SprintPosition.NEXT_SPRINT,
+    )
+
+    errors = {}
+    for story, result in zip(new_stories, results):
+        if "key" in result:
+            story.key = result["key"]
+            story.created = True
+        else:
+            errors[story.line_number] = result
+
+    existing_stories = {
+        story.key: story
+        for story in stories
+        if story.key and story not in new_stories and not (story.resumed or story.found)
+    }
+    if epic and existing_stories:
+        epic_errors = jira_api.set_epic_bulk(epic, list(existing_stories))
+        for key, message in epic_errors.items():
+            errors[existing_stories[key].line_number] = {"errors": message}
+
+    if errors:
+        raise TicketImportError(errors)
+
+
+def create_batch(jira_api: JiraAPI, batch: TicketBatch, project: str | None) -> None:
+    node = batch.nodes[0]
+    if node.is_story:
+        create_stories(jira_api, batch.nodes, project)
+    elif not node.key:
+        node.key = create_ticket(jira_api, node.summary, node.issue_type, None, project)
+        node.created = True
+
+
+def start_ready_batches(
+    pool: ThreadPoolExecutor,
+    jobs: int,
+    pending: list[TicketBatch],
+    running: dict[Future, TicketBatch],
+    jira_api: JiraAPI,
+    project: str | None,
+) -> None:
+    while len(running) < jobs:
+        batch = next((b for b in pending if b.ready), None)
+        if batch is None:
+            return
+        pending.remove(batch)
+        running[pool.submit(create_batch, jira_api, batch, project)] = batch
+
+
+def finish_batches(
+    finished: set[Future],
+    running: dict[Future, TicketBatch],
+    journal: Callable[[TicketNode], None] | None = None,
+) -> list[tuple[int, BaseException]]:
+    errors = []
+    for future in finished:
+        batch = running.pop(future)
+        batch.done = True
+        if journal:
+            # Failed bulk requests may still have created some of the stories
+            for node in batch.nodes:
+                if node.created and not node.resumed:
+                    journal(node)
+        exception = future.exception()
+        if exception:
+            errors.append((batch.nodes[0].line_number, exception))
+    return errors
+
+
+def execute_ticket_graph(
+    jira_api: JiraAPI,
+    batches: list[TicketBatch],
+    project: str | None = None,
+    jobs: int = 1,
+    journal: Callable[[TicketNode], None] | None = None,
+) -> Iterator[TicketNode]:
+    """
+    Create the tickets of a parsed input file on a pool of `jobs` workers.
+    Batches are started in file order as soon as their epic exists, so a single
+    worker behaves exactly like walking the file line by line. Several workers
+    finish in any order, so the created tickets are then ranked in file order,
+    the order Jira gives them when they are created one line at a time.
+    @param journal: called with every node whose ticket was created, as soon as
+    its batch finishes
+    @return: the processed nodes, in file order
+    """
+    nodes = [(batch, node) for batch in batches for node in batch.nodes]
+    pending = [batch for batch in batches if not batch.done]
+    running: dict[Future, TicketBatch] = {}
+    errors: list[tuple[int, BaseException]] = []
+    emitted = 0
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while True:
+            if not errors:
+                start_ready_batches(pool, jobs, pending, running, jira_api, project)
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            errors.extend(finish_batches(finished, running, journal))
+
+            while emitted < len(nodes) and nodes[emitted][0].done:
+                batch, node = nodes[emitted]
+                emitted += 1
+                if node.key:
+                    yield node
+
+    for batch, node in nodes[emitted:]:
+        if batch.done and node.key:
+            yield node
+    if errors:
+        raise min(errors, key=lambda error: error[0])[1]
+    if jobs > 1:
+        rank_in_file_order(jira_api, [node for _, node in nodes])
+
+
+def created_keys(nodes: list[TicketNode]) -> list[str]:
+    return [node.key for node in nodes if node.created and node.key]
+
+
+def rank_in_file_order(jira_api: JiraAPI, nodes: list[TicketNode]) -> None:
+    errors = jira_api.rank_issues(created_keys(nodes))
+    for key, message in errors.items():
+        logger.warning(f"Could not rank {key} in file order: {message}")
+
+
+def resume_from_journal(batches: list[TicketBatch], created: dict[int, str]) -> int:
+    """
+    Reuse the tickets created for the same lines by an earlier, interrupted run
+    @param created: the created keys by line number, from the journal
+    @return: the number of lines that are already done
+    """
+    resumed = 0
+    for batch in batches:
+        for node in batch.nodes:
+            if not node.key and node.line_number in created:
+                node.key = created[node.line_number]
+                node.created = node.resumed = True
+                resumed += 1
+        batch.done = all(node.resumed for node in batch.nodes)
+    return resumed
+
+
+def normalize_summary(summary: str) -> str:
+    return " ".join(summary.split()).casefold()
+
+
+def find_existing_tickets(
+    jira_api: JiraAPI, batches: list[TicketBatch], project: str | None
+) -> int:
+    """
+    Turn the lines whose summary and issue type match an existing issue of the
+    project into references to that issue, so re-running a file doesn't create
+    duplicates. Stories under an epic only match issues already linked to that
+    epic, since found issues aren't moved. The summaries are looked up with a few
+    batched searches.
+    @return: the number of lines that matched
+    """
+    nodes = [node for batch in batches for node in batch.nodes if not node.key]
+    # Results are oldest first, so the original wins over earlier duplicates
+    existing: dict[tuple[str, str], list[tuple[str, str | None]]] = defaultdict(list)
+    for issue in jira_api.search_summaries([node.summary for node in nodes], project):
+        fields = issue.get("fields", {})
+        match = (
+            normalize_summary(fields.get("summary", "")),
+            fields.get("issuetype", {}).get("name", ""),
+        )
+        existing[match].append((issue["key"], fields.get(jira_api.epic_field)))
+
+    found = 0
+    for node in nodes:
+        matches = existing.get((normalize_summary(node.summary), node.issue_type), [])
+        if node.is_story and node.epic:
+            # Epics are matched first, a new one has no key and no stories yet
+            epic = node.epic.key
+            matches = [match for match in matches if epic and match[1] == epic]
+        if matches:
+            node.key = matches[0][0]
+            node.found = True
+            found += 1
+    return found
+
+
+def check_fields(
+    jira_api: JiraAPI, batches: list[TicketBatch], project: str | None
+) -> list[Diagnostic]:
+    """
+    Check the tickets to create against the create screens of the project, so
+    that a field Jira would reject fails the whole file up front rather than
+    every line with a 400
+    @return: the lines whose tickets would be rejected
+    """
+    nodes = [node for batch in batches for node in batch.nodes if not node.key]
+    # Looked up once rather than per line, even with the sprint cache disabled
+    sprint = None
+    if any(node.issue_type != "Epic" for node in nodes):
+        sprint = jira_api.next_sprint()
+    diagnostics: list[Diagnostic] = []
+    for node in nodes:
+        # New epics have no key yet, and only the presence of one is checked
+        epic = (node.epic.key or node.epic.summary) if node.epic else None
+        errors = jira_api.ticket_errors(
+            node.summary,
+            node.summary,
+            node.issue_type,
+            epic if node.is_story else None,
+            project,
+            SprintPosition.NEXT_SPRINT,
+            sprint,
+        )
+        diagnostics.extend(
+            Diagnostic(node.line_number, f"{field}: {error}")
+            for field, error in errors.items()
+        )
+    return diagnostics
+
+
+def describe_parent(node: TicketNode | None) -> str:
+    if node is None:
+        return "no epic"
+    return node.key or f"the {node.issue_type} on line {node.line_number}"
+
+
+def plan_batch(batch: TicketBatch) -> list[PlannedCall]:
+    """
+    @return: the calls create_batch will make for the batch. Batches never hold
+    more stories than a single bulk request takes.
+    """
+    node = batch.nodes[0]
+    if batch.done or (not node.is_story and node.key):
+        return []
+    if not node.is_story:
+        return [
+            PlannedCall(
+                "create", (node.line_number,), f'{node.issue_type} "{node.summary}"'
+            )
+        ]
+
+    calls = []
+    epic = describe_parent(batch.depends_on)
+    new_stories = [story for story in batch.nodes if not story.key]
+    if new_stories:
+        calls.append(
+            PlannedCall(
+                "create-bulk",
+                tuple(story.line_number for story in new_stories),
+                f"{len(new_stories)} ticket{'s' * (len(new_stories) != 1)} "
+                f"under {epic}",
+            )
+        )
+    existing = [story for story in batch.nodes if story.key and not story.resumed]
+    if existing and batch.depends_on:
+        calls.append(
+            PlannedCall(
+                "set-epic",
+                tuple(story.line_number for story in existing),
+                f"move {', '.join(str(story.key) for story in existing)} under {epic}",
+            )
+        )
+    return calls
+
+
+def plan_searches(batches: list[TicketBatch]) -> list[PlannedCall]:
+    """
+    @return: the searches find_existing_tickets will make
+    """
+    lines: dict[str, int] = {}
+    for batch in batches:
+        for node in batch.nodes:
+            if not node.key:
+                lines.setdefault(node.summary, node.line_number)
+    summaries = list(lines)
+    calls = []
+    for start in range(0, len(summaries), SUMMARY_SEARCH_LIMIT):
+        chunk = summaries[start : start + SUMMARY_SEARCH_LIMIT]
+        calls.append(
+            PlannedCall(
+                "search",
+                tuple(sorted(lines[summary] for summary in chunk)),
+                f"look for {len(chunk)} summaries",
+            )
+        )
+    return calls
+
+
+def plan_ranks(batches: list[TicketBatch]) -> list[PlannedCall]:
+    """
+    @return: the calls rank_in_file_order will make after a parallel import
+    """
+    nodes = [
+        node
+        for batch in batches
+        for node in batch.nodes
+        if node.resumed or not (node.key or batch.done)
+    ]
+    calls = []
+    for start in range(1, len(nodes), BACKLOG_RANK_LIMIT):
+        chunk = nodes[start : start + BACKLOG_RANK_LIMIT]
+        calls.append(
+            PlannedCall(
+                "rank",
+                tuple(node.line_number for node in chunk),
+                f"rank {len(chunk)} tickets in file order",
+            )
+        )
+    return calls
+
+
+def plan_import(
+    batches: list[TicketBatch],
+    board_id: str,
+    dedupe: bool = False,
+    jobs: int = 1,
+    field_names: list[str] | None = None,
+    validate_project: str | None = None,
+) -> list[PlannedCall]:
+    """
+    Compile a parsed input file into the API calls importing it will make
+    @param dedupe: include the searches for existing tickets, assuming none of
+    them match
+    @param jobs: the number of workers, more than one of which adds the ranks
+    putting the tickets back in file order
+    @param field_names: the configured field names whose ids are looked up
+    before the first call using them
+    @param validate_project: the project whose create screens the tickets are
+    checked against, with VALIDATE_FIELDS
+    @return: the calls, in the order a single worker makes them
+    """
+    calls = plan_searches(batches) if dedupe else []
+    new = [
+        node
+        for batch in batches
+        if not batch.done
+        for node in batch.nodes
+        if not node.key
+    ]
+    if validate_project and new:
+        calls.append(
+            PlannedCall(
+                "createmeta",
+                (new[0].line_number,),
+                f"fetch the create screens of {validate_project}, unless cached",
+            )
+        )
+    created = [node for node in new if node.issue_type != "Epic"]
+    if created:
+        calls.append(
+            PlannedCall(
+                "sprint",
+                (created[0].line_number,),
+                f"find the next sprint of board {board_id}, unless it is cached",
+            )
+        )
+    for batch in batches:
+        calls.extend(plan_batch(batch))
+    if jobs > 1:
+        calls.extend(plan_ranks(batches))
+    if field_names and calls:
+        calls.insert(
+            0,
+            PlannedCall(
+                "fields",
+                calls[0].line_numbers[:1],
+                f"look up the ids of {', '.join(field_names)}, unless cached",
+            ),
+        )
+    return calls
+
+
+def print_plan(calls: list[PlannedCall]) -> None:
+    for call in calls:
+        print(call)
+    print(f"{len(calls)} API calls")
+
+
+def record_created(
+    journal: ImportJournal, file_hash: str, jira: str, project: str, node: TicketNode
+) -> None:
+    assert node.key
+    journal.record(file_hash, jira, project, node.line_number, node.key)
+
+
+def create_tickets_from_file(
+    jira_api: JiraAPI,
+    input_file: Iterable[str],
+    verbose: bool = False,
+    project: str | None = None,
+    jobs: int = 1,
+    journal: ImportJournal | None = None,
+    resume: bool = False,
+    dedupe: bool = False,
+    dry_run: bool = False,
+) -> None:
+    """
+    @param journal: records every ticket created, by line of this file and by
+    Jira instance and project
+    @param resume: skip the lines the journal says were created by an earlier
+    run of the same file into the same Jira instance and project
+    @param dedupe: reuse existing issues with the same summary and issue type
+    instead of creating new ones
+    @param dry_run: print the API calls the import would make instead
+    @raise TicketFileError: if any line is invalid, or with VALIDATE_FIELDS any
+    ticket doesn't fit the create screen, before anything is created
+    """
+    hashed = FileHash()
+    batches = parse_ticket_file(hashed.read(input_file))
+
+    record: Callable[[TicketNode], None] | None = None
+    if journal:
+        file_hash = hashed.hexdigest()
+        target = (jira_api.base, project or jira_api.project)
+        created = journal.created_keys(file_hash, *target)
+        if resume:
+            resumed = resume_from_journal(batches, created)
+            logger.info(f"Resuming import, {resumed} lines were already created")
+        elif created:
+            logger.warning(
+                f"{len(created)} lines of this file were created by an earlier "
+                "import, use --resume to skip them"
+            )
+        record = functools.partial(record_created, journal, file_hash, *target)
+
+    if dry_run:
+        validate_project = project or jira_api.project
+        print_plan(
+            plan_import(
+                batches,
+                jira_api.board_id,
+                dedupe,
+                jobs,
+                jira_api.unresolved_field_names(),
+                validate_project if jira_api.validate_fields else None,
+            )
+        )
+        return
+
+    if dedupe:
+        found = find_existing_tickets(jira_api, batches, project)
+        logger.info(f"{found} lines match existing tickets")
+
+    if jira_api.validate_fields:
+        diagnostics = check_fields(jira_api, batches, project)
+        if diagnostics:
+            raise TicketFileError(diagnostics)
+
+    for node in execute_ticket_graph(jira_api, batches, project, jobs, record):
+        if verbose:
+            assert node.key
+            epic = node.epic.key if node.epic else None
+            print(
+                verbose_output(
+                    jira_api,
+                    node.summary,
+                    node.key,
+                    node.issue_type,
+                    epic,
+                    found=not node.created,
+                )
+            )
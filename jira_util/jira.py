@@ -2,15 +2,55 @@ from __future__ import annotations
 
 import base64
 import configparser
+import functools
+import itertools
 import json
 import logging
+import re
+import threading
+import time
 import urllib
 import urllib.parse
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import Any
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Iterable, Iterator
 
 import requests
 from requests import Response, codes
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from jira_util.cache import CachedResponse, MetadataCache, ResponseCache, SprintCache
+from jira_util.cassette import RecordingAdapter, ReplayAdapter
+from jira_util.fields import CreateMeta, FieldCatalog, PayloadError, is_field_id
+from jira_util.limiter import AdaptiveLimiter
+from jira_util.metrics import RequestMetrics
+from jira_util.retry import RetryPolicy
+from jira_util.singleflight import SingleFlight
+from jira_util.throttle import TokenBucket
+from jira_util.tracing import LazyJSON, redact_headers
+
+DEFAULT_POOL_SIZE = 10
+BULK_CREATE_LIMIT = 50
+DEFAULT_SEARCH_PAGE_SIZE = 100
+BACKLOG_RANK_LIMIT = 50
+EPIC_ISSUE_LIMIT = 50
+KEY_SEARCH_LIMIT = 100
+ISSUE_KEY_PATTERN = re.compile(r"^[A-Z][A-Z0-9_]*-[0-9]+$")
+SUMMARY_SEARCH_LIMIT = 50
+# Characters with a meaning in Jira text searches, even inside a phrase
+JQL_TEXT_RESERVED = re.compile(r'[+\-&|!(){}\[\]^~*?\\:"/]')
+
+# Named field lists that can be passed wherever `fields` is accepted
+FIELD_PRESETS = {
+    "minimal": "summary,status,issuetype",
+    "standard": "summary,status,issuetype,assignee,reporter,priority,labels,"
+    "created,updated",
+    "navigable": "*navigable",
+    "all": "*all",
+}
 
 
 class IssueType(Enum):
@@ -26,7 +66,9 @@ class IssueType(Enum):
         @param input_string:
         @return: True if the given string is a valid enum value
         """
-        return input_string in cls.__members__
+        return input_string in cls.__members__ or any(
+            input_string == member.value for member in cls
+        )
 
 
 class SprintPosition(Enum):
@@ -35,16 +77,19 @@ class SprintPosition(Enum):
     BOTTOM_OF_BACKLOG = "bottom of backlog"
 
 
-class JiraAPI:
+BACKLOG_POSITIONS = (SprintPosition.TOP_OF_BACKLOG, SprintPosition.BOTTOM_OF_BACKLOG)
+
+
+class JiraAPIBase:
     """
-    Utility for interacting with the Jira API
-    See https://docs.atlassian.com/software/jira/docs/api/REST/8.5.13/
+    Configuration and request payloads shared by the sync and async Jira clients
     """
 
     def __init__(
         self, config: configparser.ConfigParser, config_section: str = "JIRA"
     ) -> None:
         self.base = config.get(config_section, "BASE_URL")
+        self.scheme = config.get(config_section, "SCHEME", fallback="https")
         self.project = config.get(config_section, "PROJECT")
         self.user = config.get(config_section, "USER")
         self.auth = config.get(config_section, "AUTH")
@@ -55,8 +100,30 @@ class JiraAPI:
         self.board_id = config.get(config_section, "BOARD_ID")
         self.priority = config.get(config_section, "PRIORITY")
         self.custom_fields = self._load_custom_fields(config, config_section)
+        self.sprint_cache = SprintCache.from_config(config, config_section)
+        self.metadata_cache = MetadataCache.from_config(config, config_section)
+        self._field_catalog: FieldCatalog | None = None
+        self._create_meta: dict[str, CreateMeta] = {}
+        self._field_ids_resolved = False
+        # Check new issues against the create screens before sending them
+        self.validate_fields = config.getboolean(
+            config_section, "VALIDATE_FIELDS", fallback=False
+        )
+        # Characters of each body logged at DEBUG level, 0 for all of them
+        self.log_body_limit = (
+            config.getint(config_section, "LOG_BODY_LIMIT", fallback=0) or None
+        )
         self.logger = logging.getLogger(__name__)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _authorization(auth: str, user: str, api_token: str) -> str:
+        if auth == "basic":
+            auth_string = f"{user}:{api_token}"
+            base64_auth_string = base64.b64encode(auth_string.encode()).decode()
+            return f"Basic {base64_auth_string}"
+        return f"Bearer {api_token}"
+
     @staticmethod
     def _load_custom_fields(
         config: configparser.ConfigParser, config_section: str
@@ -72,6 +139,60 @@ class JiraAPI:
                 custom_fields[field] = value
         return custom_fields
 
+    def _named_fields(self) -> list[str]:
+        """
+        @return: the configured fields given by name, e.g. "Epic Link", rather
+        than by id
+        """
+        fields = [self.epic_field, self.epic_name_field, self.sprint_field]
+        fields.extend(self.custom_fields)
+        return [field for field in fields if not is_field_id(field)]
+
+    def _use_field_ids(self, catalog: FieldCatalog) -> None:
+        """
+        Replace the configured field names by their ids
+        @raise FieldError: if a name doesn't match exactly one field
+        """
+
+        def field_id(field: str) -> str:
+            return field if is_field_id(field) else catalog.resolve(field)
+
+        self.epic_field = field_id(self.epic_field)
+        self.epic_name_field = field_id(self.epic_name_field)
+        self.sprint_field = field_id(self.sprint_field)
+        self.custom_fields = {
+            field_id(field): value for field, value in self.custom_fields.items()
+        }
+
+    def _metadata_cache_key(self, name: str) -> str:
+        # What a user may see and create depends on their permissions
+        return f"{self.base}/{self.user}/{name}"
+
+    def _cached_metadata(self, name: str) -> Any:
+        """
+        @param name: what the metadata is, e.g. "fields" or "createmeta/TEST"
+        @return: the metadata kept in the metadata cache, None if it must be
+        fetched
+        """
+        return self.metadata_cache.get(self._metadata_cache_key(name))
+
+    def _cache_metadata(self, name: str, metadata: Any) -> Any:
+        self.metadata_cache.put(self._metadata_cache_key(name), metadata)
+        return metadata
+
+    @staticmethod
+    def _validate_payload(create_meta: CreateMeta, fields: dict) -> None:
+        """
+        @raise PayloadError: if the fields don't fit the create screen
+        """
+        errors = create_meta.errors(fields)
+        if errors:
+            raise PayloadError(errors)
+
+    @staticmethod
+    def _createmeta_params(project: str) -> dict:
+        return {"projectKeys": project, "expand": "projects.issuetypes.fields"}
+
     @staticmethod
     def _parse_params(params: dict) -> str:
         if not params:
@@ -80,6 +201,276 @@ class JiraAPI:
         params_string = "?" + "&".join(param_list)
         return params_string
 
+    def _log_request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None,
+        headers: dict[str, str],
+        body: Any,
+    ) -> None:
+        """
+        Trace a request at DEBUG level. Nothing is formatted or serialized
+        unless a handler emits the record, and credentials are redacted.
+        """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(
+            "%s %s%s\n%s\n%s",
+            method,
+            url,
+            self._parse_params(params or {}),
+            redact_headers(headers),
+            LazyJSON(body, self.log_body_limit),
+            extra={"http": {"method": method, "url": url, "params": params}},
+        )
+
+    def _log_response(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        body: Any,
+        seconds: float | None = None,
+    ) -> None:
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(
+            "%s %s: HTTP %s\n%s",
+            method,
+            url,
+            status,
+            LazyJSON(body, self.log_body_limit),
+            extra={
+                "http": {
+                    "method": method,
+                    "url": url,
+                    "status": status,
+                    "seconds": seconds,
+                }
+            },
+        )
+
+    def _url(self, query: str, *args: str) -> str:
+        return urllib.parse.urlunsplit(
+            (self.scheme, self.base, query.format(*args), None, None)
+        )
+
+    def _ticket_fields(
+        self,
+        title: str,
+        description: str | None,
+        issue_type: str | None,
+        epic: str | None,
+        project: str | None,
+        sprint: str | None,
+    ) -> dict:
+        fields = {
+            "project": {"key": project or self.project},
+            "summary": title,
+            "description": description or title,
+            "issuetype": {"name": issue_type or "Story"},
+        }
+
+        if issue_type == "Epic":
+            fields.update({self.epic_name_field: title})
+
+        if epic:
+            fields.update({self.epic_field: epic})
+
+        fields.update({"priority": {"name": self.priority}})
+
+        if issue_type != "Epic" and sprint:
+            fields.update({self.sprint_field: sprint})
+
+        for field, value in self.custom_fields.items():
+            fields.update({field: value})
+
+        return fields
+
+    def _active_epics_jql(self) -> str:
+        # Initialize an empty list to store JQL clauses
+        jql_clauses = []
+
+        # Iterate over the dictionary items and format them as JQL clauses
+        for field, value in self.custom_fields.items():
+            field_name = field.replace("customfield_", "")
+            if isinstance(value, dict):
+                # Handle dictionary values
+                value_str = ", ".join([f"'{v}'" for _, v in value.items()])
+                jql_clause = f"cf[{field_name}] = {value_str}"
+            else:
+                # Handle non-dictionary values
+                jql_clause = f"cf[{field_name}] ~ '{value}'"
+            jql_clauses.append(jql_clause)
+
+        # Join the JQL clauses with ' OR ' to create the final JQL query
+        jql_query = " OR ".join(jql_clauses)
+
+        jql = (
+            f"issuetype = Epic "
+            f"AND project = {self.project} "
+            f"AND ({jql_query}) "
+            f"AND status = 'In Progress' "
+            f"ORDER BY summary ASC"
+        )
+        return jql
+
+    @staticmethod
+    def _summary_jql(summaries: Iterable[str], project: str) -> str | None:
+        """
+        @return: a query for the issues of the project whose summary contains any
+        of the summaries as a phrase, oldest first, or None if none of them has
+        a searchable word
+        """
+        clauses = []
+        for summary in summaries:
+            words = JQL_TEXT_RESERVED.sub(" ", summary).split()
+            if words:
+                phrase = " ".join(words)
+                clauses.append(f'summary ~ "\\"{phrase}\\""')
+        if not clauses:
+            return None
+        return (
+            f'project = "{project}" AND ({" OR ".join(clauses)}) ORDER BY created ASC'
+        )
+
+    @staticmethod
+    def _field_params(
+        fields: str | Iterable[str] | None, expand: str | Iterable[str] | None
+    ) -> dict:
+        """
+        @param fields: a FIELD_PRESETS name, or the fields to return
+        @param expand: extra data to include, e.g. "renderedFields,changelog"
+        @return: the fields and expand query parameters
+        """
+        params = {}
+        if fields:
+            if isinstance(fields, str):
+                fields = FIELD_PRESETS.get(fields, fields)
+            params["fields"] = fields if isinstance(fields, str) else ",".join(fields)
+        if expand:
+            params["expand"] = expand if isinstance(expand, str) else ",".join(expand)
+        return params
+
+    @classmethod
+    def _search_params(
+        cls,
+        jql: str,
+        fields: str | Iterable[str] | None,
+        expand: str | Iterable[str] | None = None,
+        validate_query: str | None = None,
+    ) -> dict:
+        """
+        @return: the query parameters shared by every page of a search
+        """
+        params: dict = {"jql": jql, **cls._field_params(fields, expand)}
+        if validate_query:
+            params["validateQuery"] = validate_query
+        return params
+
+    @staticmethod
+    def _next_start_at(response: dict, start_at: int) -> int | None:
+        """
+        @return: the startAt of the next search page, or None after the last one
+        """
+        returned = len(response.get("issues", []))
+        next_start_at = start_at + returned
+        if not returned or next_start_at >= response.get("total", 0):
+            return None
+        return next_start_at
+
+    def _sprint_cache_key(self, board_id: str) -> str:
+        return f"{self.base}/{board_id}"
+
+    @staticmethod
+    def _backlog_rank_params(position: SprintPosition) -> dict:
+        if position == SprintPosition.BOTTOM_OF_BACKLOG:
+            return {"rankAfterIssue": "last"}
+        elif position == SprintPosition.TOP_OF_BACKLOG:
+            return {"rankBeforeIssue": "first"}
+        return {}
+
+
+class JiraAPI(JiraAPIBase):
+    """
+    Utility for interacting with the Jira API
+    See https://docs.atlassian.com/software/jira/docs/api/REST/8.5.13/
+    """
+
+    def __init__(
+        self,
+        config: configparser.ConfigParser,
+        config_section: str = "JIRA",
+        pool_size: int | None = None,
+    ) -> None:
+        super().__init__(config, config_section)
+        configured_pool_size = config.getint(
+            config_section, "POOL_SIZE", fallback=DEFAULT_POOL_SIZE
+        )
+        self.pool_size = pool_size or configured_pool_size
+        self.session = self._create_session(self.pool_size)
+        self.retry_policy = RetryPolicy.from_config(config, config_section)
+        self.throttle = TokenBucket.from_config(config, config_section)
+        # More requests in flight than pooled connections wouldn't be faster
+        self.limiter = AdaptiveLimiter(max_limit=self.pool_size)
+        self.response_cache = ResponseCache.from_config(config, config_section)
+        self.coalescer = SingleFlight()
+        self.metrics = RequestMetrics()
+        self._deferred_ranks: list[tuple[str, SprintPosition]] = []
+        self._deferred_ranks_lock = threading.Lock()
+        self._field_ids_lock = threading.Lock()
+
+    def __enter__(self) -> JiraAPI:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the pooled connections held by the session
+        """
+        self.session.close()
+
+    def record(self, path: Path) -> None:
+        """
+        Write every request and response from now on to a cassette file, with
+        their timing and without credentials
+        @param path: the file, compressed if its name ends in .gz
+        """
+        self._mount(
+            RecordingAdapter(path, pool_connections=1, pool_maxsize=self.pool_size)
+        )
+
+    def replay(self, path: Path, latency_scale: float = 1.0) -> None:
+        """
+        Answer every request from now on from a recorded cassette instead of
+        Jira, so that a run can be reproduced offline
+        @param latency_scale: multiplies the recorded latencies, e.g. 0 to
+        replay as fast as possible
+        """
+        self._mount(ReplayAdapter(path, latency_scale))
+
+    def _mount(self, adapter: BaseAdapter) -> None:
+        self.session.close()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept": "application/json"})
+        return session
+
     @staticmethod
     def _parse_response(r: Response) -> dict:
         try:
@@ -91,33 +482,59 @@ class JiraAPI:
             return {}
 
     def _api_request(self, method: str, query: str, *args: str, **kwargs: Any) -> dict:
-        url = urllib.parse.urlunsplit(
-            ("https", self.base, query.format(*args), None, None)
+        url = self._url(query, *args)
+        if method != "GET":
+            return self._request_json(method, url, query, **kwargs)
+        # Workers asking for the same thing at the same time share one request
+        key = json.dumps([url, kwargs.get("params") or {}], sort_keys=True)
+        return self.coalescer.do(
+            key, lambda: self._request_json(method, url, query, **kwargs)
         )
 
+    def _request_json(
+        self,
+        method: str,
+        url: str,
+        endpoint: str | None = None,
+        cache: bool = True,
+        **kwargs: Any,
+    ) -> dict:
+        """
+        @param endpoint: the query template the URL was built from, which the
+        metrics are grouped by
+        @param cache: whether a GET may be served from the response cache. Off
+        for lookups that expire on their own terms, such as the next sprint.
+        """
         query_params: dict = kwargs.get("params", {})
-        logging.debug(
-            f'\n{method} {url}{self._parse_params(query_params)}\n{json.dumps(kwargs.get("json"), sort_keys=True, indent=4)}'
-        )
+        headers = {
+            "Authorization": self._authorization(self.auth, self.user, self.api_token)
+        }
 
-        if self.auth == "basic":
-            auth_string = f"{self.user}:{self.api_token}"
-            base64_auth_string = base64.b64encode(auth_string.encode()).decode()
-            headers = {"Authorization": f"Basic {base64_auth_string}"}
-        else:
-            headers = {"Authorization": f"Bearer {self.api_token}"}
+        cache_key = cached = None
+        if method == "GET" and cache and self.response_cache:
+            cache_key = self.response_cache.key(
+                url, query_params, headers["Authorization"]
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached and cached.fresh:
+                self.metrics.record_cached(method, endpoint or url)
+                return cached.body
+            if cached:
+                headers.update(cached.validators)
 
+        self._log_request(method, url, query_params, headers, kwargs.get("json"))
         try:
-            response = requests.request(
-                method,
-                url,
-                headers=headers,
-                **kwargs,
-            )
+            response = self._send(method, url, endpoint, headers=headers, **kwargs)
+            if cached and response.status_code == codes.NOT_MODIFIED:
+                return self._revalidated(cache_key, cached)
             response.raise_for_status()
             response_json = self._parse_response(response)
-            logging.debug(
-                f'\n{json.dumps(response_json, sort_keys=True, indent=4)}\n{method} {url}\n{json.dumps(kwargs.get("json"), sort_keys=True, indent=4)}'
+            self._log_response(
+                method,
+                url,
+                response.status_code,
+                response_json,
+                response.elapsed.total_seconds(),
             )
 
         except requests.exceptions.HTTPError:
@@ -126,8 +543,221 @@ class JiraAPI:
         except requests.exceptions.RequestException as ex:
             self.logger.error(f"Request error: {ex}")
             raise
+        self._update_response_cache(method, cache_key, response, response_json)
         return response_json
 
+    def _revalidated(self, cache_key: str | None, cached: CachedResponse) -> dict:
+        assert self.response_cache and cache_key
+        self.response_cache.revalidated(cache_key, cached)
+        return cached.body
+
+    def _update_response_cache(
+        self,
+        method: str,
+        cache_key: str | None,
+        response: Response,
+        response_json: dict,
+    ) -> None:
+        if not self.response_cache:
+            return
+        if cache_key:
+            self.response_cache.put(
+                cache_key,
+                response_json,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        elif method != "GET":
+            # Any write may change what earlier reads returned, e.g. the issues
+            # of an epic, so start over rather than serve stale data
+            self.response_cache.clear()
+
+    def _send(
+        self, method: str, url: str, endpoint: str | None = None, **kwargs: Any
+    ) -> Response:
+        """
+        Send a request once the throttle allows it, and again for as long as the
+        retry policy allows
+        @return: the last response
+        """
+        endpoint = endpoint or urllib.parse.urlsplit(url).path
+        attempt = 0
+        while True:
+            if attempt:
+                self.metrics.record_retry(method, endpoint)
+            self.throttle.acquire()
+            try:
+                response = self._request(method, url, endpoint, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as ex:
+                if not self.retry_policy.can_retry(method, None, attempt):
+                    raise
+                delay = self.retry_policy.delay(None, attempt)
+                self.logger.warning(f"{method} {url}: {ex}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            status = response.status_code
+            if not self.retry_policy.can_retry(method, status, attempt):
+                return response
+            delay = self.retry_policy.delay(response, attempt)
+            self.logger.warning(
+                f"{method} {url}: HTTP {status}, retrying in {delay:.1f}s"
+            )
+            if status == codes.TOO_MANY_REQUESTS:
+                # The rate limit applies to every worker, so they all wait
+                self.throttle.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def _request(self, method: str, url: str, endpoint: str, **kwargs: Any) -> Response:
+        """
+        Send a single request once the adaptive concurrency limit allows it
+        """
+        started = self.limiter.acquire()
+        sent = time.monotonic()
+        response = None
+        try:
+            response = self.session.request(method, url, **kwargs)
+            return response
+        finally:
+            status = response.status_code if response is not None else None
+            self.limiter.release(started, status)
+            self._record_request(method, endpoint, response, time.monotonic() - sent)
+
+    def _record_request(
+        self,
+        method: str,
+        endpoint: str,
+        response: Response | None,
+        seconds: float,
+    ) -> None:
+        if response is None:
+            self.metrics.record(method, endpoint, None, seconds)
+            return
+        # Streamed uploads have no length, and aren't used by this client
+        body = response.request.body
+        self.metrics.record(
+            method,
+            endpoint,
+            response.status_code,
+            seconds,
+            bytes_sent=len(body) if isinstance(body, (bytes, str)) else 0,
+            bytes_received=len(response.content or b""),
+        )
+
+    def stats(self) -> dict:
+        """
+        @return: the metrics of every endpoint called so far, along with the
+        client-wide counters
+        """
+        return self.metrics.to_dict(self._stats_counters())
+
+    def write_metrics(self, path: Path) -> None:
+        """
+        Write the metrics to a file in the Prometheus text format
+        """
+        self.metrics.write_prometheus(path, self._stats_counters())
+
+    def _stats_counters(self) -> dict[str, int | float]:
+        return {
+            "coalesced_requests": self.coalescer.deduplicated,
+            "concurrency_limit": self.limiter.limit,
+        }
+
+    def get_fields(self) -> FieldCatalog:
+        """
+        @return: every field of the Jira instance, fetched once and kept in the
+        metadata cache
+        """
+        if self._field_catalog is None:
+            fields = self._get_metadata("fields", "/rest/api/2/field")
+            self._field_catalog = FieldCatalog(fields)
+        return self._field_catalog
+
+    def get_create_meta(self, project: str | None = None) -> CreateMeta:
+        """
+        @param project: the project key, by default the configured one
+        @return: the issue types of the project and the fields of their create
+        screens, fetched once and kept in the metadata cache
+        """
+        project = project or self.project
+        if project not in self._create_meta:
+            response = self._get_metadata(
+                f"createmeta/{project}",
+                "/rest/api/2/issue/createmeta",
+                params=self._createmeta_params(project),
+            )
+            self._create_meta[project] = CreateMeta(project, response)
+        return self._create_meta[project]
+
+    def _get_metadata(self, name: str, query: str, **kwargs: Any) -> Any:
+        metadata = self._cached_metadata(name)
+        if metadata is None:
+            metadata = self._cache_metadata(
+                name, self._api_request("GET", query, **kwargs)
+            )
+        return metadata
+
+    def _resolve_field_names(self) -> None:
+        """
+        Look up the ids of the fields configured by name, once
+        @raise FieldError: if a name doesn't match exactly one field
+        """
+        with self._field_ids_lock:
+            if self._field_ids_resolved:
+                return
+            if self._named_fields():
+                self._use_field_ids(self.get_fields())
+            self._field_ids_resolved = True
+
+    def unresolved_field_names(self) -> list[str]:
+        """
+        @return: the fields configured by name, whose ids the next request using
+        them looks up first. Empty once they were looked up.
+        """
+        return [] if self._field_ids_resolved else self._named_fields()
+
+    def ticket_errors(
+        self,
+        title: str,
+        description: str | None,
+        issue_type: str | None,
+        epic: str | None,
+        project: str | None,
+        sprint_position: SprintPosition,
+        sprint: str | None = None,
+    ) -> dict[str, str]:
+        """
+        Check a ticket against the create screen of its project and issue type
+        without creating it. Takes the arguments of create_ticket.
+        @param epic: the key of the epic, of which only the presence is checked
+        @param sprint: the id of the next sprint, if already known, so checking
+        many tickets doesn't look it up for each of them
+        @return: an error message by field id, empty if create_ticket would
+        send valid fields
+        @raise FieldError: if a configured field name doesn't match one field
+        """
+        self._resolve_field_names()
+        if issue_type == "Epic":
+            sprint = None
+        elif sprint is None:
+            sprint = self._sprint_for(sprint_position)
+        fields = self._ticket_fields(
+            title, description, issue_type, epic, project, sprint
+        )
+        return self._field_errors(fields)
+
+    def _field_errors(self, fields: dict) -> dict[str, str]:
+        return self.get_create_meta(fields["project"]["key"]).errors(fields)
+
+    def _check_fields(self, fields: dict) -> None:
+        if self.validate_fields:
+            self._validate_payload(
+                self.get_create_meta(fields["project"]["key"]), fields
+            )
+
     def get_comment(self, ticket: str) -> dict:
         return self._api_request("GET", "/rest/api/2/issue/{}/comment", ticket)
 
@@ -136,56 +766,242 @@ class JiraAPI:
             "POST", "/rest/api/2/issue/{}/comment", ticket, json={"body": comment}
         )
 
-    def get_ticket(self, ticket: str) -> dict:
-        return self._api_request("GET", "/rest/api/2/issue/{}", ticket)
+    def get_ticket(
+        self,
+        ticket: str,
+        fields: str | Iterable[str] | None = None,
+        expand: str | Iterable[str] | None = None,
+    ) -> dict:
+        """
+        @param ticket: the issue key
+        @param fields: a FIELD_PRESETS name such as "minimal", or the fields to
+        return. All fields are returned by default.
+        @param expand: extra data to include, e.g. "renderedFields,changelog"
+        """
+        return self._api_request(
+            "GET",
+            "/rest/api/2/issue/{}",
+            ticket,
+            params=self._field_params(fields, expand),
+        )
 
     def _get_sprint(self, board_id: str) -> dict:
+        # The sprint cache expires the sprint when it starts, which a fresh
+        # response cache entry would outlive
         return self._api_request(
-            "GET", "rest/agile/1.0/board/{}/sprint?state=future", board_id
+            "GET", "rest/agile/1.0/board/{}/sprint?state=future", board_id, cache=False
         )
 
+    def next_sprint(self) -> str:
+        """
+        @return: the id of the next sprint of the configured board, empty if it
+        has none
+        """
+        return self._get_next_sprint(self.board_id)
+
     def _get_next_sprint(self, board_id: str) -> str:
-        upcoming_sprints = self._get_sprint(board_id).get("values", [])
-        next_sprint: dict = next(iter(upcoming_sprints), {})
+        cache_key = self._sprint_cache_key(board_id)
+        next_sprint = self.sprint_cache.get(cache_key)
+        if next_sprint is None:
+            upcoming_sprints = self._get_sprint(board_id).get("values", [])
+            next_sprint = next(iter(upcoming_sprints), {})
+            self.sprint_cache.put(cache_key, next_sprint)
         return next_sprint.get("id", "")
 
-    def get_active_epics(self) -> list[dict]:
-        # Initialize an empty list to store JQL clauses
-        jql_clauses = []
+    def _search_page(self, params: dict, start_at: int, page_size: int) -> dict:
+        return self._api_request(
+            "GET",
+            "/rest/api/2/search",
+            params={**params, "startAt": start_at, "maxResults": page_size},
+        )
 
-        # Iterate over the dictionary items and format them as JQL clauses
-        for field, value in self.custom_fields.items():
-            field_name = field.replace("customfield_", "")
-            if isinstance(value, dict):
-                # Handle dictionary values
-                value_str = ", ".join([f"'{v}'" for _, v in value.items()])
-                jql_clause = f"cf[{field_name}] = {value_str}"
-            else:
-                # Handle non-dictionary values
-                jql_clause = f"cf[{field_name}] ~ '{value}'"
-            jql_clauses.append(jql_clause)
+    def iter_search(
+        self,
+        jql: str,
+        fields: str | Iterable[str] | None = None,
+        page_size: int = DEFAULT_SEARCH_PAGE_SIZE,
+        concurrency: int = 1,
+        validate_query: str | None = None,
+        expand: str | Iterable[str] | None = None,
+    ) -> Iterator[dict]:
+        """
+        Lazily yield every issue matching a JQL query, one page in memory at a time
+        @param jql: the query
+        @param fields: fields to return for each issue, e.g. "key,summary", or a
+        FIELD_PRESETS name
+        @param page_size: maxResults of each request. Jira may return fewer.
+        @param concurrency: once the first page reveals the total, fetch up to this
+        many of the remaining pages at the same time. At most `concurrency` pages
+        are buffered to put them back in order.
+        @param validate_query: Jira's validateQuery mode. "warn" turns references
+        to unknown issues or projects into warnings instead of a 400 response.
+        @param expand: extra data to include with each issue, e.g. "changelog"
+        @return: the matching issues, in the order of the query
+        """
+        params = self._search_params(jql, fields, expand, validate_query)
+        response = self._search_page(params, 0, page_size)
+        yield from response.get("issues", [])
 
-        # Join the JQL clauses with ' OR ' to create the final JQL query
-        jql_query = " OR ".join(jql_clauses)
+        if concurrency > 1:
+            yield from self._iter_remaining_pages(params, response, concurrency)
+            return
 
-        jql = (
-            f"issuetype = Epic "
-            f"AND project = {self.project} "
-            f"AND ({jql_query}) "
-            f"AND status = 'In Progress' "
-            f"ORDER BY summary ASC"
-        )
+        start_at = self._next_start_at(response, 0)
+        while start_at is not None:
+            response = self._search_page(params, start_at, page_size)
+            yield from response.get("issues", [])
+            start_at = self._next_start_at(response, start_at)
+
+    def _iter_remaining_pages(
+        self, params: dict, first_page: dict, concurrency: int
+    ) -> Iterator[dict]:
+        # Size the remaining pages by what the server actually returned, since it
+        # may cap maxResults below the requested page size
+        page_size = len(first_page.get("issues", []))
+        if not page_size:
+            return
+        offsets = iter(range(page_size, first_page.get("total", 0), page_size))
+        window: deque[Future] = deque()
 
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                while True:
+                    for start_at in itertools.islice(
+                        offsets, concurrency - len(window)
+                    ):
+                        window.append(
+                            pool.submit(self._search_page, params, start_at, page_size)
+                        )
+                    if not window:
+                        return
+                    yield from window.popleft().result().get("issues", [])
+            finally:
+                for future in window:
+                    future.cancel()
+
+    def get_tickets(
+        self,
+        tickets: Iterable[str],
+        fields: str | Iterable[str] | None = None,
+        expand: str | Iterable[str] | None = None,
+    ) -> Iterator[tuple[str, dict | None]]:
+        """
+        Fetch many issues with one `key in (...)` search per KEY_SEARCH_LIMIT keys
+        instead of one request per issue
+        @param tickets: issue keys, read lazily. Repeated keys are fetched once.
+        @param fields: fields to return for each issue, e.g. "key,summary", or a
+        FIELD_PRESETS name
+        @param expand: extra data to include with each issue, e.g. "changelog"
+        @return: (key, issue) pairs in the order of the keys, one chunk at a time.
+        The issue is None if the key doesn't exist or isn't visible to the user.
+        An issue moved to another project is returned under its new key.
+        """
+        keys = self._unique_keys(tickets)
+        while True:
+            chunk = list(itertools.islice(keys, KEY_SEARCH_LIMIT))
+            if not chunk:
+                return
+            yield from self._get_ticket_chunk(chunk, fields, expand)
+
+    @staticmethod
+    def _unique_keys(tickets: Iterable[str]) -> Iterator[str]:
+        seen = set()
+        for ticket in tickets:
+            key = ticket.strip().upper()
+            if key and key not in seen:
+                seen.add(key)
+                yield key
+
+    def _get_ticket_chunk(
+        self,
+        keys: list[str],
+        fields: str | Iterable[str] | None,
+        expand: str | Iterable[str] | None,
+    ) -> Iterator[tuple[str, dict | None]]:
+        # Malformed keys make the whole query invalid, even with validateQuery=warn
+        valid_keys = [key for key in keys if ISSUE_KEY_PATTERN.match(key)]
+        found = {}
+        if valid_keys:
+            jql = f"key in ({', '.join(valid_keys)})"
+            for issue in self.iter_search(
+                jql,
+                fields,
+                page_size=len(valid_keys),
+                validate_query="warn",
+                expand=expand,
+            ):
+                found[issue["key"]] = issue
+        moved = {key: found.pop(key) for key in list(found) if key not in valid_keys}
+        missing = [key for key in valid_keys if key not in found]
+        if moved and missing:
+            found.update(self._find_moved_tickets(missing, moved, fields, expand))
+        for key in keys:
+            yield key, found.pop(key, None)
+        yield from moved.items()
+
+    def _find_moved_tickets(
+        self,
+        missing: list[str],
+        moved: dict[str, dict],
+        fields: str | Iterable[str] | None,
+        expand: str | Iterable[str] | None,
+    ) -> Iterator[tuple[str, dict]]:
+        """
+        Map issues a search returned under other keys than the requested ones
+        back to the keys they were requested by: those issues were moved to
+        another project, and Jira resolves their old key. Pops them from `moved`.
+        @param missing: the requested keys the search didn't return as such
+        @param moved: the issues it returned instead, by their current key
+        """
+        if len(missing) == 1 and len(moved) == 1:
+            yield missing[0], moved.popitem()[1]
+            return
+        # Only a lookup by the old key tells which moved issue it became
+        for key in missing:
+            try:
+                issue = self.get_ticket(key, fields, expand)
+            except requests.exceptions.HTTPError as ex:
+                if ex.response is None or ex.response.status_code != codes.NOT_FOUND:
+                    raise
+                continue
+            moved.pop(issue["key"], None)
+            yield key, issue
+
+    def search_summaries(
+        self,
+        summaries: Iterable[str],
+        project: str | None = None,
+        fields: str | Iterable[str] | None = None,
+    ) -> Iterator[dict]:
+        """
+        Look for issues by summary with one search per SUMMARY_SEARCH_LIMIT
+        summaries instead of one per summary
+        @param summaries: the summaries to look for
+        @param project: the project to search, by default the configured one
+        @param fields: the fields to return, by default the summary, issue type
+        and epic link
+        @return: the issues whose summary contains one of the summaries, oldest
+        first within each chunk. Text search matches words rather than the exact
+        summary, so compare the summaries of the results.
+        """
+        if fields is None:
+            self._resolve_field_names()
+            fields = ["summary", "issuetype", self.epic_field]
+        unique = list(dict.fromkeys(summaries))
+        for start in range(0, len(unique), SUMMARY_SEARCH_LIMIT):
+            chunk = unique[start : start + SUMMARY_SEARCH_LIMIT]
+            jql = self._summary_jql(chunk, project or self.project)
+            if jql:
+                yield from self.iter_search(jql, fields)
+
+    def get_active_epics(self) -> list[dict]:
+        self._resolve_field_names()
+        jql = self._active_epics_jql()
         logging.debug({"jql": jql})
-        query_params = {
-            "jql": jql,
-            "fields": "key,summary",
-            "maxResults": 100,
-        }
-        response = self._api_request("GET", "/rest/api/2/search", params=query_params)
-        return response.get("issues", [])
+        return list(self.iter_search(jql, fields="key,summary"))
 
     def set_epic(self, ticket: str, parent_epic: str) -> dict:
+        self._resolve_field_names()
         return self._api_request(
             "PUT",
             "/rest/api/2/issue/{}",
@@ -193,20 +1009,147 @@ class JiraAPI:
             json={"fields": {self.epic_field: parent_epic}},
         )
 
+    def set_epic_bulk(self, parent_epic: str, tickets: list[str]) -> dict[str, str]:
+        """
+        Move many issues under an epic with one request per EPIC_ISSUE_LIMIT keys
+        @param parent_epic: key of the epic
+        @param tickets: keys of the issues to move
+        @return: an error message for each key that could not be moved
+        """
+        errors: dict[str, str] = {}
+        for start in range(0, len(tickets), EPIC_ISSUE_LIMIT):
+            errors.update(
+                self._agile_issues_request(
+                    "POST",
+                    tickets[start : start + EPIC_ISSUE_LIMIT],
+                    "/rest/agile/1.0/epic/{}/issue",
+                    parent_epic,
+                )
+            )
+        return errors
+
     def _move_issue_to_backlog_position(
         self, issue_key: str, position: SprintPosition
     ) -> None:
-        data = {"issues": [issue_key]}
+        self._api_request(
+            "POST",
+            "/rest/agile/1.0/backlog/issue",
+            json={"issues": [issue_key]},
+            params=self._backlog_rank_params(position),
+        )
 
-        if position == SprintPosition.BOTTOM_OF_BACKLOG:
-            params = {"rankAfterIssue": "last"}
-        elif position == SprintPosition.TOP_OF_BACKLOG:
-            params = {"rankBeforeIssue": "first"}
+    def move_issues_to_backlog_position(
+        self, issue_keys: list[str], position: SprintPosition
+    ) -> dict[str, str]:
+        """
+        Rank issues at the top or bottom of the backlog with one request per
+        BACKLOG_RANK_LIMIT keys, keeping their relative order
+        @param issue_keys: the issues, in the order they should appear
+        @param position: TOP_OF_BACKLOG or BOTTOM_OF_BACKLOG
+        @return: an error message for each key that could not be ranked
+        """
+        chunks = [
+            issue_keys[start : start + BACKLOG_RANK_LIMIT]
+            for start in range(0, len(issue_keys), BACKLOG_RANK_LIMIT)
+        ]
+        if position == SprintPosition.TOP_OF_BACKLOG:
+            # Every chunk lands above the previous one, so send the last one first
+            chunks.reverse()
 
-        self._api_request(
-            "POST", "/rest/agile/1.0/backlog/issue", json=data, params=params
+        errors: dict[str, str] = {}
+        for chunk in chunks:
+            errors.update(self._rank_chunk(chunk, position))
+        return errors
+
+    def _rank_chunk(self, issue_keys: list[str], position: SprintPosition) -> dict:
+        return self._agile_issues_request(
+            "POST",
+            issue_keys,
+            "/rest/agile/1.0/backlog/issue",
+            params=self._backlog_rank_params(position),
         )
 
+    def rank_issues(self, issue_keys: list[str]) -> dict[str, str]:
+        """
+        Rank issues in the given order with one request per BACKLOG_RANK_LIMIT
+        keys. Unlike the backlog moves, the issues stay in their sprint.
+        @param issue_keys: the issues, in the order they should appear. The first
+        one keeps its rank and the others are ranked after it.
+        @return: an error message for each key that could not be ranked
+        """
+        errors: dict[str, str] = {}
+        for start in range(1, len(issue_keys), BACKLOG_RANK_LIMIT):
+            errors.update(
+                self._agile_issues_request(
+                    "PUT",
+                    issue_keys[start : start + BACKLOG_RANK_LIMIT],
+                    "/rest/agile/1.0/issue/rank",
+                    body={"rankAfterIssue": issue_keys[start - 1]},
+                )
+            )
+        return errors
+
+    def _agile_issues_request(
+        self,
+        method: str,
+        issue_keys: list[str],
+        query: str,
+        *args: str,
+        body: dict | None = None,
+        **kwargs: Any,
+    ) -> dict[str, str]:
+        """
+        Send a list of issues to an agile endpoint that acts on all of them
+        @param body: more fields of the request body besides the issues
+        @return: an error message for each key the request failed for
+        """
+        try:
+            response = self._api_request(
+                method,
+                query,
+                *args,
+                json={"issues": issue_keys, **(body or {})},
+                **kwargs,
+            )
+        except requests.exceptions.HTTPError as ex:
+            r = ex.response
+            message = f"HTTP error {r.status_code}: {r.text}" if r is not None else ""
+            return {key: message or str(ex) for key in issue_keys}
+
+        # A 207 Multi-Status response reports the outcome of every issue
+        errors = {}
+        for entry in response.get("entries", []):
+            if entry.get("status", codes.OK) >= codes.BAD_REQUEST:
+                messages = entry.get("errors") or [f"HTTP error {entry['status']}"]
+                errors[entry["issueKey"]] = "; ".join(messages)
+        return errors
+
+    def flush_backlog_ranks(self) -> dict[str, str]:
+        """
+        Send the backlog moves deferred by create_ticket and create_tickets_bulk
+        @return: an error message for each key that could not be ranked
+        """
+        with self._deferred_ranks_lock:
+            deferred, self._deferred_ranks = self._deferred_ranks, []
+
+        errors: dict[str, str] = {}
+        for position in BACKLOG_POSITIONS:
+            issue_keys = [key for key, p in deferred if p == position]
+            if issue_keys:
+                errors.update(
+                    self.move_issues_to_backlog_position(issue_keys, position)
+                )
+        return errors
+
+    def _defer_ranks(self, issue_keys: list[str], position: SprintPosition) -> None:
+        with self._deferred_ranks_lock:
+            self._deferred_ranks.extend((key, position) for key in issue_keys)
+
+    def _sprint_for(self, sprint_position: SprintPosition) -> str | None:
+        if sprint_position == SprintPosition.NEXT_SPRINT:
+            return self._get_next_sprint(self.board_id)
+        return None
+
     def create_ticket(
         self,
         title: str,
@@ -215,39 +1158,142 @@ class JiraAPI:
         epic: str | None,
         project: str | None,
         sprint_position: SprintPosition,
+        defer_rank: bool = False,
     ) -> dict:
+        """
+        Create a ticket
+        @param defer_rank: queue the backlog move of TOP_OF_BACKLOG and
+        BOTTOM_OF_BACKLOG tickets until flush_backlog_ranks is called, so the
+        moves of many tickets can be sent together
+        @return: the created issue
+        @raise PayloadError: if VALIDATE_FIELDS is set and the fields don't fit
+        the create screen, before anything is sent
+        """
+        self._resolve_field_names()
+        sprint = self._sprint_for(sprint_position) if issue_type != "Epic" else None
         body = {
-            "fields": {
-                "project": {"key": project or self.project},
-                "summary": title,
-                "description": description or title,
-                "issuetype": {"name": issue_type or "Story"},
-            }
+            "fields": self._ticket_fields(
+                title, description, issue_type, epic, project, sprint
+            )
         }
+        self._check_fields(body["fields"])
 
-        if issue_type == "Epic":
-            body["fields"].update({self.epic_name_field: title})
+        created_issue = self._api_request("POST", "/rest/api/2/issue", json=body)
 
-        if epic:
-            body["fields"].update({self.epic_field: epic})
+        if created_issue and sprint_position in BACKLOG_POSITIONS:
+            if defer_rank:
+                self._defer_ranks([created_issue["key"]], sprint_position)
+            else:
+                self._move_issue_to_backlog_position(
+                    created_issue["key"], sprint_position
+                )
+
+        return created_issue
+
+    def create_tickets_bulk(
+        self,
+        tickets: list[dict],
+        sprint_position: SprintPosition,
+        defer_rank: bool = False,
+    ) -> list[dict]:
+        """
+        Create many tickets through the bulk endpoint, BULK_CREATE_LIMIT at a time
+        @param tickets: dicts with the title, description, issue_type, epic and
+        project arguments of create_ticket
+        @param sprint_position: where to put the created tickets
+        @param defer_rank: leave the backlog moves to flush_backlog_ranks
+        @return: one result per ticket, in input order. Created tickets carry
+        the "key" of the new issue, failed ones carry "status" and "errors"
+        instead. Created tickets that could not be moved in the backlog also
+        carry a "rank_error". With VALIDATE_FIELDS, tickets whose fields don't
+        fit the create screen fail that way without being sent.
+        """
+        results: list[dict] = []
+        if not tickets:
+            return results
 
-        body["fields"].update({"priority": {"name": self.priority}})
+        self._resolve_field_names()
+        needs_sprint = any(ticket.get("issue_type") != "Epic" for ticket in tickets)
+        sprint = self._sprint_for(sprint_position) if needs_sprint else None
+        issue_updates = [
+            {
+                "fields": self._ticket_fields(
+                    sprint=sprint if ticket.get("issue_type") != "Epic" else None,
+                    **ticket,
+                )
+            }
+            for ticket in tickets
+        ]
+        results = self._create_issue_updates(issue_updates)
 
-        if issue_type != "Epic":
-            if sprint_position == SprintPosition.NEXT_SPRINT:
-                next_sprint = self._get_next_sprint(self.board_id)
-                if next_sprint:
-                    body["fields"].update({self.sprint_field: next_sprint})
+        if sprint_position in BACKLOG_POSITIONS:
+            created_keys = [result["key"] for result in results if "key" in result]
+            if defer_rank:
+                self._defer_ranks(created_keys, sprint_position)
+            else:
+                rank_errors = self.move_issues_to_backlog_position(
+                    created_keys, sprint_position
+                )
+                for result in results:
+                    if result.get("key") in rank_errors:
+                        result["rank_error"] = rank_errors[result["key"]]
 
-        for field, value in self.custom_fields.items():
-            body["fields"].update({field: value})
+        return results
 
-        created_issue = self._api_request("POST", "/rest/api/2/issue", json=body)
+    def _create_issue_updates(self, issue_updates: list[dict]) -> list[dict]:
+        """
+        Validate the issues if VALIDATE_FIELDS is set, and create the valid ones
+        BULK_CREATE_LIMIT at a time
+        @return: one result per issue, like create_tickets_bulk
+        """
+        failed = {}
+        if self.validate_fields:
+            for index, issue_update in enumerate(issue_updates):
+                errors = self._field_errors(issue_update["fields"])
+                if errors:
+                    # The shape of the element errors of Jira's bulk responses
+                    failed[index] = {
+                        "status": codes.BAD_REQUEST,
+                        "errors": {"errorMessages": [], "errors": errors},
+                    }
+        valid = [u for index, u in enumerate(issue_updates) if index not in failed]
 
-        if created_issue and sprint_position in (
-            SprintPosition.TOP_OF_BACKLOG,
-            SprintPosition.BOTTOM_OF_BACKLOG,
-        ):
-            self._move_issue_to_backlog_position(created_issue["key"], sprint_position)
+        created: list[dict] = []
+        for start in range(0, len(valid), BULK_CREATE_LIMIT):
+            created.extend(self._create_chunk(valid[start : start + BULK_CREATE_LIMIT]))
+        results = iter(created)
+        return [
+            failed[index] if index in failed else next(results)
+            for index in range(len(issue_updates))
+        ]
 
-        return created_issue
+    def _create_chunk(self, issue_updates: list[dict]) -> list[dict]:
+        try:
+            response = self._api_request(
+                "POST", "/rest/api/2/issue/bulk", json={"issueUpdates": issue_updates}
+            )
+        except requests.exceptions.HTTPError as ex:
+            # Jira answers 400 when every element failed, with the same body shape
+            response = self._parse_error_response(ex.response)
+            if not response.get("errors"):
+                raise
+
+        failed = {
+            error["failedElementNumber"]: {
+                "status": error.get("status"),
+                "errors": error.get("elementErrors", {}),
+            }
+            for error in response.get("errors", [])
+        }
+        created = iter(response.get("issues", []))
+        return [
+            failed[index] if index in failed else next(created, {})
+            for index in range(len(issue_updates))
+        ]
+
+    @staticmethod
+    def _parse_error_response(r: Response | None) -> dict:
+        try:
+            return r.json() if r is not None else {}
+        except ValueError:
+            return {}
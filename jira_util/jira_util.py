@@ -6,15 +6,15 @@ import json
 import logging
 import re
 import sys
-if sys.version_info >= (3, 8):
-    from importlib import metadata
-else:
-    import importlib_metadata as metadata
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
 
-from jira_util.generate_config import CONFIG_FILE_HOME, main as generate_config
-from jira_util.interactive import create_interactive_ticket
-from jira_util.jira import IssueType, JiraAPI, SprintPosition
+from jira_util.config import CONFIG_FILE_HOME
+
+# The rest of the package is imported where it is needed, so quick invocations
+# such as --version or -j don't pay for requests, questionary and prompt_toolkit
+if TYPE_CHECKING:
+    from jira_util.jira import JiraAPI
 
 
 def read_script_config(config_file: Path) -> configparser.ConfigParser | None:
@@ -29,6 +29,13 @@ def read_script_config(config_file: Path) -> configparser.ConfigParser | None:
     return config
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def parse_script_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="""CLI for interacting with Jira.
@@ -54,9 +61,28 @@ Deliverable: Lorem ipsum dolor sit amet, consectetur
         "-j",
         "--get-ticket-json",
         metavar="XXX-123",
+        nargs="*",
         type=str,
         dest="get_ticket",
-        help="return the ticket info as json",
+        help="return the ticket info as json. Several keys, or keys read from stdin "
+        "when none are given, are printed as one JSON object per line",
+    )
+    parser.add_argument(
+        "--fields",
+        metavar="field,...",
+        default=None,
+        type=str,
+        dest="fields",
+        help="only return these fields with -j, e.g. summary,status, or a preset: "
+        "minimal, standard, navigable or all",
+    )
+    parser.add_argument(
+        "--expand",
+        metavar="expand,...",
+        default=None,
+        type=str,
+        dest="expand",
+        help="include extra data with -j, e.g. renderedFields,changelog",
     )
     parser.add_argument(
         "-c",
@@ -93,6 +119,102 @@ Deliverable: Lorem ipsum dolor sit amet, consectetur
         dest="issue_type",
         help="override the default project from the config",
     )
+    parser.add_argument(
+        "--jobs",
+        metavar="N",
+        default=1,
+        type=positive_int,
+        dest="jobs",
+        help="number of parallel workers when creating tickets from a file",
+    )
+    parser.add_argument(
+        "--resume",
+        default=False,
+        action="store_true",
+        help="skip the lines of the file that an earlier, interrupted run of the "
+        "same file already created",
+    )
+    parser.add_argument(
+        "--dedupe",
+        default=False,
+        action="store_true",
+        help="reuse existing tickets with the same summary and issue type instead "
+        "of creating new ones from the file",
+    )
+    parser.add_argument(
+        "--dry-run",
+        default=False,
+        action="store_true",
+        dest="dry_run",
+        help="check the file and print the API calls creating its tickets would "
+        "make, without making them",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        default=False,
+        action="store_true",
+        help="ignore cached lookups such as the next sprint and field metadata and "
+        "fetch them again",
+    )
+    parser.add_argument(
+        "--no-cache",
+        default=False,
+        action="store_true",
+        dest="no_cache",
+        help="don't read or store cached responses and lookups",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        metavar="SECONDS",
+        default=None,
+        type=float,
+        dest="cache_ttl",
+        help="cache GET responses on disk for this long, overriding "
+        "RESPONSE_CACHE_TTL from the config (0 disables the cache)",
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="table",
+        choices=["table", "json"],
+        default=None,
+        help="print the requests sent to each endpoint, their status codes and "
+        "latencies to stderr when done, as a table (default) or JSON",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="FILE",
+        default=None,
+        type=Path,
+        dest="metrics_file",
+        help="write the request metrics to this file in the Prometheus text format, "
+        "overriding METRICS_FILE from the config",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        metavar="FILE",
+        default=None,
+        type=Path,
+        help="write every request and response, with its timing and without "
+        "credentials, to this cassette file (.gz to compress it)",
+    )
+    cassette.add_argument(
+        "--replay",
+        metavar="FILE",
+        default=None,
+        type=Path,
+        help="answer requests from a cassette written by --record instead of Jira",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        metavar="SCALE",
+        default=1.0,
+        type=float,
+        dest="replay_latency",
+        help="multiply the recorded latencies when replaying, e.g. 0 to replay "
+        "as fast as possible (default 1)",
+    )
     parser.add_argument(
         "--env",
         dest="config_section",
@@ -132,97 +254,156 @@ Deliverable: Lorem ipsum dolor sit amet, consectetur
     )
     opt = parser.parse_args()
     if opt.version:
+        if sys.version_info >= (3, 8):
+            from importlib import metadata
+        else:
+            import importlib_metadata as metadata
         version = metadata.version('jira_util')
         print(f"jira-util version {version}")
         sys.exit(0)
-    if not any([opt.filename, opt.create_ticket, opt.get_ticket, opt.interactive, opt.init_config]):
+    if not any([opt.filename, opt.create_ticket, opt.get_ticket is not None, opt.interactive, opt.init_config]):
         parser.print_help(sys.stderr)
         sys.exit(1)
     return opt
 
 
-def existing_ticket(summary: str) -> str | None:
-    match = re.match("^[A-Z]+-[0-9]+", summary)
-    return match.group() if match else None
-
-
-def create_ticket(
-    jira_api: JiraAPI,
-    summary: str,
-    issue_type: str,
-    epic: str | None,
-    project: str | None,
-) -> str:
-    return jira_api.create_ticket(
-        summary,
-        summary,
-        issue_type=issue_type,
-        epic=epic if issue_type in IssueType else None,
-        project=project,
-        sprint_position=SprintPosition.NEXT_SPRINT,
-    )["key"]
-
-
-def verbose_output(
-    jira_api: JiraAPI, summary: str, ticket_id: str, issue_type: str, epic: str | None
-) -> str:
-    url = f"https://{jira_api.base}/browse/{ticket_id}"
-    created_or_found = "Found" if existing_ticket(summary) else "Created"
-    if issue_type == "Epic":
-        return f"\t{created_or_found} {issue_type} {url}"
-    elif IssueType.is_valid(issue_type):
-        return f"\t\t{created_or_found} {issue_type} {url}, epic is {epic}"
-    else:
-        raise ValueError(f"Unknown issue type {issue_type}")
+def main() -> None:
+    options = parse_script_arguments()
+    logging.basicConfig(level=logging.DEBUG if options.debug else logging.INFO)
 
+    config = read_script_config(CONFIG_FILE_HOME)
+    if options.init_config or not config:
+        from jira_util.generate_config import main as generate_config
 
-def create_tickets_from_file(
-    jira_api: JiraAPI,
-    input_file: str,
-    verbose: bool = False,
-    project: str | None = None,
-) -> None:
-    epic = None
-    for line in input_file:
-        line = line.strip()
+        print("Generating configuration...")
+        config = generate_config()
+        if options.init_config:
+            exit(0)
+
+    from jira_util.fields import FieldError, PayloadError
+    from jira_util.jira import DEFAULT_POOL_SIZE, JiraAPI
 
-        if not line or line.startswith("#"):
-            continue
+    with JiraAPI(
+        config,
+        config_section=options.config_section,
+        pool_size=options.jobs if options.jobs > DEFAULT_POOL_SIZE else None,
+    ) as j:
+        configure_caches(j, config, options)
+        if options.record:
+            j.record(options.record)
+        elif options.replay:
+            j.replay(options.replay, options.replay_latency)
+        try:
+            run_command(j, options)
+        except (FieldError, PayloadError) as ex:
+            print(ex, file=sys.stderr)
+            sys.exit(1)
+        finally:
+            report_stats(j, config, options)
 
-        issue_type, summary = line.strip().split(": ")
 
-        ticket_id = existing_ticket(summary) or create_ticket(
-            jira_api, summary, issue_type, epic, project
+def configure_caches(
+    j: JiraAPI, config: configparser.ConfigParser, options: argparse.Namespace
+) -> None:
+    from jira_util.cache import MetadataCache, ResponseCache, SprintCache
+
+    if options.no_cache:
+        j.response_cache = None
+        j.sprint_cache = SprintCache(ttl=0)
+        j.metadata_cache = MetadataCache(ttl=0)
+        return
+    if options.cache_ttl is not None:
+        j.response_cache = ResponseCache.from_config(
+            config, options.config_section, ttl=options.cache_ttl
         )
+    if options.refresh_cache:
+        j.sprint_cache.clear()
+        j.metadata_cache.clear()
+        if j.response_cache:
+            j.response_cache.clear()
 
-        if issue_type == "Epic":
-            epic = ticket_id
-        elif IssueType.is_valid(issue_type) and existing_ticket(summary) and epic:
-            jira_api.set_epic(ticket_id, epic)
 
-        if verbose:
-            print(verbose_output(jira_api, summary, ticket_id, issue_type, epic))
+def report_stats(
+    j: JiraAPI, config: configparser.ConfigParser, options: argparse.Namespace
+) -> None:
+    metrics_file = options.metrics_file or config.get(
+        options.config_section, "METRICS_FILE", fallback=None
+    )
+    if metrics_file:
+        j.write_metrics(Path(metrics_file).expanduser())
+    if options.stats == "json":
+        print(json.dumps(j.stats(), indent=4), file=sys.stderr)
+    elif options.stats:
+        from jira_util.metrics import RequestMetrics
 
+        print(RequestMetrics.format_table(j.stats()), file=sys.stderr)
 
-def main() -> None:
-    options = parse_script_arguments()
-    logging.basicConfig(level=logging.DEBUG if options.debug else logging.INFO)
 
-    config = read_script_config(CONFIG_FILE_HOME)
-    if options.init_config or not config:
-        print("Generating configuration...")
-        config = generate_config()
-        if options.init_config:
-            exit(0)
+def split_ticket_keys(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        yield from (key for key in re.split(r"[\s,]+", line) if key)
 
-    j = JiraAPI(config, config_section=options.config_section)
 
-    if options.get_ticket:
-        print(json.dumps(j.get_ticket(options.get_ticket), indent=4, sort_keys=True))
+def print_ticket(
+    j: JiraAPI, key: str, fields: str | None, expand: str | None = None
+) -> bool:
+    """
+    Print a ticket as indented JSON, or on stderr that it wasn't found
+    @return: whether the ticket was found
+    """
+    import requests
+
+    try:
+        ticket = j.get_ticket(key, fields, expand)
+    except requests.exceptions.HTTPError as ex:
+        if ex.response is None or ex.response.status_code != 404:
+            raise
+        print(f"Not found: {key}", file=sys.stderr)
+        return False
+    print(json.dumps(ticket, indent=4, sort_keys=True))
+    return True
+
+
+def print_tickets(
+    j: JiraAPI, arguments: list[str], fields: str | None, expand: str | None = None
+) -> bool:
+    """
+    Print a single ticket as indented JSON, or many tickets as one JSON object per
+    line. Keys that aren't found are listed on stderr.
+    @param arguments: the keys given to -j. When empty, keys are read from stdin.
+    @return: whether every ticket was found
+    """
+    keys: Iterable[str]
+    if arguments:
+        argument_keys = list(split_ticket_keys(arguments))
+        if len(argument_keys) == 1:
+            return print_ticket(j, argument_keys[0], fields, expand)
+        keys = argument_keys
+    else:
+        keys = split_ticket_keys(sys.stdin)
+
+    all_found = True
+    for key, found in j.get_tickets(keys, fields, expand):
+        if found is None:
+            all_found = False
+            print(f"Not found: {key}", file=sys.stderr)
+        else:
+            print(json.dumps(found, sort_keys=True))
+    return all_found
+
+
+def run_command(j: JiraAPI, options: argparse.Namespace) -> None:
+    if options.get_ticket is not None:
+        if not print_tickets(j, options.get_ticket, options.fields, options.expand):
+            sys.exit(1)
     elif options.interactive:
+        from jira_util.interactive import create_interactive_ticket
+
         response = create_interactive_ticket(j, options.project)
         print(f"https://{j.base}/browse/{response['key']}")
     elif options.create_ticket:
+        from jira_util.jira import SprintPosition
+
         response = j.create_ticket(
             options.create_ticket,
             options.create_ticket,
@@ -233,7 +414,23 @@ def main() -> None:
         )
         print(f"https://{j.base}/browse/{response['key']}")
     elif options.filename:
-        create_tickets_from_file(j, options.filename, verbose=options.verbose)
+        from jira_util.importer import TicketFileError, create_tickets_from_file
+        from jira_util.journal import ImportJournal
+
+        try:
+            create_tickets_from_file(
+                j,
+                options.filename,
+                verbose=options.verbose,
+                jobs=options.jobs,
+                journal=ImportJournal(),
+                resume=options.resume,
+                dedupe=options.dedupe,
+                dry_run=options.dry_run,
+            )
+        except TicketFileError as ex:
+            print(ex, file=sys.stderr)
+            sys.exit(1)
     else:
         raise ValueError("Invalid arguments.")
 
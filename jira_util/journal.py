@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DEFAULT_JOURNAL_FILE = Path.home() / ".cache" / "jira-util" / "imports.ndjson"
+
+
+class FileHash:
+    """
+    SHA-256 of the lines of a file, updated as they are read so the file is
+    only read once
+    """
+
+    def __init__(self) -> None:
+        self._digest = hashlib.sha256()
+
+    def read(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            self._digest.update(line.encode())
+            yield line
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+class ImportJournal:
+    """
+    Append-only record of the tickets created from each input file, one JSON
+    object per line. Entries are keyed by the hash of the file, the Jira
+    instance and project it was imported into and the line number, so an
+    interrupted import of the same file can be resumed, but not into another
+    Jira or project.
+    """
+
+    def __init__(self, path: Path = DEFAULT_JOURNAL_FILE) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_hash(lines: Iterable[str]) -> str:
+        file_hash = FileHash()
+        for _ in file_hash.read(lines):
+            pass
+        return file_hash.hexdigest()
+
+    def created_keys(self, file_hash: str, jira: str, project: str) -> dict[int, str]:
+        """
+        @param jira: the base URL of the Jira instance
+        @return: the key created for each line of the file in that project, by
+        line number
+        """
+        target = {"file": file_hash, "jira": jira, "project": project}
+        keys: dict[int, str] = {}
+        try:
+            with open(self.path) as journal:
+                for entry_line in journal:
+                    try:
+                        entry = json.loads(entry_line)
+                    except ValueError:
+                        # A line cut short when a previous run was killed
+                        continue
+                    if all(entry.get(k) == v for k, v in target.items()):
+                        keys[entry["line"]] = entry["key"]
+        except FileNotFoundError:
+            pass
+        return keys
+
+    def record(
+        self, file_hash: str, jira: str, project: str, line_number: int, key: str
+    ) -> None:
+        entry = json.dumps(
+            {
+                "file": file_hash,
+                "jira": jira,
+                "project": project,
+                "line": line_number,
+                "key": key,
+            }
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as journal:
+                journal.write(f"{entry}\n")
+                journal.flush()
+                os.fsync(journal.fileno())
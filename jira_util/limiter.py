@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import statistics
+import threading
+import time
+from typing import Callable
+
+from requests import codes
+
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_LATENCY_TOLERANCE = 2.0
+DEFAULT_WINDOW = 20
+
+# Responses telling the client to send less
+OVERLOAD_STATUSES = frozenset({codes.TOO_MANY_REQUESTS, codes.SERVICE_UNAVAILABLE})
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on the number of requests in flight, shared by every thread using
+    the same JiraAPI.
+
+    Latencies are collected in windows of `window` requests. After a window in
+    which the limit was reached and the p50 latency stayed within `tolerance`
+    times the baseline, the limit grows by one. A slower window, or any 429 or
+    503 response, multiplies it by `backoff`. The baseline is the lowest p50 seen,
+    drifting slowly upwards so that a permanently slower server isn't mistaken
+    for overload forever.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        window: int = DEFAULT_WINDOW,
+        tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+        backoff: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.window = window
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self.in_flight = 0
+        self.baseline: float | None = None
+        self._limit = float(min(self.max_limit, max(min_limit, initial)))
+        self._latencies: list[float] = []
+        self._saturated = False
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """
+        The number of requests currently allowed in flight
+        """
+        return int(self._limit)
+
+    def acquire(self) -> float:
+        """
+        Block until fewer than `limit` requests are in flight
+        @return: the start time of the request, to pass to `release`
+        """
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._saturated = True
+            return self.clock()
+
+    def release(self, started: float, status: int | None) -> None:
+        """
+        @param started: the value returned by `acquire`
+        @param status: the response status, or None if the request failed without
+        a response and shouldn't count towards the latency
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if status in OVERLOAD_STATUSES:
+                self._decrease(started, f"HTTP {status}")
+            elif status is not None:
+                self._latencies.append(self.clock() - started)
+                if len(self._latencies) >= self.window:
+                    self._end_window()
+            self._condition.notify_all()
+
+    def _end_window(self) -> None:
+        p50 = statistics.median(self._latencies)
+        self._latencies = []
+        if self.baseline is None or p50 < self.baseline:
+            self.baseline = p50
+        else:
+            self.baseline += (p50 - self.baseline) * 0.05
+
+        if p50 > self.baseline * self.tolerance:
+            self._decrease(float("inf"), f"p50 latency {p50 * 1000:.0f}ms")
+        elif self._saturated and self._limit < self.max_limit:
+            self._limit += 1
+            self.logger.debug(f"Concurrency limit raised to {self.limit}")
+        self._saturated = False
+
+    def _decrease(self, started: float, reason: str) -> None:
+        # Requests that were already in flight when the limit was cut report the
+        # same overload, so they don't cut it again
+        if started < self._last_decrease:
+            return
+        self._last_decrease = self.clock()
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._latencies = []
+        self._saturated = False
+        self.logger.debug(f"Concurrency limit lowered to {self.limit} after {reason}")
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Upper bounds of the Prometheus latency histogram, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# A connection error or timeout, which has no status code
+ERROR_STATUS = "error"
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """
+    @param samples: sorted values
+    @param fraction: e.g. 0.95 for the 95th percentile
+    @return: the nearest-rank percentile, or 0 without samples
+    """
+    if not samples:
+        return 0.0
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class EndpointMetrics:
+    """
+    What was sent to a single endpoint template with a single method
+    """
+
+    requests: int = 0
+    retries: int = 0
+    cached: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    statuses: dict[str, int] = field(default_factory=dict)
+    latencies: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "cached": self.cached,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "statuses": dict(sorted(self.statuses.items())),
+            "latency_seconds": {
+                "p50": percentile(latencies, 0.5),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "max": latencies[-1] if latencies else 0.0,
+                "sum": sum(latencies),
+            },
+        }
+
+
+class RequestMetrics:
+    """
+    Counts, sizes, status codes and latencies of the requests sent by a client,
+    by endpoint template (e.g. /rest/api/2/issue/{}) and method. Every attempt
+    is a request, so retried requests are counted once per attempt.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: dict[tuple[str, str], EndpointMetrics] = {}
+
+    @staticmethod
+    def endpoint(query: str) -> str:
+        """
+        @return: the path of a query template, without its query string
+        """
+        path = query.split("?", 1)[0]
+        return path if path.startswith("/") else f"/{path}"
+
+    def _get(self, method: str, endpoint: str) -> EndpointMetrics:
+        key = (self.endpoint(endpoint), method)
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = EndpointMetrics()
+        return metrics
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        status: int | None,
+        seconds: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """
+        @param status: the status code, or None if no response was received
+        """
+        status_label = str(status) if status is not None else ERROR_STATUS
+        with self._lock:
+            metrics = self._get(method, endpoint)
+            metrics.requests += 1
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+            metrics.statuses[status_label] = metrics.statuses.get(status_label, 0) + 1
+            metrics.latencies.append(seconds)
+
+    def record_retry(self, method: str, endpoint: str) -> None:
+        with self._lock:
+            self._get(method, endpoint).retries += 1
+
+    def record_cached(self, method: str, endpoint: str) -> None:
+        """
+        Count a response served from the response cache without a request
+        """
+        with self._lock:
+            self._get(method, endpoint).cached += 1
+
+    def latencies(self) -> list[float]:
+        """
+        @return: every latency recorded, over all endpoints, sorted
+        """
+        with self._lock:
+            return sorted(
+                latency
+                for metrics in self._endpoints.values()
+                for latency in metrics.latencies
+            )
+
+    def to_dict(self, counters: dict[str, int | float] | None = None) -> dict:
+        """
+        @param counters: client-wide values to report along with the endpoints,
+        e.g. the number of coalesced requests
+        """
+        with self._lock:
+            endpoints = [
+                {"endpoint": endpoint, "method": method, **metrics.to_dict()}
+                for (endpoint, method), metrics in sorted(self._endpoints.items())
+            ]
+        return {"endpoints": endpoints, **(counters or {})}
+
+    @staticmethod
+    def format_table(stats: dict) -> str:
+        """
+        @param stats: the output of to_dict
+        @return: one line per endpoint and method, latencies in milliseconds
+        """
+        rows = [
+            (
+                "METHOD",
+                "ENDPOINT",
+                "REQS",
+                "RETRIES",
+                "CACHED",
+                "SENT",
+                "RECEIVED",
+                "P50",
+                "P95",
+                "P99",
+                "STATUSES",
+            )
+        ]
+        for e in stats["endpoints"]:
+            latency = e["latency_seconds"]
+            rows.append(
+                (
+                    e["method"],
+                    e["endpoint"],
+                    str(e["requests"]),
+                    str(e["retries"]),
+                    str(e["cached"]),
+                    str(e["bytes_sent"]),
+                    str(e["bytes_received"]),
+                    *(f"{latency[p] * 1000:.0f}" for p in ("p50", "p95", "p99")),
+                    " ".join(f"{s}:{n}" for s, n in e["statuses"].items()),
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [
+            "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+            for row in rows
+        ]
+        lines.extend(
+            f"{name}: {value}" for name, value in stats.items() if name != "endpoints"
+        )
+        return "\n".join(lines)
+
+    def format_prometheus(self, counters: dict[str, int | float] | None = None) -> str:
+        """
+        @param counters: client-wide values, exported as gauges
+        @return: the metrics in the Prometheus text exposition format
+        """
+        lines = []
+
+        def family(name: str, kind: str, description: str) -> None:
+            lines.append(f"# HELP jira_util_{name} {description}")
+            lines.append(f"# TYPE jira_util_{name} {kind}")
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            labels = {
+                key: f'endpoint="{escape_label(key[0])}",method="{key[1]}"'
+                for key, _ in endpoints
+            }
+
+            family("requests_total", "counter", "Requests sent, by status code")
+            for key, metrics in endpoints:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        f'jira_util_requests_total{{{labels[key]},status="{status}"}} '
+                        f"{count}"
+                    )
+            for name, attribute, description in (
+                ("retries_total", "retries", "Requests sent again"),
+                ("cached_total", "cached", "Responses served from the cache"),
+                ("sent_bytes_total", "bytes_sent", "Request body bytes sent"),
+                ("received_bytes_total", "bytes_received", "Response bytes received"),
+            ):
+                family(name, "counter", description)
+                for key, metrics in endpoints:
+                    value = getattr(metrics, attribute)
+                    lines.append(f"jira_util_{name}{{{labels[key]}}} {value}")
+
+            family("request_duration_seconds", "histogram", "Request latency")
+            for key, metrics in endpoints:
+                lines.extend(
+                    f"jira_util_request_duration_seconds_{sample}"
+                    for sample in histogram(labels[key], metrics.latencies)
+                )
+
+        for name, value in (counters or {}).items():
+            family(name, "gauge", name.replace("_", " ").capitalize())
+            lines.append(f"jira_util_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(
+        self, path: Path, counters: dict[str, int | float] | None = None
+    ) -> None:
+        """
+        Replace the file atomically, so that a scraper never reads half of it
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(self.format_prometheus(counters))
+        os.replace(tmp_path, path)
+
+
+def histogram(labels: str, latencies: list[float]) -> list[str]:
+    samples = []
+    for bound in LATENCY_BUCKETS:
+        count = sum(1 for latency in latencies if latency <= bound)
+        samples.append(f'bucket{{{labels},le="{bound}"}} {count}')
+    samples.append(f'bucket{{{labels},le="+Inf"}} {len(latencies)}')
+    samples.append(f"sum{{{labels}}} {sum(latencies)}")
+    samples.append(f"count{{{labels}}} {len(latencies)}")
+    return samples
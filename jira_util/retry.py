@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import configparser
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+from requests import Response, codes
+
+from jira_util.cache import parse_jira_datetime
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+
+# Methods that can be sent again without changing the result
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset(
+    {
+        codes.TOO_MANY_REQUESTS,
+        codes.BAD_GATEWAY,
+        codes.SERVICE_UNAVAILABLE,
+        codes.GATEWAY_TIMEOUT,
+    }
+)
+
+
+def parse_retry_after(value: str | None, now: float) -> float | None:
+    """
+    @param value: a Retry-After header, either in seconds or an HTTP date
+    @return: the number of seconds to wait, or None if the value is missing or
+    malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_reset(response: Response, now: float) -> float | None:
+    """
+    @return: the seconds until Jira's X-RateLimit-Reset, if the response says that
+    no requests remain in the current window
+    """
+    if response.headers.get("X-RateLimit-Remaining") != "0":
+        return None
+    reset = response.headers.get("X-RateLimit-Reset")
+    if not reset:
+        return None
+    try:
+        reset_at: float | None = float(reset)
+    except ValueError:
+        reset_at = parse_jira_datetime(reset)
+    return None if reset_at is None else max(0.0, reset_at - now)
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is sent again and how long to wait first.
+
+    Idempotent requests are retried on connection errors, 429 and 502-504
+    responses. Other methods such as POST are only retried on 429, which Jira
+    returns before processing the request, so retrying can't create a ticket
+    twice. Waits honor Retry-After and X-RateLimit-Reset, and otherwise back off
+    exponentially with full jitter.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_RETRY_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        jitter: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.clock = clock
+
+    @classmethod
+    def from_config(
+        cls, config: configparser.ConfigParser, config_section: str
+    ) -> RetryPolicy:
+        return cls(
+            max_retries=config.getint(
+                config_section, "MAX_RETRIES", fallback=DEFAULT_MAX_RETRIES
+            ),
+            backoff=config.getfloat(
+                config_section, "RETRY_BACKOFF", fallback=DEFAULT_RETRY_BACKOFF
+            ),
+        )
+
+    def can_retry(self, method: str, status: int | None, attempt: int) -> bool:
+        """
+        @param method: the HTTP method of the request
+        @param status: the response status, or None if no response was received
+        @param attempt: the number of retries made so far
+        """
+        if attempt >= self.max_retries:
+            return False
+        if status == codes.TOO_MANY_REQUESTS:
+            return True
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        return status is None or status in RETRY_STATUSES
+
+    def delay(self, response: Response | None, attempt: int) -> float:
+        """
+        @return: the seconds to wait before retrying
+        """
+        if response is not None:
+            now = self.clock()
+            server_delay = parse_retry_after(response.headers.get("Retry-After"), now)
+            if server_delay is None:
+                server_delay = parse_rate_limit_reset(response, now)
+            if server_delay is not None:
+                # Spread out the clients that were told to come back at the same time
+                return server_delay + self.jitter() * self.backoff
+        return self.jitter() * min(self.max_backoff, self.backoff * 2**attempt)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Collapses identical calls made at the same time from different threads into
+    one. The first caller runs the function and every caller that arrives while
+    it is running gets the same result, or the same exception. The result is
+    shared, not copied.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        @param key: identifies identical calls, e.g. the method and URL
+        @param fn: makes the call
+        @return: the result of `fn`, from this call or the one already in flight
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                leader = False
+            else:
+                future = self._in_flight[key] = Future()
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as ex:
+            future.set_exception(ex)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import configparser
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Client-side rate limit shared by every thread sending requests through the
+    same JiraAPI. Tokens refill at `rate` per second up to `burst`, and each
+    request takes one. When Jira says to slow down, `pause` holds back every
+    thread until the server is ready again, rather than only the one that saw
+    the 429.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        @param rate: requests per second, or None for no client-side limit
+        @param burst: the most requests sent back to back, by default `rate`
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst or rate or 1.0)
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        # Tracked as the time the bucket will be full again (GCRA), which is the
+        # same as counting tokens but doesn't accumulate rounding errors
+        self._full_at = clock()
+        self._paused_until = 0.0
+
+    @classmethod
+    def from_config(
+        cls, config: configparser.ConfigParser, config_section: str
+    ) -> TokenBucket:
+        rate = config.getfloat(config_section, "RATE_LIMIT", fallback=0.0)
+        burst = config.getfloat(config_section, "RATE_LIMIT_BURST", fallback=0.0)
+        return cls(rate=rate or None, burst=burst or None)
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent
+        @return: the seconds spent waiting
+        """
+        waited = 0.0
+        wait = self._reserve()
+        while wait > 0:
+            self.sleep(wait)
+            waited += wait
+            # Another thread may have paused the bucket in the meantime
+            with self._lock:
+                wait = self._paused_until - self.clock()
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every request for `seconds`, and restart with an empty bucket
+        so the waiting threads don't all fire at once
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+            if self.rate:
+                self._full_at = max(
+                    self._full_at,
+                    self._paused_until + (self.burst - 1) / self.rate,
+                )
+
+    def _reserve(self) -> float:
+        """
+        Take the next token, even if it is only available in the future
+        @return: the seconds until that token may be used
+        """
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._paused_until)
+            if self.rate is None:
+                return start - now
+            interval = 1 / self.rate
+            self._full_at = max(self._full_at, start)
+            send_at = max(start, self._full_at - (self.burst - 1) * interval)
+            self._full_at += interval
+            return send_at - now
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Mapping
+
+# Headers whose values are credentials, compared in lowercase
+SENSITIVE_HEADERS = frozenset(
+    {"authorization", "proxy-authorization", "cookie", "set-cookie"}
+)
+REDACTED = "<redacted>"
+
+
+def redact_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    return {
+        name: REDACTED if name.lower() in SENSITIVE_HEADERS else value
+        for name, value in headers.items()
+    }
+
+
+class LazyJSON:
+    """
+    A log argument serialized as indented JSON only when the record is
+    formatted, i.e. once a handler actually emits it
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int | None = None) -> None:
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        encoder = json.JSONEncoder(sort_keys=True, indent=4)
+        if self.limit is None:
+            return encoder.encode(self.value)
+        # Stop encoding at the limit rather than serialize a huge response whole
+        chunks = []
+        length = 0
+        for chunk in encoder.iterencode(self.value):
+            chunks.append(chunk)
+            length += len(chunk)
+            if length > self.limit:
+                return f"{''.join(chunks)[:self.limit]}... (truncated)"
+        return "".join(chunks)
@@ -20,5 +20,6 @@ setup(
         "configparser",
         "questionary",
     ],
+    extras_require={"async": ["aiohttp"]},
     entry_points={"console_scripts": ["jira-util = jira_util.jira_util:main"]},
 )
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import configparser
+import itertools
+import json
+import random
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Iterable
+from urllib.parse import parse_qs, urlsplit
+
+# Issue keys and board ids in request paths
+PATH_PARAMETER = re.compile(r"/[A-Z][A-Z0-9_]*-\d+(?=/|$)|(?<=/board)/\d+")
+CONFIG_TEMPLATE = Path(__file__).parent / ".." / ".jira-util.config.template"
+
+Route = Callable[..., "tuple[int, Any] | tuple[int, Any, dict[str, str]]"]
+
+
+class StandInJira:
+    """
+    Local, threaded HTTP/1.1 stand-in for the Jira endpoints used by JiraAPI.
+    Routes are matched on method and a path regex whose groups are passed to the
+    route handler together with the parsed query string, JSON body and request
+    headers.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        capacity: int | None = None,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        @param latency: seconds to wait before answering each request
+        @param capacity: answer 429 while more requests than this are in flight
+        @param error_rate: fraction of the requests answered 429 with
+        Retry-After: 0 at random, which JiraAPI retries whatever the method
+        @param seed: makes the random errors repeatable
+        """
+        self.latency = latency
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rejected = 0
+        self.created: dict[str, dict] = {}
+        # Keys of the created issues by rank, initially in creation order
+        self.ranks: list[str] = []
+        self._keys = itertools.count(1)
+        self._random = random.Random(seed)
+        self.routes: list[tuple[str, re.Pattern, Route]] = []
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests: list[tuple[str, str]] = []
+        self.failures: list[dict] = []
+        self._lock = threading.Lock()
+        self.add_route("GET", r"/rest/api/2/issue/([A-Z]+-\d+)", self._get_issue)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def address(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def config(self) -> configparser.ConfigParser:
+        """
+        Config pointing JiraAPI at this server
+        @return: the config template with BASE_URL and SCHEME overridden
+        """
+        config = configparser.ConfigParser()
+        config.read(CONFIG_TEMPLATE)
+        config.set("JIRA", "BASE_URL", self.address)
+        config.set("JIRA", "SCHEME", "http")
+        return config
+
+    def call_counts(self) -> Counter[str]:
+        """
+        @return: the number of requests received by "METHOD /path/template",
+        with the issue keys and board ids of the paths replaced by {}
+        """
+        with self._lock:
+            return Counter(
+                f"{method} {PATH_PARAMETER.sub('/{}', path)}"
+                for method, path in self.requests
+            )
+
+    def add_route(self, method: str, pattern: str, route: Route) -> None:
+        self.routes.insert(0, (method, re.compile(f"^{pattern}$"), route))
+
+    def add_search(self, total: int, max_results: int = 100) -> None:
+        """
+        Serve `total` synthetic issues from the search endpoint, capping the page
+        size at `max_results` like Jira does
+        """
+
+        def search(query: dict, **_: Any) -> tuple[int, Any]:
+            start_at = int(query.get("startAt", 0))
+            page_size = min(int(query.get("maxResults", 50)), max_results)
+            issues = [
+                {"key": f"SYN-{i}", "fields": {"summary": f"Synthetic issue {i}"}}
+                for i in range(start_at, min(start_at + page_size, total))
+            ]
+            return 200, {
+                "startAt": start_at,
+                "maxResults": page_size,
+                "total": total,
+                "issues": issues,
+            }
+
+        self.add_route("GET", r"/rest/api/2/search", search)
+
+    def add_issues(
+        self, keys: Iterable[str], moved: dict[str, str] | None = None
+    ) -> None:
+        """
+        Serve these issues from `key in (...)` searches and GET /issue/{key}.
+        Unknown keys fail the search unless validateQuery=warn, in which case they
+        only add a warning, and aren't found by GET.
+        @param moved: the new key by old key of issues moved to another project,
+        served under their new key when looked up by the old one
+        """
+        issues = {key: self._get_issue(key)[1] for key in keys}
+        moved = moved or {}
+
+        def get_issue(key: str, **_: Any) -> tuple[int, Any]:
+            key = moved.get(key, key)
+            if key not in issues:
+                return 404, {"errorMessages": ["Issue Does Not Exist"]}
+            return 200, issues[key]
+
+        def search(query: dict, **_: Any) -> tuple[int, Any]:
+            match = re.fullmatch(r"key in \((.*)\)", query["jql"])
+            assert match, query["jql"]
+            requested = match.group(1).split(", ")
+            warnings = [
+                f"An issue with key '{key}' does not exist for field 'key'."
+                for key in requested
+                if moved.get(key, key) not in issues
+            ]
+            if warnings and query.get("validateQuery") != "warn":
+                return 400, {"errorMessages": warnings}
+            found = [
+                issues[moved.get(key, key)]
+                for key in requested
+                if moved.get(key, key) in issues
+            ]
+            start_at = int(query.get("startAt", 0))
+            page_size = int(query.get("maxResults", 50))
+            return 200, {
+                "startAt": start_at,
+                "maxResults": page_size,
+                "total": len(found),
+                "issues": found[start_at : start_at + page_size],
+                "warningMessages": warnings,
+            }
+
+        self.add_route("GET", r"/rest/api/2/search", search)
+        self.add_route("GET", r"/rest/api/2/issue/([A-Z]+-\d+)", get_issue)
+
+    def add_metadata(self, fields: list[dict]) -> None:
+        """
+        Serve these fields from /rest/api/2/field, and the create screens of any
+        project from createmeta, each issue type having every field
+        """
+        screen = {
+            field["id"]: {"name": field["name"], "required": False} for field in fields
+        }
+
+        def createmeta(query: dict, **_: Any) -> tuple[int, Any]:
+            issue_types = ("Epic", "Deliverable", "Story", "Task", "Spike", "Bug")
+            return 200, {
+                "projects": [
+                    {
+                        "key": query["projectKeys"],
+                        "issuetypes": [
+                            {"name": name, "fields": screen} for name in issue_types
+                        ],
+                    }
+                ]
+            }
+
+        self.add_route("GET", r"/rest/api/2/field", lambda **_: (200, fields))
+        self.add_route("GET", r"/rest/api/2/issue/createmeta", createmeta)
+
+    def add_jira_routes(self) -> None:
+        """
+        Serve every endpoint JiraAPI writes to. Created issues are kept in
+        `created` and ranked in `ranks`; comments, edits, backlog moves and epic
+        assignments are accepted and dropped.
+        """
+        self.add_route("POST", r"/rest/api/2/issue", self._create_issue)
+        self.add_route("POST", r"/rest/api/2/issue/bulk", self._create_issues)
+        self.add_route("PUT", r"/rest/api/2/issue/([A-Z]+-\d+)", self._no_content)
+        self.add_route(
+            "GET",
+            r"/rest/api/2/issue/([A-Z]+-\d+)/comment",
+            lambda key, **_: (200, {"startAt": 0, "total": 0, "comments": []}),
+        )
+        self.add_route(
+            "POST",
+            r"/rest/api/2/issue/([A-Z]+-\d+)/comment",
+            lambda key, body, **_: (201, {"id": "1", **body}),
+        )
+        self.add_route(
+            "GET",
+            r"/rest/agile/1.0/board/(\d+)/sprint",
+            lambda board, **_: (200, {"values": [{"id": 1, "state": "future"}]}),
+        )
+        self.add_route("POST", r"/rest/agile/1.0/backlog/issue", self._no_content)
+        self.add_route("PUT", r"/rest/agile/1.0/issue/rank", self._rank_issues)
+        self.add_route(
+            "POST", r"/rest/agile/1.0/epic/([A-Z]+-\d+)/issue", self._no_content
+        )
+
+    def fail_requests(
+        self,
+        count: int,
+        status: int = 429,
+        headers: dict[str, str] | None = None,
+        method: str | None = None,
+    ) -> None:
+        """
+        Answer the next `count` requests, or only those using `method`, with an
+        error status and headers such as Retry-After instead of routing them
+        """
+        self.failures.append(
+            {
+                "count": count,
+                "status": status,
+                "headers": headers or {},
+                "method": method,
+            }
+        )
+
+    def __enter__(self) -> StandInJira:
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    @staticmethod
+    def _get_issue(key: str, **_: Any) -> tuple[int, Any]:
+        return 200, {"key": key, "fields": {"summary": f"Summary of {key}"}}
+
+    @staticmethod
+    def _no_content(*_: str, **__: Any) -> tuple[int, Any]:
+        return 204, None
+
+    def _store_issue(self, fields: dict) -> dict:
+        with self._lock:
+            key = f"{fields['project']['key']}-{next(self._keys)}"
+            self.created[key] = fields
+            self.ranks.append(key)
+        return {"id": key.rsplit("-", 1)[1], "key": key}
+
+    def _rank_issues(self, body: dict, **_: Any) -> tuple[int, Any]:
+        with self._lock:
+            ranks = [key for key in self.ranks if key not in body["issues"]]
+            if "rankAfterIssue" in body:
+                position = ranks.index(body["rankAfterIssue"]) + 1
+            else:
+                position = ranks.index(body["rankBeforeIssue"])
+            ranks[position:position] = body["issues"]
+            self.ranks = ranks
+        return 204, None
+
+    def _create_issue(self, body: dict, **_: Any) -> tuple[int, Any]:
+        return 201, self._store_issue(body["fields"])
+
+    def _create_issues(self, body: dict, **_: Any) -> tuple[int, Any]:
+        issues = [
+            self._store_issue(update["fields"]) for update in body["issueUpdates"]
+        ]
+        return 201, {"issues": issues, "errors": []}
+
+    def _dispatch(
+        self, method: str, path: str, query: dict, body: Any, headers: dict[str, str]
+    ) -> tuple[int, Any, dict[str, str]]:
+        with self._lock:
+            self.requests.append((method, path))
+            failure = self._next_failure(method)
+        if failure:
+            return failure["status"], None, failure["headers"]
+        for route_method, pattern, route in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                # Routes may also return response headers
+                result = route(*match.groups(), query=query, body=body, headers=headers)
+                return result if len(result) == 3 else (*result, {})
+        return 404, {"errorMessages": [f"No route for {method} {path}"]}, {}
+
+    def _next_failure(self, method: str) -> dict | None:
+        for failure in self.failures:
+            if failure["count"] and failure["method"] in (None, method):
+                failure["count"] -= 1
+                return failure
+        return None
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stand_in._lock:
+                    stand_in.connections += 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _handle(self) -> None:
+                split = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else None
+                query = {k: v[-1] for k, v in parse_qs(split.query).items()}
+                with stand_in._lock:
+                    stand_in.in_flight += 1
+                    stand_in.peak_in_flight = max(
+                        stand_in.peak_in_flight, stand_in.in_flight
+                    )
+                    capacity = stand_in.capacity
+                    overloaded = capacity is not None and stand_in.in_flight > capacity
+                    overloaded = overloaded or (
+                        stand_in._random.random() < stand_in.error_rate
+                    )
+                    stand_in.rejected += overloaded
+                try:
+                    if overloaded:
+                        status, payload, headers = 429, None, {"Retry-After": "0"}
+                    else:
+                        if stand_in.latency:
+                            time.sleep(stand_in.latency)
+                        status, payload, headers = stand_in._dispatch(
+                            self.command, split.path, query, body, dict(self.headers)
+                        )
+                finally:
+                    with stand_in._lock:
+                        stand_in.in_flight -= 1
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from jira_util.async_jira import AsyncJiraAPI
+from jira_util.fields import PayloadError
+from jira_util.jira import JiraAPI, SprintPosition
+from tests.stand_in import StandInJira
+
+
+class TestAsyncJiraAPI(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.created: list[dict] = []
+        self.stand_in.add_route(
+            "GET",
+            r"/rest/agile/1.0/board/(\d+)/sprint",
+            lambda board_id, **_: (200, {"values": [{"id": f"sprint-{board_id}"}]}),
+        )
+        self.stand_in.add_route("POST", r"/rest/api/2/issue", self._create_issue)
+        self.stand_in.add_route(
+            "GET",
+            r"/rest/api/2/issue/([A-Z]+-\d+)/comment",
+            lambda key, **_: (200, {"comments": [{"body": f"About {key}"}]}),
+        )
+        self.stand_in.add_route(
+            "POST",
+            r"/rest/api/2/issue/([A-Z]+-\d+)/comment",
+            lambda key, body, **_: (201, {"id": "1", "body": body["body"]}),
+        )
+        self.stand_in.add_route(
+            "PUT", r"/rest/api/2/issue/([A-Z]+-\d+)", lambda *_, **__: (204, None)
+        )
+        self.stand_in.add_route(
+            "GET",
+            r"/rest/api/2/search",
+            lambda query, **_: (200, {"issues": [{"key": "EPIC-1"}], "jql": query}),
+        )
+
+    def tearDown(self) -> None:
+        self.stand_in.__exit__(None, None, None)
+
+    def _create_issue(self, body: dict, **_: Any) -> tuple[int, dict]:
+        self.created.append(body)
+        return 201, {"key": f"JIRA-{len(self.created)}"}
+
+    async def test_hundreds_of_concurrent_get_ticket_calls(self) -> None:
+        self.stand_in.latency = 0.05
+        async with AsyncJiraAPI(self.stand_in.config(), max_in_flight=100) as jira:
+            start = time.perf_counter()
+            tickets = await asyncio.gather(
+                *(jira.get_ticket(f"JIRA-{i}") for i in range(300))
+            )
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual([t["key"] for t in tickets], [f"JIRA-{i}" for i in range(300)])
+        # Serially this would take 300 * 50ms = 15s
+        self.assertLess(elapsed, 5)
+        self.assertGreater(self.stand_in.peak_in_flight, 10)
+        self.assertLessEqual(self.stand_in.peak_in_flight, 100)
+        self.assertLessEqual(self.stand_in.connections, 100)
+
+    async def test_max_in_flight_limits_concurrency(self) -> None:
+        self.stand_in.latency = 0.01
+        async with AsyncJiraAPI(self.stand_in.config(), max_in_flight=5) as jira:
+            await asyncio.gather(*(jira.get_ticket(f"JIRA-{i}") for i in range(50)))
+
+        self.assertLessEqual(self.stand_in.peak_in_flight, 5)
+
+    async def test_create_ticket_payload_matches_sync_client(self) -> None:
+        config = self.stand_in.config()
+        async with AsyncJiraAPI(config) as jira:
+            created = await jira.create_ticket(
+                "Title", None, "Story", "EPIC-1", None, SprintPosition.NEXT_SPRINT
+            )
+        with JiraAPI(config) as jira_api:
+            jira_api.create_ticket(
+                "Title", None, "Story", "EPIC-1", None, SprintPosition.NEXT_SPRINT
+            )
+
+        self.assertEqual(created, {"key": "JIRA-1"})
+        self.assertEqual(self.created[0], self.created[1])
+        self.assertEqual(self.created[0]["fields"]["customfield_67890"], "sprint-999")
+
+    async def test_invalid_ticket_is_not_sent(self) -> None:
+        screen = {
+            field: {"name": field, "required": False}
+            for field in (
+                "summary",
+                "description",
+                "customfield_67890",
+                "customfield_11111",
+                "customfield_22222",
+                "customfield_33333",
+            )
+        }
+        screen["priority"] = {
+            "name": "Priority",
+            "required": False,
+            "allowedValues": [{"name": "Medium"}],
+        }
+        createmeta = {
+            "projects": [
+                {"key": "TEST", "issuetypes": [{"name": "Story", "fields": screen}]}
+            ]
+        }
+        self.stand_in.add_route(
+            "GET", r"/rest/api/2/issue/createmeta", lambda **_: (200, createmeta)
+        )
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        config = self.stand_in.config()
+        config.set("JIRA", "VALIDATE_FIELDS", "true")
+        config.set("JIRA", "PRIORITY", "Urgent")
+        config.set("JIRA", "METADATA_CACHE_FILE", str(Path(tmp.name) / "meta.json"))
+
+        async with AsyncJiraAPI(config) as jira:
+            with self.assertRaises(PayloadError) as context:
+                await jira.create_ticket(
+                    "Title", None, "Story", None, None, SprintPosition.NEXT_SPRINT
+                )
+
+        self.assertEqual(list(context.exception.errors), ["priority"])
+        self.assertEqual(self.created, [])
+
+    async def test_metadata_cache_is_shared_with_sync_client(self) -> None:
+        fields = [{"id": "customfield_12345", "name": "Epic Link"}]
+        self.stand_in.add_route("GET", r"/rest/api/2/field", lambda **_: (200, fields))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        config = self.stand_in.config()
+        config.set("JIRA", "EPIC_FIELD", "Epic Link")
+        config.set("JIRA", "METADATA_CACHE_FILE", str(Path(tmp.name) / "meta.json"))
+        with JiraAPI(config) as jira_api:
+            jira_api.get_fields()
+
+        async with AsyncJiraAPI(config) as jira:
+            await jira.set_epic("JIRA-1", "EPIC-1")
+
+        self.assertEqual(jira.epic_field, "customfield_12345")
+        self.assertEqual(self.stand_in.call_counts()["GET /rest/api/2/field"], 1)
+
+    async def test_other_methods(self) -> None:
+        async with AsyncJiraAPI(self.stand_in.config()) as jira:
+            comments = await jira.get_comment("JIRA-1")
+            comment = await jira.add_comment("JIRA-1", "Hello")
+            epic = await jira.set_epic("JIRA-1", "EPIC-1")
+            epics = await jira.get_active_epics()
+
+        self.assertEqual(comments, {"comments": [{"body": "About JIRA-1"}]})
+        self.assertEqual(comment["body"], "Hello")
+        self.assertEqual(epic, {})
+        self.assertEqual(epics, [{"key": "EPIC-1"}])
+
+    async def test_http_error_is_raised_and_logged(self) -> None:
+        async with AsyncJiraAPI(self.stand_in.config()) as jira:
+            with self.assertLogs("jira_util", level="ERROR") as cm:
+                with self.assertRaises(aiohttp.ClientResponseError) as context:
+                    await jira.get_ticket("not-a-key")
+
+        self.assertEqual(context.exception.status, 404)
+        self.assertIn("HTTP error 404", cm.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
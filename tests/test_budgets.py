@@ -0,0 +1,234 @@
+"""
+Request budgets: how many calls each endpoint may receive for a workload.
+They catch changes that make the number of requests grow with the number of
+tickets, such as a sprint lookup or a backlog rank per created ticket.
+"""
+from __future__ import annotations
+
+import configparser
+import tempfile
+import unittest
+from pathlib import Path
+
+from jira_util.importer import create_tickets_from_file, parse_ticket_file, plan_import
+from jira_util.jira import JiraAPI, SprintPosition
+from tests.stand_in import StandInJira
+
+CREATE = "POST /rest/api/2/issue"
+CREATE_BULK = "POST /rest/api/2/issue/bulk"
+SPRINT = "GET /rest/agile/1.0/board/{}/sprint"
+RANK = "POST /rest/agile/1.0/backlog/issue"
+RANK_ISSUES = "PUT /rest/agile/1.0/issue/rank"
+SET_EPIC = "POST /rest/agile/1.0/epic/{}/issue"
+SEARCH = "GET /rest/api/2/search"
+FIELDS = "GET /rest/api/2/field"
+CREATEMETA = "GET /rest/api/2/issue/createmeta"
+
+
+def story_file(epics: int, stories: int) -> list[str]:
+    lines = []
+    for epic in range(epics):
+        lines.append(f"Epic: Epic {epic}")
+        lines.extend(f"Story: Story {epic}.{story}" for story in range(stories))
+    return lines
+
+
+def new_stories(count: int) -> list[dict]:
+    return [
+        {
+            "title": f"T{i}",
+            "description": None,
+            "issue_type": "Story",
+            "epic": None,
+            "project": None,
+        }
+        for i in range(count)
+    ]
+
+
+class BudgetTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.stand_in.add_jira_routes()
+        self.jira_api = JiraAPI(self.stand_in.config())
+
+    def tearDown(self) -> None:
+        self.jira_api.close()
+        self.stand_in.__exit__(None, None, None)
+
+    def assertWithinBudget(self, budget: dict[str, int]) -> None:
+        """
+        Check that every endpoint was called at most as many times as budgeted,
+        and that no other endpoint was called
+        """
+        calls = self.stand_in.call_counts()
+        over = {
+            endpoint: f"{count} calls, budget {budget.get(endpoint, 0)}"
+            for endpoint, count in calls.items()
+            if count > budget.get(endpoint, 0)
+        }
+        self.assertEqual(over, {}, f"over budget, all calls: {dict(calls)}")
+
+
+class TestImportBudget(BudgetTestCase):
+    def test_500_stories(self) -> None:
+        create_tickets_from_file(self.jira_api, story_file(1, 500))
+
+        self.assertWithinBudget({SPRINT: 1, CREATE: 1, CREATE_BULK: 10})
+        self.assertEqual(len(self.stand_in.created), 501)
+
+    def test_500_stories_in_parallel(self) -> None:
+        create_tickets_from_file(self.jira_api, story_file(10, 50), jobs=4)
+
+        # Concurrent lookups are coalesced, but one may just miss the cached one
+        self.assertWithinBudget(
+            {SPRINT: 2, CREATE: 10, CREATE_BULK: 10, RANK_ISSUES: 11}
+        )
+
+    def test_existing_stories_are_moved_in_bulk(self) -> None:
+        lines = ["Epic: EPIC-1"] + [f"Story: OLD-{i}" for i in range(500)]
+
+        create_tickets_from_file(self.jira_api, lines)
+
+        self.assertWithinBudget({SET_EPIC: 10})
+
+    def test_dedupe_searches_in_chunks(self) -> None:
+        self.stand_in.add_search(0)
+
+        create_tickets_from_file(self.jira_api, story_file(1, 500), dedupe=True)
+
+        self.assertWithinBudget({SEARCH: 11, SPRINT: 1, CREATE: 1, CREATE_BULK: 10})
+
+    def test_plan_matches_the_calls_made(self) -> None:
+        lines = story_file(3, 120) + ["Epic: EPIC-1"] + ["Story: OLD-1"]
+
+        plan = plan_import(parse_ticket_file(lines), self.jira_api.board_id)
+        create_tickets_from_file(self.jira_api, lines)
+
+        self.assertEqual(len(plan), len(self.stand_in.requests))
+
+    def validating_config(self) -> configparser.ConfigParser:
+        """
+        @return: a config checking tickets against the create screens, with the
+        epic field given by name
+        """
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        config = self.stand_in.config()
+        config.set("JIRA", "VALIDATE_FIELDS", "true")
+        config.set("JIRA", "EPIC_FIELD", "Epic Link")
+        config.set("JIRA", "METADATA_CACHE_FILE", str(Path(tmp.name) / "meta.json"))
+        self.stand_in.add_metadata(
+            [
+                {"id": field, "name": name}
+                for field, name in [
+                    ("summary", "Summary"),
+                    ("description", "Description"),
+                    ("priority", "Priority"),
+                    ("customfield_12345", "Epic Link"),
+                    ("customfield_54321", "Epic Name"),
+                    ("customfield_67890", "Sprint"),
+                    ("customfield_11111", "Team"),
+                    ("customfield_22222", "Owner"),
+                    ("customfield_33333", "Area"),
+                ]
+            ]
+        )
+        return config
+
+    def test_plan_matches_the_calls_made_with_validation(self) -> None:
+        config = self.validating_config()
+        self.stand_in.add_search(0)
+        lines = story_file(3, 120)
+
+        with JiraAPI(config) as jira_api:
+            plan = plan_import(
+                parse_ticket_file(lines),
+                jira_api.board_id,
+                dedupe=True,
+                field_names=jira_api.unresolved_field_names(),
+                validate_project=jira_api.project,
+            )
+            create_tickets_from_file(jira_api, lines, dedupe=True)
+
+        self.assertEqual(len(plan), len(self.stand_in.requests))
+        self.assertEqual(self.stand_in.call_counts()[FIELDS], 1)
+        self.assertEqual(self.stand_in.call_counts()[CREATEMETA], 1)
+        self.assertWithinBudget(
+            {FIELDS: 1, CREATEMETA: 1, SEARCH: 8, SPRINT: 1, CREATE: 3, CREATE_BULK: 9}
+        )
+
+    def test_validation_looks_up_the_sprint_once_without_sprint_cache(self) -> None:
+        config = self.validating_config()
+        config.set("JIRA", "SPRINT_CACHE_TTL", "0")
+
+        with JiraAPI(config) as jira_api:
+            create_tickets_from_file(jira_api, story_file(1, 100))
+
+        # Once for the checks and once per bulk request
+        self.assertWithinBudget(
+            {FIELDS: 1, CREATEMETA: 1, SPRINT: 3, CREATE: 1, CREATE_BULK: 2}
+        )
+
+
+class TestClientBudget(BudgetTestCase):
+    def test_bulk_create_ranks_in_chunks(self) -> None:
+        self.jira_api.create_tickets_bulk(
+            new_stories(120), SprintPosition.TOP_OF_BACKLOG
+        )
+
+        self.assertWithinBudget({CREATE_BULK: 3, RANK: 3})
+
+    def test_rank_issues_in_chunks(self) -> None:
+        created = self.jira_api.create_tickets_bulk(
+            new_stories(120), SprintPosition.NEXT_SPRINT
+        )
+        keys = [result["key"] for result in created]
+
+        self.jira_api.rank_issues(keys[::-1])
+
+        self.assertEqual(self.stand_in.ranks, keys[::-1])
+        self.assertWithinBudget({SPRINT: 1, CREATE_BULK: 3, RANK_ISSUES: 3})
+
+    def test_deferred_ranks_are_sent_together(self) -> None:
+        for i in range(20):
+            self.jira_api.create_ticket(
+                f"T{i}",
+                None,
+                "Story",
+                None,
+                None,
+                SprintPosition.BOTTOM_OF_BACKLOG,
+                defer_rank=True,
+            )
+        self.jira_api.flush_backlog_ranks()
+
+        self.assertWithinBudget({CREATE: 20, RANK: 1})
+
+    def test_get_tickets(self) -> None:
+        keys = [f"JIRA-{i}" for i in range(500)]
+        self.stand_in.add_issues(keys)
+
+        self.assertEqual(len(list(self.jira_api.get_tickets(keys))), 500)
+
+        self.assertWithinBudget({SEARCH: 5})
+
+    def test_get_active_epics(self) -> None:
+        self.stand_in.add_search(1000)
+
+        self.assertEqual(len(self.jira_api.get_active_epics()), 1000)
+
+        self.assertWithinBudget({SEARCH: 10})
+
+    def test_repeated_sprint_lookups_are_cached(self) -> None:
+        for i in range(20):
+            self.jira_api.create_ticket(
+                f"T{i}", None, "Story", None, None, SprintPosition.NEXT_SPRINT
+            )
+
+        self.assertWithinBudget({SPRINT: 1, CREATE: 20})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import configparser
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from parameterized import parameterized
+
+from jira_util.cache import ResponseCache, SprintCache, parse_jira_datetime
+from jira_util.jira import JiraAPI
+from tests.stand_in import StandInJira
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSprintCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+
+    def test_entries_expire_after_ttl(self) -> None:
+        cache = SprintCache(ttl=60, clock=self.clock)
+        cache.put("example.com/999", {"id": 1})
+
+        self.clock.now += 59
+        self.assertEqual(cache.get("example.com/999"), {"id": 1})
+        self.clock.now += 1
+        self.assertIsNone(cache.get("example.com/999"))
+
+    def test_entry_expires_when_sprint_starts(self) -> None:
+        cache = SprintCache(ttl=3600, clock=self.clock)
+        starts = datetime.fromtimestamp(self.clock.now + 10, tz=timezone.utc)
+        cache.put("example.com/999", {"id": 1, "startDate": starts.isoformat()})
+
+        self.assertEqual(cache.get("example.com/999")["id"], 1)
+        self.clock.now += 10
+        self.assertIsNone(cache.get("example.com/999"))
+
+    def test_board_without_future_sprint_is_cached(self) -> None:
+        cache = SprintCache(ttl=60, clock=self.clock)
+        cache.put("example.com/999", {})
+
+        self.assertEqual(cache.get("example.com/999"), {})
+        self.assertIsNone(cache.get("example.com/111"))
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        cache = SprintCache(ttl=0, clock=self.clock)
+        cache.put("example.com/999", {"id": 1})
+
+        self.assertIsNone(cache.get("example.com/999"))
+
+    def test_persists_between_instances(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache" / "sprints.json"
+            SprintCache(ttl=60, path=path, clock=self.clock).put("b/1", {"id": 7})
+
+            self.assertEqual(
+                SprintCache(ttl=60, path=path, clock=self.clock).get("b/1"), {"id": 7}
+            )
+
+            SprintCache(ttl=60, path=path, clock=self.clock).clear()
+            self.assertIsNone(
+                SprintCache(ttl=60, path=path, clock=self.clock).get("b/1")
+            )
+
+    def test_unreadable_file_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sprints.json"
+            path.write_text("not json")
+
+            cache = SprintCache(path=path, clock=self.clock)
+            with self.assertLogs("jira_util.cache", level="WARNING"):
+                self.assertIsNone(cache.get("b/1"))
+
+    def test_file_is_read_on_first_use(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sprints.json"
+            cache = SprintCache(ttl=60, path=path, clock=self.clock)
+            SprintCache(ttl=60, path=path, clock=self.clock).put("b/1", {"id": 7})
+
+            self.assertEqual(cache.get("b/1"), {"id": 7})
+
+    @parameterized.expand(
+        [
+            ("2024-05-01T09:00:00.000Z", 1714554000.0),
+            ("2024-05-01T09:00:00.000+0000", 1714554000.0),
+            ("2024-05-01T11:00:00+02:00", 1714554000.0),
+            ("garbage", None),
+            (None, None),
+        ]
+    )
+    def test_parse_jira_datetime(
+        self, value: str | None, expected: float | None
+    ) -> None:
+        self.assertEqual(parse_jira_datetime(value), expected)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "responses"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_entries_go_stale_after_ttl(self) -> None:
+        cache = ResponseCache(self.path, ttl=60, clock=self.clock)
+        cache.put("key", {"key": "JIRA-1"}, etag='"1"')
+
+        cached = cache.get("key")
+        self.assertTrue(cached.fresh)
+        self.assertEqual(cached.body, {"key": "JIRA-1"})
+        self.clock.now += 60
+        cached = cache.get("key")
+        self.assertFalse(cached.fresh)
+        self.assertEqual(cached.validators, {"If-None-Match": '"1"'})
+        self.assertIsNone(cache.get("other"))
+
+    def test_revalidation_restarts_ttl(self) -> None:
+        cache = ResponseCache(self.path, ttl=60, clock=self.clock)
+        cache.put("key", {}, last_modified="Tue, 14 Nov 2023 22:13:20 GMT")
+        self.clock.now += 100
+
+        cache.revalidated("key", cache.get("key"))
+
+        self.assertTrue(cache.get("key").fresh)
+        self.assertEqual(
+            cache.get("key").validators,
+            {"If-Modified-Since": "Tue, 14 Nov 2023 22:13:20 GMT"},
+        )
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        body = {"text": "x" * 1000}
+        cache = ResponseCache(self.path, ttl=60, max_size=2500, clock=self.clock)
+        cache.put("a", body)
+        cache.put("b", body)
+        os.utime(self.path / "a.json", (1, 1))
+        os.utime(self.path / "b.json", (2, 2))
+        cache.get("a")
+
+        cache.put("c", body)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_keys_depend_on_params_and_authorization(self) -> None:
+        keys = {
+            ResponseCache.key("https://x/issue", None, "Basic a"),
+            ResponseCache.key("https://x/issue", {"fields": "summary"}, "Basic a"),
+            ResponseCache.key("https://x/issue", None, "Basic b"),
+        }
+
+        self.assertEqual(len(keys), 3)
+
+    def test_disabled_unless_configured(self) -> None:
+        config = configparser.ConfigParser()
+        config.read_dict({"JIRA": {"RESPONSE_CACHE_DIR": str(self.path)}})
+
+        self.assertIsNone(ResponseCache.from_config(config, "JIRA"))
+        self.assertEqual(ResponseCache.from_config(config, "JIRA", ttl=30).ttl, 30)
+        config.set("JIRA", "RESPONSE_CACHE_TTL", "60")
+        self.assertEqual(ResponseCache.from_config(config, "JIRA").path, self.path)
+        self.assertIsNone(ResponseCache.from_config(config, "JIRA", ttl=0))
+
+
+class TestJiraAPIResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.jira_api = JiraAPI(self.stand_in.config())
+        self.jira_api.response_cache = ResponseCache(
+            Path(self.tmp.name), ttl=60, clock=self.clock
+        )
+        self.conditional_headers: list[str | None] = []
+
+    def tearDown(self) -> None:
+        self.jira_api.close()
+        self.stand_in.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def add_issue_with_etag(self) -> None:
+        def get_issue(key: str, headers: dict, **_: object) -> tuple:
+            self.conditional_headers.append(headers.get("If-None-Match"))
+            if headers.get("If-None-Match") == '"v1"':
+                return 304, None, {"ETag": '"v1"'}
+            return 200, {"key": key}, {"ETag": '"v1"'}
+
+        self.stand_in.add_route("GET", r"/rest/api/2/issue/([A-Z]+-\d+)", get_issue)
+
+    def test_fresh_responses_are_served_from_disk(self) -> None:
+        self.jira_api.get_ticket("JIRA-1")
+        ticket = self.jira_api.get_ticket("JIRA-1")
+
+        self.assertEqual(ticket["key"], "JIRA-1")
+        self.assertEqual(len(self.stand_in.requests), 1)
+
+    def test_stale_responses_are_revalidated(self) -> None:
+        self.add_issue_with_etag()
+        self.jira_api.get_ticket("JIRA-1")
+        self.clock.now += 60
+
+        ticket = self.jira_api.get_ticket("JIRA-1")
+        self.jira_api.get_ticket("JIRA-1")
+
+        self.assertEqual(ticket, {"key": "JIRA-1"})
+        self.assertEqual(self.conditional_headers, [None, '"v1"'])
+
+    def test_params_are_part_of_the_key(self) -> None:
+        self.jira_api.get_ticket("JIRA-1")
+        self.jira_api.get_ticket("JIRA-1", fields="minimal")
+
+        self.assertEqual(len(self.stand_in.requests), 2)
+
+    def test_started_sprint_is_not_served_from_the_response_cache(self) -> None:
+        self.jira_api.response_cache = ResponseCache(
+            Path(self.tmp.name), ttl=3600, clock=self.clock
+        )
+        self.jira_api.sprint_cache = SprintCache(ttl=3600, clock=self.clock)
+        starts = datetime.fromtimestamp(self.clock.now + 10, tz=timezone.utc)
+        sprints = iter(
+            [
+                {"values": [{"id": 1, "startDate": starts.isoformat()}]},
+                {"values": [{"id": 2}]},
+            ]
+        )
+        self.stand_in.add_route(
+            "GET",
+            r"/rest/agile/1.0/board/(\d+)/sprint",
+            lambda *_, **__: (200, next(sprints)),
+        )
+
+        self.assertEqual(self.jira_api._get_next_sprint("999"), 1)
+        self.clock.now += 10
+
+        self.assertEqual(self.jira_api._get_next_sprint("999"), 2)
+        self.assertEqual(len(self.stand_in.requests), 2)
+
+    def test_writes_clear_the_cache(self) -> None:
+        self.stand_in.add_route(
+            "POST",
+            r"/rest/api/2/issue/([A-Z]+-\d+)/comment",
+            lambda *_, **__: (201, {}),
+        )
+        self.jira_api.get_ticket("JIRA-1")
+
+        self.jira_api.add_comment("JIRA-1", "Done")
+        self.jira_api.get_ticket("JIRA-1")
+
+        self.assertEqual(
+            [method for method, _ in self.stand_in.requests], ["GET", "POST", "GET"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
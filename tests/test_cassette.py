@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+from jira_util.cassette import CassetteMiss, ReplayAdapter
+from jira_util.jira import JiraAPI, SprintPosition
+from tests.stand_in import StandInJira
+
+
+def cassette_entry(url: str, elapsed: float = 0.1, **fields: object) -> dict:
+    entry = {
+        "at": 0.0,
+        "method": "GET",
+        "url": url,
+        "request_headers": {},
+        "request_body": None,
+        "status": 200,
+        "headers": {"Content-Type": "application/json"},
+        "body": "{}",
+        "elapsed": elapsed,
+    }
+    entry.update(fields)
+    return entry
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def record(self, path: Path) -> tuple[dict, dict]:
+        with StandInJira() as stand_in:
+            stand_in.add_jira_routes()
+            self.config = stand_in.config()
+            with JiraAPI(self.config) as jira_api:
+                jira_api.record(path)
+                ticket = jira_api.get_ticket("JIRA-1")
+                created = jira_api.create_ticket(
+                    "Title", None, "Story", None, None, SprintPosition.BOTTOM_OF_BACKLOG
+                )
+        return ticket, created
+
+    def test_record(self) -> None:
+        path = Path(self.tmp.name) / "run.ndjson"
+
+        self.record(path)
+
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual(
+            [(entry["method"], entry["url"]) for entry in entries],
+            [
+                ("GET", "/rest/api/2/issue/JIRA-1"),
+                ("POST", "/rest/api/2/issue"),
+                ("POST", "/rest/agile/1.0/backlog/issue?rankAfterIssue=last"),
+            ],
+        )
+        self.assertEqual(entries[0]["request_headers"]["Authorization"], "<redacted>")
+        self.assertEqual(entries[1]["status"], 201)
+        self.assertEqual(json.loads(entries[1]["body"])["key"], "TEST-1")
+        self.assertNotIn("test_api_token", path.read_text())
+
+    def test_replay_without_jira(self) -> None:
+        path = Path(self.tmp.name) / "run.ndjson.gz"
+        ticket, created = self.record(path)
+
+        with JiraAPI(self.config) as jira_api:
+            jira_api.replay(path, latency_scale=0)
+
+            self.assertEqual(jira_api.get_ticket("JIRA-1"), ticket)
+            self.assertEqual(
+                jira_api.create_ticket(
+                    "Title", None, "Story", None, None, SprintPosition.BOTTOM_OF_BACKLOG
+                ),
+                created,
+            )
+        with gzip.open(path, "rt") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+
+class TestReplayAdapter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.sleeps: list[float] = []
+
+    def session(
+        self, entries: list[dict], latency_scale: float = 1.0
+    ) -> requests.Session:
+        path = Path(self.tmp.name) / "cassette.ndjson"
+        path.write_text("".join(f"{json.dumps(entry)}\n" for entry in entries))
+        session = requests.Session()
+        session.mount(
+            "https://", ReplayAdapter(path, latency_scale, sleep=self.sleeps.append)
+        )
+        return session
+
+    def test_responses_are_served_in_order(self) -> None:
+        session = self.session(
+            [
+                cassette_entry("/a", status=429, body=""),
+                cassette_entry("/a", body='{"n": 2}'),
+            ]
+        )
+
+        statuses = [session.get("https://jira/a").status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [429, 200, 200])
+        self.assertEqual(session.get("https://jira/a").json(), {"n": 2})
+
+    def test_exact_and_fallback_matches_share_the_recording(self) -> None:
+        session = self.session(
+            [
+                cassette_entry("/a", method="POST", request_body="x", body='{"n": 1}'),
+                cassette_entry("/a", method="POST", request_body="y", body='{"n": 2}'),
+                cassette_entry("/a", method="POST", request_body="x", body='{"n": 3}'),
+            ]
+        )
+
+        served = [
+            session.post("https://jira/a", data=body).json()["n"]
+            for body in ("x", "z", "z", "x", "y")
+        ]
+
+        # Every exchange is served once before any is served again
+        self.assertEqual(served, [1, 2, 3, 3, 2])
+
+    def test_latency_is_scaled(self) -> None:
+        session = self.session([cassette_entry("/a", elapsed=0.5)], latency_scale=0.1)
+
+        session.get("https://jira/a")
+
+        self.assertEqual(self.sleeps, [0.05])
+
+    def test_recorded_errors_are_raised(self) -> None:
+        session = self.session(
+            [cassette_entry("/a", error="timed out", error_type="ReadTimeout")]
+        )
+
+        with self.assertRaises(requests.ReadTimeout):
+            session.get("https://jira/a")
+
+    def test_unrecorded_request(self) -> None:
+        session = self.session([cassette_entry("/a")])
+
+        with self.assertRaises(CassetteMiss):
+            session.get("https://jira/b")
+
+
+if __name__ == "__main__":
+    unittest.main()
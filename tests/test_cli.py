@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from jira_util.jira import JiraAPI
+from jira_util.jira_util import print_tickets, report_stats
+from tests.stand_in import StandInJira
+
+
+class TestPrintTickets(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.stand_in.add_issues(["JIRA-1", "JIRA-2", "JIRA-3"])
+        self.jira_api = JiraAPI(self.stand_in.config())
+
+    def tearDown(self) -> None:
+        self.jira_api.close()
+        self.stand_in.__exit__(None, None, None)
+
+    def print_tickets(
+        self,
+        arguments: list[str],
+        fields: str | None = None,
+        expand: str | None = None,
+        stdin: str = "",
+    ) -> tuple[bool, str, str]:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch("sys.stdin", io.StringIO(stdin)), patch("sys.stdout", stdout), patch(
+            "sys.stderr", stderr
+        ):
+            all_found = print_tickets(self.jira_api, arguments, fields, expand)
+        return all_found, stdout.getvalue(), stderr.getvalue()
+
+    def test_single_key_is_printed_as_indented_json(self) -> None:
+        all_found, stdout, _ = self.print_tickets(["JIRA-1"])
+
+        self.assertTrue(all_found)
+        self.assertEqual(json.loads(stdout)["key"], "JIRA-1")
+        self.assertIn('\n    "key": "JIRA-1"', stdout)
+        self.assertEqual(self.stand_in.requests, [("GET", "/rest/api/2/issue/JIRA-1")])
+
+    def test_single_missing_key_is_reported(self) -> None:
+        with self.assertLogs("jira_util.jira", "ERROR"):
+            all_found, stdout, stderr = self.print_tickets(["JIRA-404"])
+
+        self.assertFalse(all_found)
+        self.assertEqual(stdout, "")
+        self.assertEqual(stderr, "Not found: JIRA-404\n")
+
+    def test_single_key_with_fields(self) -> None:
+        self.print_tickets(["JIRA-1"], fields="minimal", expand="changelog")
+
+        self.assertEqual(self.stand_in.requests, [("GET", "/rest/api/2/issue/JIRA-1")])
+
+    def test_many_keys_are_printed_as_ndjson(self) -> None:
+        all_found, stdout, stderr = self.print_tickets(["JIRA-1", "JIRA-2,JIRA-3"])
+
+        self.assertTrue(all_found)
+        self.assertEqual(
+            [json.loads(line)["key"] for line in stdout.splitlines()],
+            ["JIRA-1", "JIRA-2", "JIRA-3"],
+        )
+        self.assertEqual(stderr, "")
+        self.assertEqual(self.stand_in.requests, [("GET", "/rest/api/2/search")])
+
+    def test_keys_are_read_from_stdin(self) -> None:
+        all_found, stdout, stderr = self.print_tickets(
+            [], stdin="JIRA-3\nJIRA-404 JIRA-1\n"
+        )
+
+        self.assertFalse(all_found)
+        self.assertEqual(
+            [json.loads(line)["key"] for line in stdout.splitlines()],
+            ["JIRA-3", "JIRA-1"],
+        )
+        self.assertEqual(stderr, "Not found: JIRA-404\n")
+
+    def test_moved_ticket_is_found(self) -> None:
+        self.stand_in.add_issues(["JIRA-1", "NEW-1"], moved={"OLD-1": "NEW-1"})
+
+        all_found, stdout, stderr = self.print_tickets(["JIRA-1", "OLD-1"])
+
+        self.assertTrue(all_found)
+        self.assertEqual(
+            [json.loads(line)["key"] for line in stdout.splitlines()],
+            ["JIRA-1", "NEW-1"],
+        )
+        self.assertEqual(stderr, "")
+
+
+class TestReportStats(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.config = self.stand_in.config()
+        self.jira_api = JiraAPI(self.config)
+        self.jira_api.get_ticket("JIRA-1")
+
+    def tearDown(self) -> None:
+        self.jira_api.close()
+        self.stand_in.__exit__(None, None, None)
+
+    def report_stats(self, stats: str | None, metrics_file: Path | None) -> str:
+        options = argparse.Namespace(
+            stats=stats, metrics_file=metrics_file, config_section="JIRA"
+        )
+        stderr = io.StringIO()
+        with patch("sys.stderr", stderr):
+            report_stats(self.jira_api, self.config, options)
+        return stderr.getvalue()
+
+    def test_table(self) -> None:
+        stderr = self.report_stats("table", None)
+
+        self.assertTrue(stderr.startswith("METHOD  ENDPOINT"))
+        self.assertIn("GET     /rest/api/2/issue/{}  1", stderr)
+
+    def test_json(self) -> None:
+        stats = json.loads(self.report_stats("json", None))
+
+        self.assertEqual(stats["endpoints"][0]["statuses"], {"200": 1})
+
+    def test_metrics_file_from_config(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "jira_util.prom"
+            self.config.set("JIRA", "METRICS_FILE", str(path))
+
+            stderr = self.report_stats(None, None)
+
+            self.assertEqual(stderr, "")
+            self.assertIn("jira_util_requests_total", path.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import re
+import tempfile
+import unittest
+from configparser import ConfigParser
+from pathlib import Path
+
+import requests_mock
+from parameterized import parameterized
+
+from jira_util.fields import CreateMeta, FieldCatalog, FieldError, PayloadError
+from jira_util.jira import JiraAPI, SprintPosition
+
+FIELD_URL = "https://example.com/rest/api/2/field"
+CREATEMETA_URL = "https://example.com/rest/api/2/issue/createmeta"
+CREATE_URL = "https://example.com/rest/api/2/issue"
+BULK_URL = "https://example.com/rest/api/2/issue/bulk"
+
+FIELDS = [
+    {"id": "summary", "name": "Summary", "custom": False},
+    {"id": "priority", "name": "Priority", "custom": False},
+    {"id": "customfield_12345", "name": "Epic Link", "custom": True},
+    {"id": "customfield_54321", "name": "Epic Name", "custom": True},
+    {"id": "customfield_67890", "name": "Sprint", "custom": True},
+    {"id": "customfield_11111", "name": "Team", "custom": True},
+    {"id": "customfield_22222", "name": "Owner", "custom": True},
+    {"id": "customfield_33333", "name": "Area", "custom": True},
+    {"id": "customfield_44444", "name": "Area", "custom": True},
+]
+PRIORITIES = [{"id": "3", "name": "Medium"}, {"id": "2", "name": "High"}]
+
+
+def screen(*custom_fields: str) -> dict:
+    fields = {
+        "project": {"name": "Project", "required": True},
+        "issuetype": {"name": "Issue Type", "required": True},
+        "summary": {"name": "Summary", "required": True},
+        "description": {"name": "Description", "required": False},
+        "reporter": {"name": "Reporter", "required": True, "hasDefaultValue": True},
+        "priority": {
+            "name": "Priority",
+            "required": False,
+            "allowedValues": PRIORITIES,
+        },
+    }
+    fields.update(
+        {field: {"name": field, "required": False} for field in custom_fields}
+    )
+    return fields
+
+
+TEMPLATE_FIELDS = ("customfield_11111", "customfield_22222", "customfield_33333")
+CREATEMETA = {
+    "projects": [
+        {
+            "key": "TEST",
+            "issuetypes": [
+                {
+                    "name": "Story",
+                    "fields": screen(
+                        "customfield_12345", "customfield_67890", *TEMPLATE_FIELDS
+                    ),
+                },
+                {
+                    "name": "Epic",
+                    "fields": screen("customfield_54321", *TEMPLATE_FIELDS),
+                },
+            ],
+        }
+    ]
+}
+
+
+def story_fields(**fields: object) -> dict:
+    story = {
+        "project": {"key": "TEST"},
+        "issuetype": {"name": "Story"},
+        "summary": "Summary",
+        "priority": {"name": "Medium"},
+    }
+    story.update(fields)
+    return story
+
+
+class TestFieldCatalog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.catalog = FieldCatalog(FIELDS)
+
+    @parameterized.expand(
+        [
+            ("customfield_12345", "customfield_12345"),
+            ("Epic Link", "customfield_12345"),
+            ("epic link", "customfield_12345"),
+            ("Summary", "summary"),
+        ]
+    )
+    def test_resolve(self, field: str, expected: str) -> None:
+        self.assertEqual(self.catalog.resolve(field), expected)
+
+    @parameterized.expand(
+        [
+            ("Epic Lnk", "No field is named 'Epic Lnk'"),
+            ("Area", "Several fields are named 'Area'"),
+        ]
+    )
+    def test_resolve_fails(self, field: str, message: str) -> None:
+        with self.assertRaisesRegex(FieldError, message):
+            self.catalog.resolve(field)
+
+
+class TestCreateMeta(unittest.TestCase):
+    def setUp(self) -> None:
+        self.create_meta = CreateMeta("TEST", CREATEMETA)
+
+    def test_valid_fields(self) -> None:
+        self.assertEqual(self.create_meta.errors(story_fields()), {})
+
+    @parameterized.expand(
+        [
+            (
+                "not_on_screen",
+                story_fields(customfield_54321="Name"),
+                {"customfield_54321": "Not on the create screen of Story in TEST"},
+            ),
+            (
+                "required",
+                {"project": {"key": "TEST"}, "issuetype": {"name": "Story"}},
+                {"summary": "Summary is required"},
+            ),
+            (
+                "not_allowed",
+                story_fields(priority={"name": "Urgent"}),
+                {"priority": "Urgent isn't allowed for Priority (Medium, High)"},
+            ),
+            (
+                "issue_type",
+                story_fields(issuetype={"name": "Bug"}),
+                {"issuetype": "Bug isn't an issue type of TEST (Epic, Story)"},
+            ),
+        ]
+    )
+    def test_errors(self, _: str, fields: dict, expected: dict) -> None:
+        errors = self.create_meta.errors(fields)
+
+        self.assertEqual(errors.keys(), expected.keys())
+        for field, message in expected.items():
+            self.assertIn(message, errors[field])
+
+    def test_unknown_project(self) -> None:
+        errors = CreateMeta("NOPE", {"projects": []}).errors(story_fields())
+
+        self.assertEqual(list(errors), ["project"])
+
+
+class TestJiraAPIFields(unittest.TestCase):
+    def setUp(self) -> None:
+        config_file_path = Path(__file__).parent / ".." / ".jira-util.config.template"
+        self.jira_config = ConfigParser()
+        self.jira_config.read(config_file_path)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.jira_config.set(
+            "JIRA", "METADATA_CACHE_FILE", str(Path(self.tmp.name) / "metadata.json")
+        )
+        self.mock = requests_mock.Mocker()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        self.mock.get(FIELD_URL, json=FIELDS)
+        self.mock.get(CREATEMETA_URL, json=CREATEMETA)
+        self.mock.post(CREATE_URL, json={"key": "TEST-1"})
+        self.mock.put(re.compile(r"/rest/api/2/issue/TEST-[0-9]+$"), json={})
+
+    def jira_api(self, **settings: str) -> JiraAPI:
+        for key, value in settings.items():
+            self.jira_config.set("JIRA", key, value)
+        return JiraAPI(self.jira_config, config_section="JIRA")
+
+    def sent_fields(self) -> dict:
+        return self.mock.request_history[-1].json()["fields"]
+
+    def test_fields_configured_by_name_are_resolved_once(self) -> None:
+        jira_api = self.jira_api(
+            EPIC_FIELD="Epic Link", CUSTOM_FIELDS="Team=Platform,customfield_22222=x"
+        )
+
+        jira_api.set_epic("TEST-1", "TEST-9")
+        jira_api.set_epic("TEST-2", "TEST-9")
+
+        self.assertEqual(self.sent_fields(), {"customfield_12345": "TEST-9"})
+        self.assertEqual(jira_api.custom_fields["customfield_11111"], "Platform")
+        self.assertEqual(self.mock.call_count, 3)
+
+    def test_field_ids_need_no_lookup(self) -> None:
+        jira_api = self.jira_api()
+
+        jira_api.set_epic("TEST-1", "TEST-9")
+
+        self.assertEqual(self.mock.call_count, 1)
+
+    def test_unknown_field_name(self) -> None:
+        jira_api = self.jira_api(SPRINT_FIELD="Sprnt")
+
+        with self.assertRaisesRegex(FieldError, "Sprnt"):
+            jira_api.set_epic("TEST-1", "TEST-9")
+
+    def test_metadata_is_cached_on_disk(self) -> None:
+        for _ in range(2):
+            jira_api = self.jira_api()
+            jira_api.get_fields()
+            jira_api.get_create_meta()
+
+        self.assertEqual(self.mock.call_count, 2)
+
+    def test_invalid_ticket_is_not_sent(self) -> None:
+        jira_api = self.jira_api(VALIDATE_FIELDS="true", PRIORITY="Urgent")
+
+        with self.assertRaises(PayloadError) as context:
+            jira_api.create_ticket(
+                "Title", None, "Story", None, None, SprintPosition.TOP_OF_BACKLOG
+            )
+
+        self.assertEqual(list(context.exception.errors), ["priority"])
+        self.assertNotIn("POST", [r.method for r in self.mock.request_history])
+
+    def test_valid_ticket_is_sent(self) -> None:
+        jira_api = self.jira_api(VALIDATE_FIELDS="true")
+
+        created = jira_api.create_ticket(
+            "Title", None, "Epic", None, None, SprintPosition.NEXT_SPRINT
+        )
+
+        self.assertEqual(created, {"key": "TEST-1"})
+        self.assertEqual(self.sent_fields()["customfield_54321"], "Title")
+
+    def test_invalid_tickets_fail_in_bulk_without_being_sent(self) -> None:
+        self.mock.post(BULK_URL, json={"issues": [{"key": "TEST-1"}], "errors": []})
+        self.mock.post("https://example.com/rest/agile/1.0/backlog/issue", json={})
+        jira_api = self.jira_api(VALIDATE_FIELDS="true")
+        tickets = [
+            {
+                "title": "T",
+                "description": None,
+                "issue_type": issue_type,
+                "epic": None,
+                "project": None,
+            }
+            for issue_type in ("Bug", "Story")
+        ]
+
+        results = jira_api.create_tickets_bulk(tickets, SprintPosition.TOP_OF_BACKLOG)
+
+        self.assertEqual(results[0]["status"], 400)
+        self.assertIn("issuetype", results[0]["errors"]["errors"])
+        self.assertEqual(results[1], {"key": "TEST-1"})
+        bulk = self.mock.request_history[-2].json()["issueUpdates"]
+        self.assertEqual([u["fields"]["issuetype"] for u in bulk], [{"name": "Story"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
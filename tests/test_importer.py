@@ -0,0 +1,681 @@
+from __future__ import annotations
+
+import io
+import re
+import tempfile
+import unittest
+from configparser import ConfigParser
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import requests_mock
+
+from jira_util.cache import MetadataCache
+from jira_util.importer import (
+    Diagnostic,
+    TicketFileError,
+    TicketImportError,
+    create_tickets_from_file,
+    parse_ticket_file,
+    plan_import,
+)
+from jira_util.jira import JiraAPI
+from jira_util.journal import ImportJournal
+from tests.stand_in import StandInJira
+
+INPUT_FILE = """\
+# Comment
+Deliverable: Ship it
+    Epic: First epic
+        Story: One
+        Story: Two
+        Story: JIRA-77
+    Epic: EPIC-9
+        Story: Three
+"""
+
+
+def bulk_response(
+    request: requests_mock.request._RequestObjectProxy, _: object
+) -> dict:
+    return {
+        "issues": [
+            {"key": f"JIRA-{update['fields']['summary']}"}
+            for update in request.json()["issueUpdates"]
+        ],
+        "errors": [],
+    }
+
+
+def mock_jira(mock_request: requests_mock.Mocker, host: str = "example.com") -> None:
+    mock_request.get(
+        f"https://{host}/rest/agile/1.0/board/999/sprint?state=future",
+        json={"values": [{"id": "123"}]},
+    )
+    mock_request.post(
+        f"https://{host}/rest/api/2/issue",
+        json=lambda request, _: {
+            "key": f"JIRA-{request.json()['fields']['summary'].replace(' ', '')}"
+        },
+    )
+    mock_request.post(
+        f"https://{host}/rest/api/2/issue/bulk",
+        status_code=201,
+        json=bulk_response,
+    )
+    mock_request.post(
+        re.compile(rf"https://{re.escape(host)}/rest/agile/1.0/epic/.*/issue"),
+        status_code=204,
+    )
+    mock_request.put(f"https://{host}/rest/agile/1.0/issue/rank", status_code=204)
+
+
+class TestParseTicketFile(unittest.TestCase):
+    def test_stories_depend_on_the_epic_above_them(self) -> None:
+        batches = parse_ticket_file(io.StringIO(INPUT_FILE))
+
+        self.assertEqual(
+            [[node.line_number for node in batch.nodes] for batch in batches],
+            [[2], [3], [4, 5, 6], [7], [8]],
+        )
+        self.assertEqual(
+            [
+                batch.depends_on.line_number if batch.depends_on else None
+                for batch in batches
+            ],
+            [None, None, 3, None, 7],
+        )
+        self.assertEqual(batches[2].nodes[2].key, "JIRA-77")
+        self.assertEqual(batches[3].nodes[0].key, "EPIC-9")
+        self.assertEqual(
+            [batch.ready for batch in batches], [True, True, False, True, True]
+        )
+
+    def test_stories_are_split_into_bulk_sized_batches(self) -> None:
+        lines = ["Epic: Big"] + [f"Story: {i}" for i in range(120)]
+
+        batches = parse_ticket_file(lines)
+
+        self.assertEqual([len(batch.nodes) for batch in batches], [1, 50, 50, 20])
+        self.assertTrue(
+            all(batch.depends_on is batches[0].nodes[0] for batch in batches[1:])
+        )
+
+    def test_every_invalid_line_is_reported(self) -> None:
+        lines = [
+            "Epic: Fine",
+            "Story without a type",
+            "# Feature: commented out",
+            "Feature: Not an issue type",
+            "Story: Colons: are fine in summaries",
+            f"Story: {'x' * 256}",
+        ]
+
+        with self.assertRaises(TicketFileError) as context:
+            parse_ticket_file(lines)
+
+        self.assertEqual(
+            context.exception.diagnostics,
+            [
+                Diagnostic(
+                    2, 'expected "Issue type: summary", got "Story without a type"'
+                ),
+                Diagnostic(
+                    4,
+                    'unknown issue type "Feature", expected one of Deliverable, '
+                    "Epic, Story, Task, Spike, Bug",
+                ),
+                Diagnostic(6, "the summary is longer than 255 characters"),
+            ],
+        )
+        self.assertIn("\nline 4: unknown issue type", str(context.exception))
+
+    def test_plan(self) -> None:
+        batches = parse_ticket_file(io.StringIO(INPUT_FILE + "        Bug: OLD-1\n"))
+
+        plan = plan_import(batches, "999", dedupe=True)
+
+        self.assertEqual(
+            [(call.operation, call.line_numbers) for call in plan],
+            [
+                ("search", (2, 3, 4, 5, 8)),
+                ("sprint", (2,)),
+                ("create", (2,)),
+                ("create", (3,)),
+                ("create-bulk", (4, 5)),
+                ("set-epic", (6,)),
+                ("create-bulk", (8,)),
+                ("set-epic", (9,)),
+            ],
+        )
+        self.assertEqual(
+            [str(call) for call in plan[4:6]],
+            [
+                "create-bulk   lines 4-5     2 tickets under the Epic on line 3",
+                "set-epic      line 6        move JIRA-77 under the Epic on line 3",
+            ],
+        )
+
+
+class TestCreateTicketsFromFile(unittest.TestCase):
+    def setUp(self) -> None:
+        config_file_path = Path(__file__).parent / ".." / ".jira-util.config.template"
+        self.jira_config = ConfigParser()
+        self.jira_config.read(config_file_path)
+        self.jira_api = JiraAPI(self.jira_config, config_section="JIRA")
+
+    @requests_mock.mock()
+    def test_stories_are_created_in_bulk_after_their_epic(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+
+        create_tickets_from_file(
+            self.jira_api, io.StringIO(INPUT_FILE.replace("Deliverable", "# "))
+        )
+
+        calls = [
+            (r.method, r.path)
+            for r in mock_request.request_history
+            if r.path != "/rest/agile/1.0/board/999/sprint"
+        ]
+        self.assertEqual(
+            calls,
+            [
+                ("POST", "/rest/api/2/issue"),
+                ("POST", "/rest/api/2/issue/bulk"),
+                ("POST", "/rest/agile/1.0/epic/jira-firstepic/issue"),
+                ("POST", "/rest/api/2/issue/bulk"),
+            ],
+        )
+        first_bulk, second_bulk = [
+            r.json()["issueUpdates"]
+            for r in mock_request.request_history
+            if r.path == "/rest/api/2/issue/bulk"
+        ]
+        self.assertEqual(
+            [
+                (u["fields"]["summary"], u["fields"]["customfield_12345"])
+                for u in first_bulk
+            ],
+            [("One", "JIRA-Firstepic"), ("Two", "JIRA-Firstepic")],
+        )
+        self.assertEqual(second_bulk[0]["fields"]["customfield_12345"], "EPIC-9")
+
+    @requests_mock.mock()
+    def test_verbose_output_keeps_file_order(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            create_tickets_from_file(
+                self.jira_api, io.StringIO(INPUT_FILE), verbose=True
+            )
+
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            [
+                "Created Deliverable https://example.com/browse/JIRA-Shipit",
+                "\tCreated Epic https://example.com/browse/JIRA-Firstepic",
+                "\t\tCreated Story https://example.com/browse/JIRA-One, epic is JIRA-Firstepic",
+                "\t\tCreated Story https://example.com/browse/JIRA-Two, epic is JIRA-Firstepic",
+                "\t\tFound Story https://example.com/browse/JIRA-77, epic is JIRA-Firstepic",
+                "\tFound Epic https://example.com/browse/EPIC-9",
+                "\t\tCreated Story https://example.com/browse/JIRA-Three, epic is EPIC-9",
+            ],
+        )
+
+    @requests_mock.mock()
+    def test_parallel_import_matches_serial_import(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        lines = []
+        for epic in range(6):
+            lines.append(f"Epic: E{epic}")
+            lines.extend(f"Story: E{epic}S{story}" for story in range(60))
+
+        outputs = []
+        for jobs in (1, 4):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                create_tickets_from_file(self.jira_api, lines, verbose=True, jobs=jobs)
+            outputs.append(output.getvalue())
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(len(outputs[0].splitlines()), 366)
+        bulk_requests = [
+            r.json()["issueUpdates"]
+            for r in mock_request.request_history
+            if r.path == "/rest/api/2/issue/bulk"
+        ]
+        for updates in bulk_requests:
+            summaries = {u["fields"]["summary"][:2] for u in updates}
+            epics = {u["fields"]["customfield_12345"] for u in updates}
+            self.assertEqual(epics, {f"JIRA-{summary}" for summary in summaries})
+
+    @requests_mock.mock()
+    def test_existing_stories_are_moved_under_their_epic_in_bulk(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        lines = ["Epic: EPIC-1"] + [f"Story: OLD-{i}" for i in range(120)]
+
+        create_tickets_from_file(self.jira_api, lines)
+
+        self.assertEqual(
+            [(r.path, len(r.json()["issues"])) for r in mock_request.request_history],
+            [("/rest/agile/1.0/epic/epic-1/issue", n) for n in (50, 50, 20)],
+        )
+
+    @requests_mock.mock()
+    def test_epic_assignment_errors_are_reported_by_line_number(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        mock_request.post(
+            "https://example.com/rest/agile/1.0/epic/EPIC-1/issue",
+            status_code=207,
+            json={
+                "entries": [{"issueKey": "OLD-2", "status": 404, "errors": ["Gone"]}]
+            },
+        )
+        lines = ["Epic: EPIC-1"] + [f"Story: OLD-{i}" for i in range(3)]
+
+        with self.assertRaises(TicketImportError) as context:
+            create_tickets_from_file(self.jira_api, lines)
+
+        self.assertEqual(context.exception.errors, {4: {"errors": "Gone"}})
+
+    @requests_mock.mock()
+    def test_bulk_errors_are_reported_by_line_number(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        mock_request.post(
+            "https://example.com/rest/api/2/issue/bulk",
+            status_code=201,
+            json={
+                "issues": [{"key": "JIRA-1"}],
+                "errors": [
+                    {
+                        "status": 400,
+                        "elementErrors": {"errors": {"summary": "Too long"}},
+                        "failedElementNumber": 1,
+                    }
+                ],
+            },
+        )
+
+        with self.assertRaises(TicketImportError) as context:
+            create_tickets_from_file(self.jira_api, io.StringIO(INPUT_FILE))
+
+        self.assertEqual(list(context.exception.errors), [5])
+        self.assertIn("line 5:", str(context.exception))
+
+    @requests_mock.mock()
+    def test_dedupe_reuses_existing_tickets(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        mock_request.get(
+            "https://example.com/rest/api/2/search",
+            json={
+                "total": 3,
+                "issues": [
+                    {
+                        "key": "JIRA-5",
+                        "fields": {
+                            "summary": "first  EPIC",
+                            "issuetype": {"name": "Epic"},
+                        },
+                    },
+                    {
+                        "key": "JIRA-6",
+                        "fields": {
+                            "summary": "One",
+                            "issuetype": {"name": "Story"},
+                            "customfield_12345": "JIRA-5",
+                        },
+                    },
+                    {
+                        "key": "JIRA-8",
+                        "fields": {
+                            "summary": "Two",
+                            "issuetype": {"name": "Story"},
+                            "customfield_12345": "OTHER-1",
+                        },
+                    },
+                    {
+                        "key": "JIRA-7",
+                        "fields": {
+                            "summary": "Two more",
+                            "issuetype": {"name": "Story"},
+                        },
+                    },
+                ],
+            },
+        )
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            create_tickets_from_file(
+                self.jira_api,
+                io.StringIO(INPUT_FILE.replace("Deliverable", "# ")),
+                verbose=True,
+                dedupe=True,
+            )
+
+        searches = [r for r in mock_request.request_history if r.method == "GET"]
+        self.assertEqual(searches[0].path, "/rest/api/2/search")
+        self.assertEqual(
+            searches[0].qs["jql"],
+            [
+                'project = "test" and (summary ~ "\\"first epic\\"" or '
+                'summary ~ "\\"one\\"" or summary ~ "\\"two\\"" or '
+                'summary ~ "\\"three\\"") order by created asc'
+            ],
+        )
+        self.assertEqual(
+            output.getvalue().splitlines()[:3],
+            [
+                "\tFound Epic https://example.com/browse/JIRA-5",
+                "\t\tFound Story https://example.com/browse/JIRA-6, epic is JIRA-5",
+                "\t\tCreated Story https://example.com/browse/JIRA-Two, epic is JIRA-5",
+            ],
+        )
+        self.assertEqual(
+            searches[0].qs["fields"], ["summary,issuetype,customfield_12345"]
+        )
+        self.assertFalse(
+            any(r.path == "/rest/api/2/issue" for r in mock_request.request_history)
+        )
+        # Found stories already are under their epic, and aren't moved
+        moves = [
+            (r.path, r.json()["issues"])
+            for r in mock_request.request_history
+            if r.path.startswith("/rest/agile/1.0/epic/")
+        ]
+        self.assertEqual(moves, [("/rest/agile/1.0/epic/jira-5/issue", ["JIRA-77"])])
+
+    @requests_mock.mock()
+    def test_dedupe_searches_in_chunks(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        mock_request.get(
+            "https://example.com/rest/api/2/search", json={"total": 0, "issues": []}
+        )
+        lines = ["Epic: Big"] + [f"Story: Story {i}" for i in range(120)]
+
+        create_tickets_from_file(self.jira_api, lines, dedupe=True)
+
+        searches = [r for r in mock_request.request_history if r.method == "GET"]
+        self.assertEqual(
+            [r.path for r in searches if r.path != "/rest/agile/1.0/board/999/sprint"],
+            ["/rest/api/2/search"] * 3,
+        )
+
+    @requests_mock.mock()
+    def test_invalid_files_make_no_requests(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        lines = [f"Story: {i}" for i in range(399)] + ["Story 400"]
+
+        with self.assertRaises(TicketFileError) as context:
+            create_tickets_from_file(self.jira_api, lines)
+
+        self.assertEqual(context.exception.diagnostics[0].line_number, 400)
+        self.assertEqual(mock_request.request_history, [])
+
+    @requests_mock.mock()
+    def test_dry_run_prints_the_calls_an_import_makes(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        lines = ["Deliverable: D", "Epic: EPIC-1", "Story: OLD-1"]
+        for epic in range(3):
+            lines.append(f"Epic: E{epic}")
+            lines.extend(f"Story: E{epic}S{story}" for story in range(60))
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            create_tickets_from_file(self.jira_api, lines, jobs=4, dry_run=True)
+
+        self.assertEqual(mock_request.request_history, [])
+        self.assertEqual(output.getvalue().splitlines()[-1], "16 API calls")
+
+        create_tickets_from_file(self.jira_api, lines, jobs=4)
+
+        self.assertEqual(len(mock_request.request_history), 16)
+
+    @requests_mock.mock()
+    def test_fields_are_validated_before_anything_is_created(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_jira(mock_request)
+        epic_screen = {
+            field: {"required": False}
+            for field in (
+                "summary",
+                "description",
+                "priority",
+                "customfield_54321",
+                "customfield_11111",
+                "customfield_22222",
+                "customfield_33333",
+            )
+        }
+        mock_request.get(
+            "https://example.com/rest/api/2/issue/createmeta",
+            json={
+                "projects": [{"issuetypes": [{"name": "Epic", "fields": epic_screen}]}]
+            },
+        )
+        self.jira_api.validate_fields = True
+        self.jira_api.metadata_cache = MetadataCache(ttl=0)
+
+        with self.assertRaises(TicketFileError) as context:
+            create_tickets_from_file(
+                self.jira_api, ["Epic: E", "Story: S1", "Story: S2"]
+            )
+
+        self.assertEqual(
+            [str(diagnostic) for diagnostic in context.exception.diagnostics],
+            [
+                "line 2: issuetype: Story isn't an issue type of TEST (Epic)",
+                "line 3: issuetype: Story isn't an issue type of TEST (Epic)",
+            ],
+        )
+        self.assertNotIn("POST", [r.method for r in mock_request.request_history])
+
+
+class TestImportAgainstStandIn(unittest.TestCase):
+    def test_import_survives_injected_errors(self) -> None:
+        lines = []
+        for epic in range(4):
+            lines.append(f"Epic: E{epic}")
+            lines.extend(f"Story: E{epic}S{story}" for story in range(60))
+
+        with StandInJira(error_rate=0.2, seed=1) as stand_in:
+            stand_in.add_jira_routes()
+            config = stand_in.config()
+            config.set("JIRA", "RETRY_BACKOFF", "0.001")
+            with JiraAPI(config) as jira_api:
+                with self.assertLogs("jira_util.jira", "WARNING"):
+                    create_tickets_from_file(jira_api, lines, jobs=4)
+
+        self.assertGreater(stand_in.rejected, 0)
+        self.assertEqual(
+            sorted(fields["summary"] for fields in stand_in.created.values()),
+            sorted(line.split(": ")[1] for line in lines),
+        )
+        stories = [f for f in stand_in.created.values() if f["summary"][2:] == "S0"]
+        self.assertEqual(len({story["customfield_12345"] for story in stories}), 4)
+
+    def test_parallel_import_is_ranked_like_a_serial_one(self) -> None:
+        lines = []
+        for epic in range(6):
+            lines.append(f"Epic: E{epic}")
+            lines.extend(f"Story: E{epic}S{story}" for story in range(60))
+
+        for jobs in (1, 4):
+            # Slower epics make the workers finish out of file order
+            with StandInJira(latency=0.002) as stand_in:
+                stand_in.add_jira_routes()
+                with JiraAPI(stand_in.config()) as jira_api:
+                    create_tickets_from_file(jira_api, lines, jobs=jobs)
+
+            with self.subTest(jobs=jobs):
+                self.assertEqual(
+                    [stand_in.created[key]["summary"] for key in stand_in.ranks],
+                    [line.split(": ")[1] for line in lines],
+                )
+
+
+class TestResumableImport(unittest.TestCase):
+    def setUp(self) -> None:
+        config_file_path = Path(__file__).parent / ".." / ".jira-util.config.template"
+        self.jira_config = ConfigParser()
+        self.jira_config.read(config_file_path)
+        self.jira_api = JiraAPI(self.jira_config, config_section="JIRA")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = ImportJournal(Path(self.tmp.name) / "journal.ndjson")
+        self.lines = INPUT_FILE.replace("Deliverable", "# ").splitlines(keepends=True)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def created_keys(self) -> dict[int, str]:
+        file_hash = self.journal.file_hash(self.lines)
+        return self.journal.created_keys(file_hash, "example.com", "TEST")
+
+    def interrupted_import(self, mock_request: requests_mock.Mocker) -> None:
+        mock_jira(mock_request)
+        mock_request.post(
+            "https://example.com/rest/api/2/issue/bulk",
+            status_code=201,
+            json={
+                "issues": [{"key": "JIRA-One"}],
+                "errors": [{"status": 503, "failedElementNumber": 1}],
+            },
+        )
+        with self.assertRaises(TicketImportError):
+            create_tickets_from_file(self.jira_api, self.lines, journal=self.journal)
+
+    @requests_mock.mock()
+    def test_created_keys_are_journaled(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        self.interrupted_import(mock_request)
+
+        self.assertEqual(self.created_keys(), {3: "JIRA-Firstepic", 4: "JIRA-One"})
+
+    @requests_mock.mock()
+    def test_resume_skips_created_lines(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        self.interrupted_import(mock_request)
+        mock_request.reset_mock()
+        mock_jira(mock_request)
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            create_tickets_from_file(
+                self.jira_api, self.lines, True, journal=self.journal, resume=True
+            )
+
+        calls = [
+            (r.method, r.path)
+            for r in mock_request.request_history
+            if r.path != "/rest/agile/1.0/board/999/sprint"
+        ]
+        self.assertEqual(
+            calls,
+            [
+                ("POST", "/rest/api/2/issue/bulk"),
+                ("POST", "/rest/agile/1.0/epic/jira-firstepic/issue"),
+                ("POST", "/rest/api/2/issue/bulk"),
+            ],
+        )
+        bulk = mock_request.request_history[-3].json()["issueUpdates"]
+        self.assertEqual(
+            [(u["fields"]["summary"], u["fields"]["customfield_12345"]) for u in bulk],
+            [("Two", "JIRA-Firstepic")],
+        )
+        self.assertEqual(len(output.getvalue().splitlines()), 6)
+        self.assertEqual(len(self.created_keys()), 4)
+
+    @requests_mock.mock()
+    def test_rerun_without_resume_warns(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        self.interrupted_import(mock_request)
+        mock_jira(mock_request)
+
+        with self.assertLogs("jira_util.importer", "WARNING") as logs:
+            create_tickets_from_file(self.jira_api, self.lines, journal=self.journal)
+
+        self.assertIn("2 lines of this file", logs.output[0])
+
+    @requests_mock.mock()
+    def test_resume_into_another_jira_creates_every_line(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        self.interrupted_import(mock_request)
+        mock_request.reset_mock()
+        mock_jira(mock_request, "other.example.com")
+        self.jira_config.set("JIRA", "BASE_URL", "other.example.com")
+        other_jira = JiraAPI(self.jira_config, config_section="JIRA")
+
+        with self.assertLogs("jira_util.importer", "INFO") as logs:
+            create_tickets_from_file(
+                other_jira, self.lines, journal=self.journal, resume=True
+            )
+
+        self.assertEqual(
+            logs.output,
+            ["INFO:jira_util.importer:Resuming import, 0 lines were already created"],
+        )
+
+        bulk = [
+            update["fields"]["summary"]
+            for r in mock_request.request_history
+            if r.path == "/rest/api/2/issue/bulk"
+            for update in r.json()["issueUpdates"]
+        ]
+        self.assertEqual(bulk, ["One", "Two", "Three"])
+        self.assertEqual(
+            {r.hostname for r in mock_request.request_history}, {"other.example.com"}
+        )
+        self.assertEqual(len(self.created_keys()), 2)
+        file_hash = self.journal.file_hash(self.lines)
+        self.assertEqual(
+            self.journal.created_keys(file_hash, "other.example.com", "TEST"),
+            {3: "JIRA-Firstepic", 4: "JIRA-One", 5: "JIRA-Two", 8: "JIRA-Three"},
+        )
+
+    def test_journal_is_keyed_by_file_jira_and_project(self) -> None:
+        self.journal.record("a", "jira", "TEST", 1, "JIRA-1")
+        self.journal.record("b", "jira", "TEST", 1, "JIRA-2")
+        self.journal.record("a", "other", "TEST", 1, "JIRA-3")
+        self.journal.record("a", "jira", "OTHER", 1, "OTHER-1")
+        with open(self.journal.path, "a") as journal:
+            journal.write('{"file": "a", "li')
+
+        self.assertEqual(self.journal.created_keys("a", "jira", "TEST"), {1: "JIRA-1"})
+        self.assertEqual(
+            self.journal.created_keys("a", "jira", "OTHER"), {1: "OTHER-1"}
+        )
+        self.assertEqual(
+            ImportJournal(Path(self.tmp.name) / "none").created_keys(
+                "a", "jira", "TEST"
+            ),
+            {},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import base64
+import itertools
 import json
 import logging
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
@@ -13,6 +15,8 @@ import requests_mock
 from parameterized import parameterized
 
 from jira_util.jira import JiraAPI, SprintPosition
+from jira_util.retry import RetryPolicy
+from tests.stand_in import StandInJira
 
 
 class TestJiraAPI(unittest.TestCase):
@@ -94,6 +98,34 @@ class TestJiraAPI(unittest.TestCase):
 
         self.assertEqual(result, expected_response_data)
 
+    @parameterized.expand(
+        [
+            (None, None, {}),
+            ("minimal", None, {"fields": ["summary,status,issuetype"]}),
+            (["summary", "labels"], None, {"fields": ["summary,labels"]}),
+            (
+                "all",
+                "renderedFields",
+                {"fields": ["*all"], "expand": ["renderedfields"]},
+            ),
+        ]
+    )
+    @requests_mock.mock()
+    def test_get_ticket_fields_and_expand(
+        self,
+        fields: str | list[str] | None,
+        expand: str | None,
+        expected_query: dict,
+        mock_request: requests_mock.Mocker,
+    ) -> None:
+        mock_request.get(
+            "https://example.com/rest/api/2/issue/JIRA-123", json={"key": "JIRA-123"}
+        )
+
+        self.jira_api.get_ticket("JIRA-123", fields=fields, expand=expand)
+
+        self.assertEqual(mock_request.last_request.qs, expected_query)
+
     @parameterized.expand(
         [
             ("JIRA-123", "A comment", 201, {"id": 1}),
@@ -370,6 +402,233 @@ class TestJiraAPI(unittest.TestCase):
             # Verify the parsed JSON or response content if parsing failed
         self.assertEqual(got_response_json, response_json)
 
+    @requests_mock.mock()
+    def test_create_tickets_bulk_chunks(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_request.get(
+            "https://example.com/rest/agile/1.0/board/999/sprint?state=future",
+            json={"values": [{"id": "123"}]},
+        )
+        mock_request.post(
+            "https://example.com/rest/api/2/issue/bulk",
+            status_code=201,
+            json=lambda request, _: {
+                "issues": [
+                    {"key": f"JIRA-{update['fields']['summary']}"}
+                    for update in request.json()["issueUpdates"]
+                ],
+                "errors": [],
+            },
+        )
+        tickets = [
+            {
+                "title": str(i),
+                "description": None,
+                "issue_type": "Story",
+                "epic": "EPIC-1",
+                "project": None,
+            }
+            for i in range(120)
+        ]
+
+        results = self.jira_api.create_tickets_bulk(tickets, SprintPosition.NEXT_SPRINT)
+
+        self.assertEqual([r["key"] for r in results], [f"JIRA-{i}" for i in range(120)])
+        bulk_requests = [r for r in mock_request.request_history if r.method == "POST"]
+        self.assertEqual(
+            [len(r.json()["issueUpdates"]) for r in bulk_requests], [50, 50, 20]
+        )
+        self.assertEqual(mock_request.call_count, 4)
+        fields = bulk_requests[0].json()["issueUpdates"][0]["fields"]
+        self.assertEqual(fields[self.jira_api.epic_field], "EPIC-1")
+        self.assertEqual(fields[self.jira_api.sprint_field], "123")
+
+    @parameterized.expand(
+        [
+            (201, [{"key": "JIRA-1"}, {"key": "JIRA-3"}], [1]),
+            (400, [], [0, 1, 2]),
+        ]
+    )
+    @requests_mock.mock()
+    def test_create_tickets_bulk_errors(
+        self,
+        status_code: int,
+        issues: list[dict],
+        failed: list[int],
+        mock_request: requests_mock.Mocker,
+    ) -> None:
+        mock_request.post(
+            "https://example.com/rest/api/2/issue/bulk",
+            status_code=status_code,
+            json={
+                "issues": issues,
+                "errors": [
+                    {
+                        "status": 400,
+                        "elementErrors": {"errors": {"summary": "Too long"}},
+                        "failedElementNumber": index,
+                    }
+                    for index in failed
+                ],
+            },
+        )
+        tickets = [
+            {
+                "title": title,
+                "description": None,
+                "issue_type": "Story",
+                "epic": None,
+                "project": None,
+            }
+            for title in ("a", "b", "c")
+        ]
+
+        mock_request.post("https://example.com/rest/agile/1.0/backlog/issue")
+        self.jira_api.logger = MagicMock()
+
+        results = self.jira_api.create_tickets_bulk(
+            tickets, SprintPosition.BOTTOM_OF_BACKLOG
+        )
+
+        for index, result in enumerate(results):
+            if index in failed:
+                self.assertEqual(result["status"], 400)
+                self.assertEqual(result["errors"]["errors"], {"summary": "Too long"})
+            else:
+                self.assertIn(result, issues)
+        ranked = [
+            r.json()["issues"]
+            for r in mock_request.request_history
+            if r.path == "/rest/agile/1.0/backlog/issue"
+        ]
+        self.assertEqual(ranked, [[issue["key"] for issue in issues]] if issues else [])
+
+    @requests_mock.mock()
+    def test_next_sprint_is_looked_up_once(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        sprint = mock_request.get(
+            "https://example.com/rest/agile/1.0/board/999/sprint?state=future",
+            json={"values": [{"id": "123"}, {"id": "124"}]},
+        )
+        create = mock_request.post(
+            "https://example.com/rest/api/2/issue", json={"key": "JIRA-1"}
+        )
+
+        for title in ("a", "b", "c"):
+            self.jira_api.create_ticket(
+                title, None, "Story", None, None, SprintPosition.NEXT_SPRINT
+            )
+
+        self.assertEqual(sprint.call_count, 1)
+        self.assertEqual(create.call_count, 3)
+        self.assertEqual(
+            create.last_request.json()["fields"][self.jira_api.sprint_field], "123"
+        )
+
+        self.jira_api.sprint_cache.clear()
+        self.jira_api.create_ticket(
+            "d", None, "Story", None, None, SprintPosition.NEXT_SPRINT
+        )
+        self.assertEqual(sprint.call_count, 2)
+
+    @parameterized.expand(
+        [
+            (
+                SprintPosition.TOP_OF_BACKLOG,
+                [range(100, 120), range(50, 100), range(50)],
+            ),
+            (
+                SprintPosition.BOTTOM_OF_BACKLOG,
+                [range(50), range(50, 100), range(100, 120)],
+            ),
+        ]
+    )
+    @requests_mock.mock()
+    def test_move_issues_to_backlog_position_in_chunks(
+        self,
+        position: SprintPosition,
+        expected_chunks: list[range],
+        mock_request: requests_mock.Mocker,
+    ) -> None:
+        rank = mock_request.post(
+            "https://example.com/rest/agile/1.0/backlog/issue", status_code=204
+        )
+        keys = [f"JIRA-{i}" for i in range(120)]
+
+        errors = self.jira_api.move_issues_to_backlog_position(keys, position)
+
+        self.assertEqual(errors, {})
+        self.assertEqual(
+            [r.json()["issues"] for r in rank.request_history],
+            [[f"JIRA-{i}" for i in chunk] for chunk in expected_chunks],
+        )
+
+    @requests_mock.mock()
+    def test_move_issues_to_backlog_position_reports_failures_per_key(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        mock_request.post(
+            "https://example.com/rest/agile/1.0/backlog/issue",
+            [
+                {
+                    "status_code": 207,
+                    "json": {
+                        "entries": [
+                            {"issueKey": "JIRA-0", "status": 200},
+                            {"issueKey": "JIRA-1", "status": 403, "errors": ["Nope"]},
+                        ]
+                    },
+                },
+                {"status_code": 400, "text": "Bad chunk"},
+            ],
+        )
+        self.jira_api.logger = MagicMock()
+        keys = [f"JIRA-{i}" for i in range(52)]
+
+        errors = self.jira_api.move_issues_to_backlog_position(
+            keys, SprintPosition.BOTTOM_OF_BACKLOG
+        )
+
+        self.assertEqual(
+            errors,
+            {
+                "JIRA-1": "Nope",
+                "JIRA-50": "HTTP error 400: Bad chunk",
+                "JIRA-51": "HTTP error 400: Bad chunk",
+            },
+        )
+
+    @requests_mock.mock()
+    def test_deferred_ranks_are_flushed_together(
+        self, mock_request: requests_mock.Mocker
+    ) -> None:
+        keys = iter(f"JIRA-{i}" for i in range(5))
+        mock_request.post(
+            "https://example.com/rest/api/2/issue",
+            json=lambda *_: {"key": next(keys)},
+        )
+        rank = mock_request.post(
+            "https://example.com/rest/agile/1.0/backlog/issue", status_code=204
+        )
+
+        for position in [SprintPosition.TOP_OF_BACKLOG] * 3 + [
+            SprintPosition.BOTTOM_OF_BACKLOG
+        ] * 2:
+            self.jira_api.create_ticket(
+                "Title", None, "Story", None, None, position, defer_rank=True
+            )
+        self.assertEqual(rank.call_count, 0)
+
+        self.assertEqual(self.jira_api.flush_backlog_ranks(), {})
+        self.assertEqual(
+            [r.json()["issues"] for r in rank.request_history],
+            [["JIRA-0", "JIRA-1", "JIRA-2"], ["JIRA-3", "JIRA-4"]],
+        )
+        self.assertEqual(self.jira_api.flush_backlog_ranks(), {})
+        self.assertEqual(rank.call_count, 2)
+
     @parameterized.expand(
         [
             ("JIRA-123", "EPIC-456", 200, {"key": "JIRA-123"}),
@@ -447,5 +706,315 @@ class TestJiraAPI(unittest.TestCase):
         self.assertEqual(custom_fields[field], expected_value)
 
 
+class TestJiraAPISession(unittest.TestCase):
+    def test_requests_reuse_pooled_connection(self) -> None:
+        with StandInJira() as stand_in:
+            with JiraAPI(stand_in.config()) as jira_api:
+                for i in range(20):
+                    ticket = jira_api.get_ticket(f"JIRA-{i}")
+                    self.assertEqual(ticket["key"], f"JIRA-{i}")
+
+        self.assertEqual(len(stand_in.requests), 20)
+        self.assertEqual(stand_in.connections, 1)
+
+    def test_pool_size_from_config(self) -> None:
+        with StandInJira() as stand_in:
+            config = stand_in.config()
+            config.set("JIRA", "POOL_SIZE", "3")
+            with JiraAPI(config) as jira_api:
+                adapter = jira_api.session.get_adapter(f"http://{stand_in.address}")
+                self.assertEqual(adapter._pool_maxsize, 3)  # type: ignore
+            with JiraAPI(config, pool_size=5) as jira_api:
+                self.assertEqual(jira_api.pool_size, 5)
+
+    def test_close_releases_session(self) -> None:
+        with StandInJira() as stand_in:
+            jira_api = JiraAPI(stand_in.config())
+            with patch.object(jira_api.session, "close") as close:
+                with jira_api:
+                    jira_api.get_ticket("JIRA-1")
+            close.assert_called_once_with()
+
+
+class TestJiraAPISearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.jira_api = JiraAPI(self.stand_in.config())
+
+    def tearDown(self) -> None:
+        self.jira_api.close()
+        self.stand_in.__exit__(None, None, None)
+
+    @parameterized.expand(
+        [
+            (250, 100, 3),
+            (250, 500, 3),
+            (100, 100, 1),
+            (0, 100, 1),
+        ]
+    )
+    def test_iter_search_follows_pages(
+        self, total: int, page_size: int, expected_requests: int
+    ) -> None:
+        self.stand_in.add_search(total)
+
+        issues = list(self.jira_api.iter_search("project = TEST", "key", page_size))
+
+        self.assertEqual([i["key"] for i in issues], [f"SYN-{i}" for i in range(total)])
+        self.assertEqual(len(self.stand_in.requests), expected_requests)
+
+    def test_iter_search_is_lazy(self) -> None:
+        self.stand_in.add_search(1000)
+
+        issues = self.jira_api.iter_search("project = TEST", ["key", "summary"])
+
+        self.assertEqual(next(issues)["key"], "SYN-0")
+        self.assertEqual(len(self.stand_in.requests), 1)
+
+    @parameterized.expand([(1050, 4), (250, 8), (100, 4), (0, 4)])
+    def test_concurrent_iter_search_keeps_order(
+        self, total: int, concurrency: int
+    ) -> None:
+        self.stand_in.add_search(total)
+        self.stand_in.latency = 0.01
+
+        issues = list(
+            self.jira_api.iter_search("project = TEST", "key", concurrency=concurrency)
+        )
+
+        self.assertEqual([i["key"] for i in issues], [f"SYN-{i}" for i in range(total)])
+        self.assertEqual(len(self.stand_in.requests), max(1, -(-total // 100)))
+        self.assertLessEqual(self.stand_in.peak_in_flight, concurrency)
+        if total > 500:
+            self.assertGreater(self.stand_in.peak_in_flight, 1)
+
+    def test_concurrent_iter_search_stops_fetching_when_closed(self) -> None:
+        self.stand_in.add_search(10000)
+
+        issues = self.jira_api.iter_search("project = TEST", "key", concurrency=4)
+        self.assertEqual(next(itertools.islice(issues, 150, None))["key"], "SYN-150")
+        issues.close()
+
+        self.assertLessEqual(len(self.stand_in.requests), 1 + 4 + 1)
+
+    def test_get_active_epics_returns_more_than_one_page(self) -> None:
+        self.stand_in.add_search(150)
+
+        epics = self.jira_api.get_active_epics()
+
+        self.assertEqual(len(epics), 150)
+
+    def test_get_tickets_searches_in_chunks(self) -> None:
+        keys = [f"JIRA-{i}" for i in range(250)]
+        self.stand_in.add_issues(keys)
+
+        tickets = list(self.jira_api.get_tickets(keys, fields="summary"))
+
+        self.assertEqual([key for key, _ in tickets], keys)
+        self.assertEqual(tickets[7][1]["fields"]["summary"], "Summary of JIRA-7")
+        self.assertEqual(len(self.stand_in.requests), 3)
+
+    def test_get_tickets_reports_missing_keys(self) -> None:
+        self.stand_in.add_issues(["JIRA-1", "JIRA-3"])
+
+        tickets = dict(
+            self.jira_api.get_tickets(["JIRA-1", "JIRA-2", "jira-3", "JIRA-1", "bad"])
+        )
+
+        self.assertEqual(list(tickets), ["JIRA-1", "JIRA-2", "JIRA-3", "BAD"])
+        self.assertIsNone(tickets["JIRA-2"])
+        self.assertIsNone(tickets["BAD"])
+        self.assertEqual(tickets["JIRA-3"]["key"], "JIRA-3")
+        self.assertEqual(len(self.stand_in.requests), 1)
+
+    def test_get_tickets_maps_moved_issues_to_their_old_key(self) -> None:
+        self.stand_in.add_issues(["JIRA-1", "NEW-1"], moved={"OLD-1": "NEW-1"})
+
+        tickets = list(self.jira_api.get_tickets(["JIRA-1", "OLD-1"]))
+
+        self.assertEqual([key for key, _ in tickets], ["JIRA-1", "OLD-1"])
+        self.assertEqual(tickets[1][1]["key"], "NEW-1")
+        self.assertEqual(len(self.stand_in.requests), 1)
+
+    def test_get_tickets_looks_up_moved_issues_among_missing_ones(self) -> None:
+        self.stand_in.add_issues(
+            ["NEW-1", "NEW-2"], moved={"OLD-1": "NEW-1", "OLD-2": "NEW-2"}
+        )
+
+        tickets = dict(self.jira_api.get_tickets(["OLD-1", "JIRA-404", "OLD-2"]))
+
+        self.assertEqual(list(tickets), ["OLD-1", "JIRA-404", "OLD-2"])
+        self.assertEqual(tickets["OLD-1"]["key"], "NEW-1")
+        self.assertIsNone(tickets["JIRA-404"])
+        self.assertEqual(tickets["OLD-2"]["key"], "NEW-2")
+        self.assertEqual(len(self.stand_in.requests), 4)
+
+    def test_get_tickets_is_lazy(self) -> None:
+        self.stand_in.add_issues(f"JIRA-{i}" for i in range(1000))
+
+        tickets = self.jira_api.get_tickets(f"JIRA-{i}" for i in range(1000))
+
+        self.assertEqual(next(tickets)[0], "JIRA-0")
+        self.assertEqual(len(self.stand_in.requests), 1)
+
+    def test_summary_jql_quotes_phrases(self) -> None:
+        jql = JiraAPI._summary_jql(['Fix "login" page', "?!", "Add [x] + y"], "TEST")
+
+        self.assertEqual(
+            jql,
+            'project = "TEST" AND (summary ~ "\\"Fix login page\\"" OR '
+            'summary ~ "\\"Add x y\\"") ORDER BY created ASC',
+        )
+        self.assertIsNone(JiraAPI._summary_jql(["?!"], "TEST"))
+
+    def test_search_summaries_searches_in_chunks(self) -> None:
+        self.stand_in.add_search(0)
+
+        issues = list(
+            self.jira_api.search_summaries([f"Story {i}" for i in range(120)] * 2)
+        )
+
+        self.assertEqual(issues, [])
+        self.assertEqual(len(self.stand_in.requests), 3)
+
+
+class TestJiraAPIRetry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.stand_in.add_route(
+            "POST", r"/rest/api/2/issue", lambda **_: (201, {"key": "JIRA-1"})
+        )
+        self.jira_api = JiraAPI(self.stand_in.config())
+        self.jira_api.retry_policy = RetryPolicy(max_retries=3, backoff=0.001)
+
+    def tearDown(self) -> None:
+        self.jira_api.close()
+        self.stand_in.__exit__(None, None, None)
+
+    def test_get_recovers_from_rate_limiting(self) -> None:
+        self.stand_in.fail_requests(2, 429, {"Retry-After": "0"})
+
+        with self.assertLogs("jira_util.jira", "WARNING") as logs:
+            ticket = self.jira_api.get_ticket("JIRA-1")
+
+        self.assertEqual(ticket["key"], "JIRA-1")
+        self.assertEqual(len(self.stand_in.requests), 3)
+        self.assertIn("HTTP 429, retrying", logs.output[0])
+
+    def test_rate_limiting_pauses_every_worker(self) -> None:
+        self.stand_in.fail_requests(1, 429, {"Retry-After": "2"})
+
+        with patch.object(self.jira_api.throttle, "pause") as pause:
+            self.jira_api.get_ticket("JIRA-1")
+
+        self.assertGreaterEqual(pause.call_args[0][0], 2)
+
+    @parameterized.expand([(502,), (503,), (504,)])
+    def test_get_retries_server_errors_until_exhausted(self, status: int) -> None:
+        self.stand_in.fail_requests(10, status)
+
+        with self.assertLogs("jira_util.jira", "WARNING"):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.jira_api.get_ticket("JIRA-1")
+
+        self.assertEqual(len(self.stand_in.requests), 4)
+
+    def test_post_is_retried_on_429(self) -> None:
+        self.stand_in.fail_requests(1, 429, {"Retry-After": "0"}, method="POST")
+
+        with self.assertLogs("jira_util.jira", "WARNING"):
+            created = self.jira_api.create_ticket(
+                "Title", None, "Epic", None, None, SprintPosition.NEXT_SPRINT
+            )
+
+        self.assertEqual(created["key"], "JIRA-1")
+        self.assertEqual(self.stand_in.requests, [("POST", "/rest/api/2/issue")] * 2)
+
+    def test_post_is_not_retried_on_server_error(self) -> None:
+        self.stand_in.fail_requests(1, 503, method="POST")
+
+        with self.assertLogs("jira_util.jira", "ERROR"):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.jira_api.create_ticket(
+                    "Title", None, "Epic", None, None, SprintPosition.NEXT_SPRINT
+                )
+
+        self.assertEqual(len(self.stand_in.requests), 1)
+
+    def test_connection_errors_are_retried_for_get(self) -> None:
+        with patch.object(
+            self.jira_api.session,
+            "request",
+            side_effect=[
+                requests.ConnectionError("reset"),
+                Mock(status_code=200, content=b""),
+            ],
+        ) as request:
+            with self.assertLogs("jira_util.jira", "WARNING"):
+                self.jira_api._send("GET", "http://example.com")
+
+        self.assertEqual(request.call_count, 2)
+
+
+class TestJiraAPICoalescing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira(latency=0.1)
+        self.stand_in.__enter__()
+        self.jira_api = JiraAPI(self.stand_in.config())
+
+    def tearDown(self) -> None:
+        self.jira_api.close()
+        self.stand_in.__exit__(None, None, None)
+
+    def test_identical_gets_share_one_request(self) -> None:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            tickets = list(pool.map(self.jira_api.get_ticket, ["JIRA-1"] * 8))
+
+        self.assertEqual(tickets, [tickets[0]] * 8)
+        self.assertEqual(len(self.stand_in.requests), 1)
+        self.assertEqual(self.jira_api.coalescer.deduplicated, 7)
+
+    def test_errors_are_shared(self) -> None:
+        self.stand_in.fail_requests(1, 404)
+
+        with self.assertLogs("jira_util.jira", "ERROR"):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [
+                    pool.submit(self.jira_api.get_ticket, "JIRA-1") for _ in range(4)
+                ]
+                errors = [future.exception() for future in futures]
+
+        self.assertTrue(all(isinstance(e, requests.HTTPError) for e in errors))
+        self.assertEqual(len(self.stand_in.requests), 1)
+
+    def test_different_params_are_not_shared(self) -> None:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pool.submit(self.jira_api.get_ticket, "JIRA-1")
+            pool.submit(self.jira_api.get_ticket, "JIRA-1", "minimal")
+
+        self.assertEqual(len(self.stand_in.requests), 2)
+        self.assertEqual(self.jira_api.coalescer.deduplicated, 0)
+
+
+class TestJiraAPIAdaptiveConcurrency(unittest.TestCase):
+    def test_concurrency_settles_at_server_capacity(self) -> None:
+        with StandInJira(latency=0.002, capacity=4) as stand_in:
+            with JiraAPI(stand_in.config(), pool_size=16) as jira_api:
+                jira_api.retry_policy = RetryPolicy(max_retries=20, backoff=0.001)
+                with self.assertLogs("jira_util.jira", "WARNING"):
+                    with ThreadPoolExecutor(max_workers=16) as pool:
+                        tickets = list(
+                            pool.map(
+                                jira_api.get_ticket, [f"JIRA-{i}" for i in range(400)]
+                            )
+                        )
+
+        self.assertEqual(len(tickets), 400)
+        self.assertLessEqual(jira_api.limiter.limit, 6)
+        self.assertLess(stand_in.rejected, 40)
+
+
 if __name__ == "__main__":
     unittest.main()
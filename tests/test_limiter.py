@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from jira_util.limiter import AdaptiveLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.limiter = AdaptiveLimiter(
+            initial=4, max_limit=10, window=10, clock=self.clock
+        )
+
+    def run_window(self, concurrency: int, latency: float) -> None:
+        """
+        Send one window of requests, `concurrency` at a time
+        """
+        for sent in range(0, self.limiter.window, concurrency):
+            batch = min(concurrency, self.limiter.window - sent)
+            started = [self.limiter.acquire() for _ in range(batch)]
+            self.clock.now += latency
+            for start in started:
+                self.limiter.release(start, 200)
+
+    def test_limit_grows_while_latency_is_stable(self) -> None:
+        for expected in (5, 6, 7):
+            self.run_window(self.limiter.limit, 0.1)
+            self.assertEqual(self.limiter.limit, expected)
+
+    def test_limit_is_capped(self) -> None:
+        for _ in range(20):
+            self.run_window(self.limiter.limit, 0.1)
+
+        self.assertEqual(self.limiter.limit, 10)
+
+    def test_limit_only_grows_when_reached(self) -> None:
+        self.run_window(2, 0.1)
+
+        self.assertEqual(self.limiter.limit, 4)
+
+    def test_latency_spike_halves_limit(self) -> None:
+        self.run_window(4, 0.1)
+        self.run_window(5, 0.1)
+        self.assertEqual(self.limiter.limit, 6)
+
+        self.run_window(6, 0.5)
+
+        self.assertEqual(self.limiter.limit, 3)
+
+    def test_rate_limiting_halves_limit_once_per_generation(self) -> None:
+        started = [self.limiter.acquire() for _ in range(4)]
+        self.clock.now += 0.1
+        for start in started:
+            self.limiter.release(start, 429)
+
+        self.assertEqual(self.limiter.limit, 2)
+
+        self.limiter.release(self.limiter.acquire(), 503)
+        self.assertEqual(self.limiter.limit, 1)
+        self.limiter.release(self.limiter.acquire(), 429)
+        self.assertEqual(self.limiter.limit, 1)
+
+    def test_failed_requests_are_not_sampled(self) -> None:
+        for _ in range(20):
+            self.limiter.release(self.limiter.acquire(), None)
+
+        self.assertEqual(self.limiter.in_flight, 0)
+        self.assertIsNone(self.limiter.baseline)
+
+    def test_acquire_blocks_at_limit(self) -> None:
+        limiter = AdaptiveLimiter(initial=1)
+        started = limiter.acquire()
+        acquired = threading.Event()
+
+        thread = threading.Thread(target=lambda: acquired.set() or limiter.acquire())
+        thread.start()
+        acquired.wait()
+        time.sleep(0.05)
+        self.assertEqual(limiter.in_flight, 1)
+
+        limiter.release(started, 200)
+        thread.join(timeout=1)
+        self.assertEqual(limiter.in_flight, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from parameterized import parameterized
+
+from jira_util.jira import JiraAPI
+from jira_util.metrics import RequestMetrics, percentile
+from tests.stand_in import StandInJira
+
+
+class TestRequestMetrics(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ([], 0.5, 0.0),
+            ([1.0], 0.99, 1.0),
+            ([1.0, 2.0, 3.0, 4.0], 0.5, 2.0),
+            ([float(i) for i in range(1, 101)], 0.95, 95.0),
+        ]
+    )
+    def test_percentile(
+        self, samples: list[float], fraction: float, expected: float
+    ) -> None:
+        self.assertEqual(percentile(samples, fraction), expected)
+
+    @parameterized.expand(
+        [
+            ("/rest/api/2/issue/{}", "/rest/api/2/issue/{}"),
+            (
+                "rest/agile/1.0/board/{}/sprint?state=future",
+                "/rest/agile/1.0/board/{}/sprint",
+            ),
+        ]
+    )
+    def test_endpoint(self, query: str, expected: str) -> None:
+        self.assertEqual(RequestMetrics.endpoint(query), expected)
+
+    def test_to_dict(self) -> None:
+        metrics = RequestMetrics()
+        for seconds in (0.3, 0.1, 0.2):
+            metrics.record("GET", "/rest/api/2/issue/{}", 200, seconds, 0, 100)
+        metrics.record("GET", "/rest/api/2/issue/{}", 429, 0.05, 0, 10)
+        metrics.record("GET", "/rest/api/2/issue/{}", None, 1.0)
+        metrics.record_retry("GET", "/rest/api/2/issue/{}")
+        metrics.record("POST", "/rest/api/2/issue", 201, 0.5, 40, 30)
+
+        stats = metrics.to_dict({"coalesced_requests": 2})
+
+        self.assertEqual(stats["coalesced_requests"], 2)
+        post, get = stats["endpoints"]
+        self.assertEqual(
+            (get["method"], get["endpoint"], get["requests"], get["retries"]),
+            ("GET", "/rest/api/2/issue/{}", 5, 1),
+        )
+        self.assertEqual(get["statuses"], {"200": 3, "429": 1, "error": 1})
+        self.assertEqual(get["bytes_received"], 310)
+        self.assertEqual(get["latency_seconds"]["p50"], 0.2)
+        self.assertEqual(get["latency_seconds"]["max"], 1.0)
+        self.assertEqual((post["bytes_sent"], post["statuses"]), (40, {"201": 1}))
+
+    def test_format_table(self) -> None:
+        metrics = RequestMetrics()
+        metrics.record("GET", "/rest/api/2/search", 200, 0.25, 0, 2048)
+        metrics.record_cached("GET", "/rest/api/2/search")
+
+        table = RequestMetrics.format_table(metrics.to_dict({"concurrency_limit": 4}))
+
+        self.assertEqual(
+            table.splitlines(),
+            [
+                "METHOD  ENDPOINT            REQS  RETRIES  CACHED  SENT  RECEIVED"
+                "  P50  P95  P99  STATUSES",
+                "GET     /rest/api/2/search  1     0        1       0     2048"
+                "      250  250  250  200:1",
+                "concurrency_limit: 4",
+            ],
+        )
+
+    def test_format_prometheus(self) -> None:
+        metrics = RequestMetrics()
+        metrics.record("GET", "/rest/api/2/issue/{}", 200, 0.2, 0, 100)
+        metrics.record("GET", "/rest/api/2/issue/{}", 404, 3.0, 0, 50)
+
+        lines = metrics.format_prometheus({"coalesced_requests": 1}).splitlines()
+
+        labels = 'endpoint="/rest/api/2/issue/{}",method="GET"'
+        for line in (
+            "# TYPE jira_util_requests_total counter",
+            f'jira_util_requests_total{{{labels},status="200"}} 1',
+            f'jira_util_requests_total{{{labels},status="404"}} 1',
+            f"jira_util_received_bytes_total{{{labels}}} 150",
+            "# TYPE jira_util_request_duration_seconds histogram",
+            f'jira_util_request_duration_seconds_bucket{{{labels},le="0.1"}} 0',
+            f'jira_util_request_duration_seconds_bucket{{{labels},le="0.25"}} 1',
+            f'jira_util_request_duration_seconds_bucket{{{labels},le="5.0"}} 2',
+            f'jira_util_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+            f"jira_util_request_duration_seconds_count{{{labels}}} 2",
+            "# TYPE jira_util_coalesced_requests gauge",
+            "jira_util_coalesced_requests 1",
+        ):
+            self.assertIn(line, lines)
+
+
+class TestJiraAPIMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.jira_api = JiraAPI(self.stand_in.config())
+        self.jira_api.retry_policy.backoff = 0
+
+    def tearDown(self) -> None:
+        self.jira_api.close()
+        self.stand_in.__exit__(None, None, None)
+
+    def test_requests_are_grouped_by_endpoint_template(self) -> None:
+        self.stand_in.fail_requests(1, 429, {"Retry-After": "0"})
+        self.stand_in.add_route(
+            "POST",
+            r"/rest/api/2/issue/([A-Z]+-\d+)/comment",
+            lambda key, body, **_: (201, {"id": "1", **body}),
+        )
+
+        self.jira_api.get_ticket("JIRA-1")
+        self.jira_api.get_ticket("JIRA-2")
+        self.jira_api.add_comment("JIRA-1", "Hello")
+
+        stats = self.jira_api.stats()
+        endpoints = {(e["method"], e["endpoint"]): e for e in stats["endpoints"]}
+        self.assertEqual(
+            list(endpoints),
+            [("GET", "/rest/api/2/issue/{}"), ("POST", "/rest/api/2/issue/{}/comment")],
+        )
+        get = endpoints["GET", "/rest/api/2/issue/{}"]
+        self.assertEqual(get["requests"], 3)
+        self.assertEqual(get["retries"], 1)
+        self.assertEqual(get["statuses"], {"200": 2, "429": 1})
+        self.assertGreater(get["bytes_received"], 0)
+        post = endpoints["POST", "/rest/api/2/issue/{}/comment"]
+        self.assertEqual(post["bytes_sent"], len(json.dumps({"body": "Hello"})))
+        self.assertEqual(stats["coalesced_requests"], 0)
+
+    def test_write_metrics(self) -> None:
+        self.jira_api.get_ticket("JIRA-1")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics" / "jira_util.prom"
+            self.jira_api.write_metrics(path)
+            text = path.read_text()
+
+        self.assertIn(
+            'jira_util_requests_total{endpoint="/rest/api/2/issue/{}",method="GET",'
+            'status="200"} 1',
+            text,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
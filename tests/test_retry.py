@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import unittest
+
+from parameterized import parameterized
+from requests import Response
+
+from jira_util.retry import RetryPolicy, parse_retry_after
+
+NOW = 1_700_000_000.0
+
+
+def response(status: int, headers: dict[str, str] | None = None) -> Response:
+    r = Response()
+    r.status_code = status
+    r.headers.update(headers or {})
+    return r
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.policy = RetryPolicy(
+            max_retries=3, backoff=1.0, max_backoff=5.0, jitter=lambda: 1.0
+        )
+        self.policy.clock = lambda: NOW
+
+    @parameterized.expand(
+        [
+            ("GET", 429, 0, True),
+            ("GET", 503, 0, True),
+            ("GET", None, 0, True),
+            ("GET", 500, 0, False),
+            ("GET", 404, 0, False),
+            ("GET", 200, 0, False),
+            ("PUT", 502, 2, True),
+            ("GET", 429, 3, False),
+            ("POST", 429, 0, True),
+            ("POST", 503, 0, False),
+            ("POST", None, 0, False),
+        ]
+    )
+    def test_can_retry(
+        self, method: str, status: int | None, attempt: int, expected: bool
+    ) -> None:
+        self.assertEqual(self.policy.can_retry(method, status, attempt), expected)
+
+    def test_backoff_is_exponential_and_capped(self) -> None:
+        delays = [self.policy.delay(response(503), attempt) for attempt in range(5)]
+
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 5.0, 5.0])
+
+    def test_backoff_has_full_jitter(self) -> None:
+        self.policy.jitter = lambda: 0.25
+
+        self.assertEqual(self.policy.delay(None, 2), 1.0)
+
+    def test_retry_after_is_honored(self) -> None:
+        delay = self.policy.delay(response(429, {"Retry-After": "7"}), 0)
+
+        self.assertEqual(delay, 7.0 + 1.0)
+
+    @parameterized.expand(
+        [
+            ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(NOW + 12)}, 13.0),
+            (
+                {
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": "2023-11-14T22:13:32.000Z",
+                },
+                13.0,
+            ),
+            ({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": str(NOW + 12)}, 1.0),
+        ]
+    )
+    def test_rate_limit_reset_is_honored(
+        self, headers: dict[str, str], expected: float
+    ) -> None:
+        self.assertEqual(self.policy.delay(response(429, headers), 0), expected)
+
+    @parameterized.expand(
+        [
+            ("3", 3.0),
+            ("0.5", 0.5),
+            ("Tue, 14 Nov 2023 22:13:40 GMT", 20.0),
+            ("soon", None),
+            (None, None),
+        ]
+    )
+    def test_parse_retry_after(self, value: str | None, expected: float | None) -> None:
+        self.assertEqual(parse_retry_after(value, NOW), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
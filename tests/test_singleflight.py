@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from jira_util.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self) -> None:
+        self.single_flight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow_call(self, result: object = "result") -> object:
+        self.calls += 1
+        self.release.wait(timeout=5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def run_concurrently(self, count: int, key: str, result: object) -> list:
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            futures = [
+                pool.submit(self.single_flight.do, key, lambda: self.slow_call(result))
+                for _ in range(count)
+            ]
+            while self.single_flight.deduplicated + self.single_flight.calls < count:
+                time.sleep(0.001)
+            self.release.set()
+        return futures
+
+    def test_concurrent_calls_share_one_result(self) -> None:
+        futures = self.run_concurrently(5, "key", "result")
+
+        self.assertEqual([f.result() for f in futures], ["result"] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.single_flight.calls, 1)
+        self.assertEqual(self.single_flight.deduplicated, 4)
+
+    def test_concurrent_calls_share_one_error(self) -> None:
+        futures = self.run_concurrently(3, "key", ValueError("boom"))
+
+        for future in futures:
+            with self.assertRaisesRegex(ValueError, "boom"):
+                future.result()
+        self.assertEqual(self.calls, 1)
+
+    def test_sequential_calls_are_not_shared(self) -> None:
+        self.release.set()
+
+        self.single_flight.do("key", self.slow_call)
+        self.single_flight.do("key", self.slow_call)
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.single_flight.deduplicated, 0)
+
+    def test_different_keys_are_not_shared(self) -> None:
+        self.release.set()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda k: self.single_flight.do(k, self.slow_call), "ab"))
+
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.stand_in import StandInJira
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Import budgets for the CLI, in milliseconds. Pulling questionary and
+# prompt_toolkit back in costs well over 100ms on its own.
+VERSION_IMPORT_BUDGET_MS = 100
+GET_TICKET_IMPORT_BUDGET_MS = 400
+
+INTERACTIVE_MODULES = {"questionary", "prompt_toolkit", "jira_util.interactive"}
+
+
+def run_with_importtime(
+    args: list[str], home: str
+) -> tuple[subprocess.CompletedProcess, dict[str, int], int]:
+    """
+    Run the CLI under `python -X importtime`
+    @return: the finished process, the cumulative import time of every module
+    in microseconds, and the total time of the imports made by jira_util
+    """
+    env = dict(os.environ, HOME=home, PYTHONPATH=f"{REPO_ROOT}{os.pathsep}{home}")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "jira_util.jira_util", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=home,
+    )
+
+    modules = {}
+    total = 0
+    started = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+        started = started or name.strip().startswith("jira_util")
+        # Only count top-level imports, nested ones are part of their cumulative
+        if started and not name.startswith("  ", 1):
+            total += int(cumulative)
+    return result, modules, total
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self) -> None:
+        self.home = tempfile.TemporaryDirectory()
+        # --version reads the installed package metadata
+        dist_info = Path(self.home.name) / "jira_util-0.0.0.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text("Name: jira_util\nVersion: 0.0.0\n")
+
+    def tearDown(self) -> None:
+        self.home.cleanup()
+
+    def test_version_imports(self) -> None:
+        result, modules, total = run_with_importtime(["--version"], self.home.name)
+
+        self.assertEqual(result.stdout, "jira-util version 0.0.0\n", result.stderr)
+        self.assertFalse(INTERACTIVE_MODULES & modules.keys())
+        self.assertNotIn("requests", modules)
+        self.assertLess(total / 1000, VERSION_IMPORT_BUDGET_MS)
+
+    def test_get_ticket_imports(self) -> None:
+        with StandInJira() as stand_in:
+            with open(Path(self.home.name) / ".jira-util.config", "w") as f:
+                stand_in.config().write(f)
+            result, modules, total = run_with_importtime(
+                ["-j", "JIRA-1"], self.home.name
+            )
+
+        self.assertIn('"key": "JIRA-1"', result.stdout, result.stderr)
+        self.assertFalse(INTERACTIVE_MODULES & modules.keys())
+        self.assertNotIn("jira_util.importer", modules)
+        self.assertLess(total / 1000, GET_TICKET_IMPORT_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
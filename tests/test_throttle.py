@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from jira_util.throttle import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+
+    def bucket(self, rate: float | None, burst: float | None = None) -> TokenBucket:
+        return TokenBucket(rate, burst, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_unlimited_by_default(self) -> None:
+        bucket = self.bucket(None)
+
+        for _ in range(1000):
+            bucket.acquire()
+
+        self.assertEqual(self.clock.now, 0.0)
+
+    def test_rate_is_enforced_after_burst(self) -> None:
+        bucket = self.bucket(rate=10, burst=5)
+
+        for _ in range(25):
+            bucket.acquire()
+
+        self.assertAlmostEqual(self.clock.now, 2.0)
+
+    def test_pause_holds_back_requests(self) -> None:
+        bucket = self.bucket(None)
+        bucket.pause(3)
+        bucket.pause(1)
+
+        self.assertEqual(bucket.acquire(), 3.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+
+    def test_pause_is_shared_between_threads(self) -> None:
+        bucket = TokenBucket()
+        bucket.pause(0.2)
+        waited = []
+
+        threads = [
+            threading.Thread(target=lambda: waited.append(bucket.acquire()))
+            for _ in range(4)
+        ]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(waited), 4)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertTrue(all(w > 0 for w in waited))
+
+
+if __name__ == "__main__":
+    unittest.main()
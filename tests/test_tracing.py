@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+import unittest
+from unittest.mock import patch
+
+from jira_util.jira import JiraAPI
+from jira_util.tracing import LazyJSON, redact_headers
+from tests.stand_in import StandInJira
+
+
+class TestTracing(unittest.TestCase):
+    def test_redact_headers(self) -> None:
+        self.assertEqual(
+            redact_headers({"authorization": "Bearer secret", "If-None-Match": '"1"'}),
+            {"authorization": "<redacted>", "If-None-Match": '"1"'},
+        )
+
+    def test_lazy_json(self) -> None:
+        self.assertEqual(
+            str(LazyJSON({"b": 1, "a": [2]})),
+            '{\n    "a": [\n        2\n    ],\n    "b": 1\n}',
+        )
+        self.assertEqual(
+            str(LazyJSON({"a": "x" * 100}, 10)), '{\n    "a":... (truncated)'
+        )
+        self.assertEqual(str(LazyJSON([1], 10)), "[\n    1\n]")
+
+
+class TestJiraAPITracing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stand_in = StandInJira()
+        self.stand_in.__enter__()
+        self.config = self.stand_in.config()
+        self.config.set("JIRA", "API_TOKEN", "s3cret-token")
+
+    def tearDown(self) -> None:
+        self.stand_in.__exit__(None, None, None)
+
+    def test_bodies_are_not_serialized_when_debug_is_off(self) -> None:
+        with JiraAPI(self.config) as jira_api:
+            with patch.object(LazyJSON, "__str__") as serialize:
+                with patch.object(logging.Logger, "_log") as log:
+                    jira_api.get_ticket("JIRA-1")
+
+        serialize.assert_not_called()
+        log.assert_not_called()
+
+    def test_requests_and_responses_are_traced(self) -> None:
+        self.config.set("JIRA", "LOG_BODY_LIMIT", "20")
+
+        with JiraAPI(self.config) as jira_api:
+            with self.assertLogs("jira_util.jira", "DEBUG") as logs:
+                jira_api.get_ticket("JIRA-1", fields="summary")
+
+        request, response = logs.records
+        self.assertEqual(
+            request.getMessage().splitlines()[:2],
+            [
+                f"GET http://{self.stand_in.address}/rest/api/2/issue/JIRA-1"
+                "?fields=summary",
+                "{'Authorization': '<redacted>'}",
+            ],
+        )
+        self.assertEqual(request.http["params"], {"fields": "summary"})
+        self.assertNotIn("s3cret-token", request.getMessage())
+        self.assertEqual(response.http["status"], 200)
+        self.assertTrue(response.getMessage().endswith("... (truncated)"))
+
+
+if __name__ == "__main__":
+    unittest.main()